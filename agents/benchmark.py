@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark for the debate orchestration
+Runs DebateOrchestrator.run_full_debate against the deterministic fake LLM (no network,
+no API keys) and reports wall time per phase, LLM calls, prompt sizes and history writes
+(phase and call timings come from the orchestrator's own MetricsRecorder), plus main.py
+startup time checked against a budget
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# The fake backend never calls OpenAI, but client construction elsewhere expects a key
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from crew.fake_llm import FakeDebateLLM, FakeLLMStats
+from crew.flow import DebateOrchestrator, DEFAULT_MAX_PARALLEL_AGENTS, DEFAULT_MAX_CALLS_PER_AGENT
+from utils.history_manager import ChatHistoryManager
+from utils.startup import measure_startup
+
+BENCHMARK_TOPIC = "Should I focus on depth or breadth in my skill development?"
+
+# Seconds main.py may take to answer --help, which must not import crewai or langchain
+DEFAULT_STARTUP_BUDGET = 0.5
+
+
+class CountingHistoryManager:
+    """Wraps a history manager and counts its persistence calls.
+
+    In production every call is one file write plus one database request.
+    """
+    WRITE_METHODS = ('create_session_folder', 'save_agent_round', 'save_debate_exchange',
+                     'save_phase_summary', 'save_final_report', 'save_metrics', 'save_checkpoint')
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.write_counts = defaultdict(int)
+        self.write_seconds = 0.0
+
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if name not in self.WRITE_METHODS or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self.write_seconds += time.perf_counter() - start
+                self.write_counts[name] += 1
+        return counted
+
+
+async def run_benchmark(args) -> dict:
+    stats = FakeLLMStats()
+
+    def llm_factory(temperature: float):
+        return FakeDebateLLM(temperature=temperature, response_words=args.response_words,
+                             latency=args.latency, stats=stats)
+
+    orchestrator = DebateOrchestrator(
+        max_parallel_agents=args.max_parallel_agents,
+        max_calls_per_agent=args.max_calls_per_agent,
+        llm_factory=llm_factory
+    )
+    with tempfile.TemporaryDirectory(prefix="debate_benchmark_") as base_path:
+        history = CountingHistoryManager(ChatHistoryManager(base_path))
+        orchestrator.history_manager = history
+
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            results = await orchestrator.run_full_debate(BENCHMARK_TOPIC, args.iterations)
+        wall_time = time.perf_counter() - start
+
+    metrics = orchestrator.metrics.summary()
+    return {
+        'config': {
+            'iterations': args.iterations,
+            'latency': args.latency,
+            'response_words': args.response_words,
+            'max_parallel_agents': args.max_parallel_agents,
+            'max_calls_per_agent': args.max_calls_per_agent,
+        },
+        'wall_time': wall_time,
+        'phase_times': metrics['phase_wall_time'],
+        'phase_calls': metrics['by_phase'],
+        'iterations_completed': results['iterations_completed'],
+        'consensus_reached': results['consensus_reached'],
+        **stats.summary(),
+        'context_tokens': dict(orchestrator.memory_manager.context_stats),
+        'history_writes': dict(history.write_counts),
+        'history_write_seconds': history.write_seconds,
+    }
+
+
+def check_startup(budget: float) -> dict:
+    startup = measure_startup()
+    return {**startup, 'budget': budget, 'within_budget': startup['help_seconds'] <= budget}
+
+
+def print_report(report: dict):
+    print("📊 Debate Orchestration Benchmark (fake LLM)")
+    print("=" * 60)
+    config = report['config']
+    print(f"Iterations: {config['iterations']}  Latency: {config['latency']}s  "
+          f"Response words: {config['response_words']}")
+    print(f"Max parallel agents: {config['max_parallel_agents']}  "
+          f"Max calls per agent: {config['max_calls_per_agent']}")
+    print("-" * 60)
+    for phase, seconds in report['phase_times'].items():
+        calls = report['phase_calls'].get(phase, {})
+        print(f"  {phase:<14} {seconds:8.2f}s  {calls.get('calls', 0):3d} calls  "
+              f"p95 {calls.get('latency_p95', 0.0):6.2f}s  "
+              f"queue wait {calls.get('queue_wait_total', 0.0):6.2f}s")
+    print(f"  {'total':<14} {report['wall_time']:8.2f}s")
+    print("-" * 60)
+    print(f"LLM calls: {report['llm_calls']}")
+    print(f"Prompt tokens: {report['prompt_tokens_total']:,} total, "
+          f"{report['prompt_tokens_mean']:,.0f} mean, {report['prompt_tokens_max']:,} max")
+    print(f"Completion tokens: {report['completion_tokens_total']:,}")
+    writes = report['history_writes']
+    print(f"History writes (file + DB each): {sum(writes.values())} "
+          f"in {report['history_write_seconds']:.2f}s")
+    for method, count in sorted(writes.items()):
+        print(f"  {method:<22} {count}")
+    print(f"Iterations completed: {report['iterations_completed']}  "
+          f"Consensus: {report['consensus_reached']}")
+    startup = report.get('startup')
+    if startup:
+        print("-" * 60)
+        print(f"Startup: main.py --help {startup['help_seconds']:.2f}s "
+              f"(budget {startup['budget']:.2f}s)  "
+              f"full agent imports {startup['import_seconds']:.2f}s")
+        if not startup['within_budget']:
+            print("⚠️ main.py startup is over budget; check `python3 main.py --profile-startup`")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark of run_full_debate')
+    parser.add_argument('--iterations', type=int, default=1, help='Maximum debate iterations')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated seconds per LLM call')
+    parser.add_argument('--response-words', type=int, default=300, help='Words per fake LLM response')
+    parser.add_argument('--max-parallel-agents', type=int, default=DEFAULT_MAX_PARALLEL_AGENTS)
+    parser.add_argument('--max-calls-per-agent', type=int, default=DEFAULT_MAX_CALLS_PER_AGENT)
+    parser.add_argument('--json', type=str, help='Also write the report to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Show the orchestrator output')
+    parser.add_argument('--startup-budget', type=float, default=DEFAULT_STARTUP_BUDGET,
+                        help='Seconds main.py --help may take (exit code 1 when exceeded)')
+    parser.add_argument('--skip-startup', action='store_true', help='Do not measure main.py startup')
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    if not args.skip_startup:
+        report['startup'] = check_startup(args.startup_budget)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json}")
+    return 0 if report.get('startup', {}).get('within_budget', True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,15 @@
 from crewai import Agent
 from textwrap import dedent
-from langchain_openai import ChatOpenAI
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .langchain_llm import LangChainLLM
+from utils.llm_clients import get_llm_registry
+from utils.rate_limiter import RateLimiterRegistry, get_rate_limiters
+from utils.token_stream import attach_token_stream
 
 if TYPE_CHECKING:
     from .flow import SharedMemoryManager
+    from utils.llm_cache import LLMResponseCache
 
 GPT4o = "gpt-4o"
 SONNET = "claude-3-5-sonnet-20241022"
@@ -16,15 +21,56 @@ COMMON_RULES = (
 )
 
 class DebateAgents:
-    def __init__(self, memory_manager: 'SharedMemoryManager'):
+    def __init__(self, memory_manager: 'SharedMemoryManager',
+                 llm_cache: Optional['LLMResponseCache'] = None,
+                 llm_factory: Optional[Callable[[float], Any]] = None,
+                 rate_limiters: Optional[RateLimiterRegistry] = None,
+                 stream_tokens: bool = False):
+        # Optional response cache shared by every LLM (see utils/llm_cache.py)
+        self.llm_cache = llm_cache
+        # Optional replacement LLM backend, called with the temperature (e.g. crew/fake_llm.py)
+        self.llm_factory = llm_factory
+        # Provider LLMs go through the process-wide limiters (utils/rate_limiter.py), which only
+        # throttle models given limits with --rate-limit; a replacement backend only when
+        # limiters are passed explicitly
+        if rate_limiters is None and llm_factory is None:
+            rate_limiters = get_rate_limiters()
+        self.rate_limiters = rate_limiters
+        # Generate token by token and hand each token to the debate's streamer (utils/token_stream.py)
+        self.stream_tokens = stream_tokens
+        
         # Specific temperature LLMs for each agent type
-        self.llm_temp_03 = ChatOpenAI(model=GPT4o, temperature=0.3)
-        self.llm_temp_04 = ChatOpenAI(model=GPT4o, temperature=0.4)
-        self.llm_temp_05 = ChatOpenAI(model=GPT4o, temperature=0.5)
-        self.llm_temp_06 = ChatOpenAI(model=GPT4o, temperature=0.6)
-        self.llm_temp_07 = ChatOpenAI(model=GPT4o, temperature=0.7)
+        self.llm_temp_03 = self._create_llm(0.3)
+        self.llm_temp_04 = self._create_llm(0.4)
+        self.llm_temp_05 = self._create_llm(0.5)
+        self.llm_temp_06 = self._create_llm(0.6)
+        self.llm_temp_07 = self._create_llm(0.7)
         self.memory_manager = memory_manager
 
+    def _create_llm(self, temperature: float) -> LangChainLLM:
+        """Get the LLM client for one temperature setting (shared process-wide).
+        
+        The LangChain client is wrapped for crewai, which would otherwise rebuild it
+        without its cache, transport, rate limiter and callbacks (crew/langchain_llm.py).
+        """
+        if self.llm_factory is not None:
+            llm = self.llm_factory(temperature)
+        else:
+            params = {}
+            if self.stream_tokens:
+                # stream_usage keeps token counts in streamed responses (metrics, rate limits)
+                params.update(streaming=True, stream_usage=True)
+            if self.rate_limiters is not None and self.rate_limiters.is_limited(GPT4o):
+                # The SDK's own retries would resend 429s without going back through the
+                # limiter's acquire(); unthrottled clients keep the SDK's backoff
+                params['max_retries'] = 0
+            llm = get_llm_registry().get(GPT4o, temperature, cache=self.llm_cache, **params)
+        if self.rate_limiters is not None:
+            self.rate_limiters.attach(llm, GPT4o)
+        if self.stream_tokens:
+            attach_token_stream(llm)
+        return LangChainLLM.wrap(llm)
+
     def first_principles_physicist(self) -> Agent:
         """The INTJ - Strategic Systems Thinker (Newton/Einstein archetype)"""
         return Agent(
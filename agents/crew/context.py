@@ -0,0 +1,258 @@
+"""
+Token-budgeted context builder for agent prompts
+Selects and ranks shared memory entries for one agent instead of dumping all of it.
+Debate history is kept at three levels: the newest turns verbatim, older turns of the
+current iteration as one summary per round, and earlier iterations as one digest each.
+Summaries are computed once and shared by every agent's prompt.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from utils.summarize import summarize
+from utils.tokens import estimate_tokens, truncate_to_tokens
+
+# Token budget used when a task does not ask for a specific one
+DEFAULT_CONTEXT_TOKEN_BUDGET = 2000
+
+# Debate history turns kept verbatim (the newest ones)
+RECENT_TURNS = 4
+# Summary size of one older turn; a round's summary is the summaries of its turns
+TURN_SUMMARY_TOKENS = 40
+# Size of the digest of a finished iteration, shared out between its speakers
+ITERATION_DIGEST_TOKENS = 120
+
+# Global context key prefixes, in order of preference for an agent's current position
+POSITION_PREFIXES = ('revised_', 'strategy_')
+EMBODIMENT_PREFIX = 'embodiment_'
+
+# Share of the budget reserved for each section (the rest goes to other agents)
+OWN_POSITION_SHARE = 0.45
+HISTORY_SHARE = 0.35
+
+# Tokens set aside for the section headings
+HEADER_TOKENS = 40
+
+
+class ContextBuilder:
+    """Builds the context block for one agent within a token budget.
+    
+    Shared memory is indexed incrementally: add_entry() and add_history() update only
+    what changed and bump the version, and built contexts are cached per
+    (agent, budget) until the next version.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.positions: Dict[str, str] = {}
+        self.embodiments: Dict[str, str] = {}
+        self.other: Dict[str, Any] = {}
+        self.history: List[Dict] = []
+        self.history_lines: List[str] = []
+        self._rounds: Dict[Tuple[int, int], List[int]] = {}
+        self._turn_summaries: Dict[int, str] = {}
+        self._digests: Dict[int, Tuple[int, str]] = {}
+        self.summaries_computed = 0
+        self._position_prefix: Dict[str, str] = {}
+        self._entry_tokens: Dict[str, int] = {}
+        self._history_tokens: List[int] = []
+        self._summaries: Dict[Tuple[str, int], str] = {}
+        self._contexts: Dict[Tuple[str, int], Tuple[int, str, int]] = {}
+        self.cache_hits = 0
+
+    def add_entry(self, key: str, value: Any):
+        """Index one global context entry (new or replaced)"""
+        self.version += 1
+        self._entry_tokens[key] = estimate_tokens(f"{key}: {value}")
+
+        if key.startswith(POSITION_PREFIXES):
+            prefix = next(p for p in POSITION_PREFIXES if key.startswith(p))
+            name = key[len(prefix):]
+            current = self._position_prefix.get(name)
+            # Earlier prefixes in POSITION_PREFIXES take precedence
+            if current is None or POSITION_PREFIXES.index(prefix) <= POSITION_PREFIXES.index(current):
+                self._position_prefix[name] = prefix
+                self.positions[name] = str(value)
+                self._drop_summaries(name)
+        elif key.startswith(EMBODIMENT_PREFIX):
+            name = key[len(EMBODIMENT_PREFIX):]
+            self.embodiments[name] = str(value)
+        else:
+            self.other[key] = value
+
+    def add_history(self, entry: Dict):
+        """Index one appended debate history entry"""
+        self.version += 1
+        line = self.format_history_entry(entry)
+        self._rounds.setdefault((entry.get('iteration', 0), entry['round']), []).append(len(self.history))
+        self.history.append(entry)
+        self.history_lines.append(line)
+        self._history_tokens.append(estimate_tokens(line))
+
+    def _drop_summaries(self, name: str):
+        for cache_key in [k for k in self._summaries if k[0] == name]:
+            del self._summaries[cache_key]
+
+    def _summary(self, name: str, max_tokens: int) -> str:
+        """Position of name cut to max_tokens, reused until that position changes"""
+        cache_key = (name, max_tokens)
+        if cache_key not in self._summaries:
+            self._summaries[cache_key] = truncate_to_tokens(self.positions[name], max_tokens)
+        return self._summaries[cache_key]
+
+    def full_context_tokens(self) -> int:
+        """Approximate size of the unbudgeted context (entire global context + debate history)"""
+        return sum(self._entry_tokens.values()) + sum(self._history_tokens)
+
+    @staticmethod
+    def format_history_entry(entry: Dict) -> str:
+        return f"Round {entry['round']} - {entry['speaker']}: {entry['message']}"
+
+    def _turn_summary(self, index: int) -> str:
+        """Summary of one history turn, computed the first time it leaves the verbatim window"""
+        if index not in self._turn_summaries:
+            self._turn_summaries[index] = summarize(self.history[index]['message'], TURN_SUMMARY_TOKENS)
+            self.summaries_computed += 1
+        return self._turn_summaries[index]
+
+    def _round_summary(self, iteration: int, round_num: int, indices: List[int]) -> str:
+        turns = " | ".join(f"{self.history[i]['speaker']}: {self._turn_summary(i)}" for i in indices)
+        label = "Presentations" if iteration == 0 and round_num == 0 else f"Round {round_num}"
+        return f"{label} (summary) - {turns}"
+
+    def _iteration_digest(self, iteration: int) -> str:
+        """One iteration condensed from its turn summaries, per speaker; reused once finished"""
+        indices = [i for (it, _), round_indices in self._rounds.items() if it == iteration
+                   for i in round_indices]
+        cached = self._digests.get(iteration)
+        if cached and cached[0] == len(indices):
+            return cached[1]
+
+        by_speaker: Dict[str, List[str]] = {}
+        for i in indices:
+            by_speaker.setdefault(self.history[i]['speaker'], []).append(self._turn_summary(i))
+        share = ITERATION_DIGEST_TOKENS // max(1, len(by_speaker))
+        points = "; ".join(f"{speaker}: {summarize(' '.join(texts), share)}"
+                           for speaker, texts in by_speaker.items())
+        label = "Presentations" if iteration == 0 else f"Iteration {iteration}"
+        digest = f"{label} (digest) - {points}"
+        self._digests[iteration] = (len(indices), digest)
+        self.summaries_computed += 1
+        return digest
+
+    @staticmethod
+    def _fit(lines: List[str], budget: int) -> List[str]:
+        """Leading lines that fit in budget"""
+        kept = []
+        for line in lines:
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            kept.append(line)
+            budget -= cost
+        return kept
+
+    def _debate_history(self, budget: int) -> List[str]:
+        """Debate history within budget, most detailed for the newest turns.
+        
+        The newest turns are verbatim (newest weighted most heavily, within half the
+        budget), then round summaries of the current iteration and digests of earlier
+        iterations, newest first, while they fit. Returned oldest first.
+        """
+        if not self.history:
+            return []
+        recent = list(range(max(0, len(self.history) - RECENT_TURNS), len(self.history)))
+        lines = []
+        remaining = budget // 2
+        for i, index in enumerate(reversed(recent)):
+            if remaining <= 0:
+                break
+            # Each entry may use at most half of what is left; the oldest gets the rest
+            allowance = remaining if i == len(recent) - 1 else max(remaining // 2, 1)
+            line = truncate_to_tokens(self.history_lines[index], allowance)
+            if not line:
+                break
+            lines.append(line)
+            remaining -= estimate_tokens(line)
+        remaining += budget - budget // 2
+
+        # Older turns: summarised by round in the current iteration, digested before it
+        current_iteration = self.history[-1].get('iteration', 0)
+        round_lines, digest_lines = [], []
+        for (iteration, round_num), indices in reversed(self._rounds.items()):
+            indices = [i for i in indices if i < recent[0]]
+            if indices and iteration == current_iteration:
+                round_lines.append(self._round_summary(iteration, round_num, indices))
+        for iteration in sorted({it for it, _ in self._rounds if it < current_iteration}, reverse=True):
+            digest_lines.append(self._iteration_digest(iteration))
+
+        # Digests may use half of what is left, so earlier iterations are not crowded out
+        digests = self._fit(digest_lines, remaining // 2)
+        remaining -= sum(estimate_tokens(line) for line in digests)
+        rounds = self._fit(round_lines, remaining)
+        lines += rounds + digests
+        lines.reverse()
+        return lines
+
+    def build(self, agent_name: str, token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> Tuple[str, int]:
+        """Return the context text for agent_name and its estimated token count"""
+        cached = self._contexts.get((agent_name, token_budget))
+        if cached and cached[0] == self.version:
+            self.cache_hits += 1
+            return cached[1], cached[2]
+
+        remaining = token_budget - HEADER_TOKENS
+
+        # 1. The agent's own current position, whole if it fits in OWN_POSITION_SHARE of the
+        #    budget, otherwise summarised down to that share
+        own_section = ""
+        if agent_name in self.positions:
+            own_section = self._summary(agent_name, int(token_budget * OWN_POSITION_SHARE))
+            remaining -= estimate_tokens(own_section)
+
+        # 2. Debate history, most detailed for the newest turns
+        history_lines = self._debate_history(min(remaining, int(token_budget * HISTORY_SHARE)))
+        remaining -= sum(estimate_tokens(line) for line in history_lines)
+
+        # 3. Other agents' positions, summarised to an even share of what is left
+        others = [name for name in self.positions if name != agent_name]
+        other_lines = []
+        if others and remaining > 0:
+            share = remaining // len(others)
+            for name in others:
+                summary = self._summary(name, share)
+                if summary:
+                    other_lines.append(f"- {name}: {summary}")
+                    remaining -= estimate_tokens(other_lines[-1])
+
+        # 4. Anything else (embodiments, miscellaneous keys) only if room is left
+        extra_lines = []
+        extras = []
+        if agent_name in self.embodiments:
+            extras.append(("Your embodiment of other perspectives", self.embodiments[agent_name]))
+        extras += [(f"{name}'s embodiment", text) for name, text in self.embodiments.items() if name != agent_name]
+        extras += [(key, value if isinstance(value, str) else json.dumps(value, default=str))
+                   for key, value in self.other.items()]
+        for label, text in extras:
+            if remaining <= 0:
+                break
+            summary = truncate_to_tokens(str(text), remaining)
+            if summary:
+                extra_lines.append(f"- {label}: {summary}")
+                remaining -= estimate_tokens(extra_lines[-1])
+
+        context = "Global Context:\n"
+        if own_section:
+            context += f"Your current position:\n{own_section}\n\n"
+        if other_lines:
+            context += "Other board members' positions (summarized):\n" + "\n".join(other_lines) + "\n\n"
+        if extra_lines:
+            context += "Additional context:\n" + "\n".join(extra_lines) + "\n\n"
+        if not (own_section or other_lines or extra_lines):
+            context += "(none yet)\n\n"
+        context += "Debate History (newest turns verbatim, older ones summarized):\n"
+        for line in history_lines:
+            context += line + "\n"
+
+        tokens = estimate_tokens(context)
+        self._contexts[(agent_name, token_budget)] = (self.version, context, tokens)
+        return context, tokens
@@ -0,0 +1,103 @@
+"""
+Offline stand-in for the agents' chat models
+Returns deterministic text of a configurable size after a configurable delay, so the
+whole debate flow can run without network access (benchmarks, development)
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.tokens import estimate_tokens
+
+_VOCABULARY = (
+    "long-term leverage compounding systems principles incentives evidence risk "
+    "learning capital knowledge institutions feedback optionality resilience trends "
+    "strategy execution timing constraints convergence growth"
+).split()
+
+_CANDIDATES = re.compile(r"Available agents to vote for: \[(.*?)\]")
+
+# CrewAI agents parse the model output for a final answer in this format
+_FINAL_ANSWER = "Thought: I now can give a great answer\nFinal Answer: "
+
+
+class FakeLLMStats:
+    """Call counters shared by every fake LLM of one debate"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens: List[int] = []
+        self.completion_tokens: List[int] = []
+
+    def record(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens.append(prompt_tokens)
+            self.completion_tokens.append(completion_tokens)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            prompts = list(self.prompt_tokens)
+            completions = list(self.completion_tokens)
+        return {
+            'llm_calls': self.calls,
+            'prompt_tokens_total': sum(prompts),
+            'prompt_tokens_mean': sum(prompts) / len(prompts) if prompts else 0,
+            'prompt_tokens_max': max(prompts, default=0),
+            'completion_tokens_total': sum(completions)
+        }
+
+
+class FakeDebateLLM(BaseChatModel):
+    """Deterministic chat model: the same prompt always yields the same response"""
+
+    model_name: str = "fake-debate"
+    temperature: float = 0.0
+    response_words: int = 300
+    latency: float = 0.0
+    stats: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-debate"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {'model_name': self.model_name, 'temperature': self.temperature,
+                'response_words': self.response_words}
+
+    def _render(self, prompt: str) -> str:
+        digest = hashlib.sha256(f"{self.temperature}\0{prompt}".encode('utf-8')).digest()
+
+        words = [_VOCABULARY[digest[i % len(digest)] % len(_VOCABULARY)] for i in range(self.response_words)]
+        text = " ".join(words) + "."
+
+        # Voting prompts get a JSON ballot so the consensus logic is exercised
+        candidates = _CANDIDATES.search(prompt)
+        if candidates:
+            names = [n.strip().strip("'\"") for n in candidates.group(1).split(',') if n.strip()]
+            if names:
+                first = digest[0] % len(names)
+                ranking = names[first:] + names[:first]
+                return _FINAL_ANSWER + json.dumps({'ranking': ranking, 'reasoning': text})
+
+        return _FINAL_ANSWER + text
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if self.latency:
+            time.sleep(self.latency)
+
+        text = self._render(prompt)
+        if self.stats is not None:
+            self.stats.record(estimate_tokens(prompt), estimate_tokens(text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
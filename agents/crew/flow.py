@@ -1,9 +1,10 @@
 from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 import json
 import asyncio
+import contextlib
+import datetime
 import time
 import sys
 import os
@@ -12,8 +13,22 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .agents import DebateAgents
+from .langchain_llm import usage_scope
 from .tasks import DebateTasks
+from .context import ContextBuilder, DEFAULT_CONTEXT_TOKEN_BUDGET
 from utils.db_adapter import DatabaseIntegratedHistoryManager
+from utils.tally import DEFAULT_TALLY_METHOD, VoteTally
+from utils.metrics import MetricsRecorder, extract_token_usage
+from utils.defaults import DEFAULT_MAX_PARALLEL_AGENTS, DEFAULT_MAX_CALLS_PER_AGENT
+from utils.llm_clients import get_llm_registry
+from utils.token_stream import stream_tokens
+from utils.progress import ProgressEmitter
+from utils.convergence import ConvergenceDetector, DEFAULT_CONVERGENCE_THRESHOLD
+from utils.digest import build_debate_digest
+from utils.pairing import DEFAULT_PAIRING_DEGREE, DEFAULT_TOPOLOGY, PairingPlanner
+
+if TYPE_CHECKING:
+    from utils.llm_cache import LLMResponseCache
 
 @dataclass
 class DebateContext:
@@ -34,41 +49,138 @@ class DebateContext:
 
 class SharedMemoryManager:
     """Manages shared memory across all agents"""
-    def __init__(self):
+    def __init__(self, context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET):
         self.global_context = {}
         self.agent_memories = {}
         self.debate_history = []
+        self.context_token_budget = context_token_budget
+        self.context_builder = ContextBuilder()
+        # Token accounting for built contexts versus dumping everything
+        self.context_stats = {'calls': 0, 'tokens_used': 0, 'tokens_full': 0, 'tokens_saved': 0, 'cache_hits': 0,
+                              'summaries': 0}
     
     def update_global_context(self, key: str, value: Any):
         self.global_context[key] = value
+        self.context_builder.add_entry(key, value)
     
     def get_global_context(self) -> Dict:
         return self.global_context
     
-    def add_to_debate_history(self, speaker: str, message: str, round_num: int):
-        self.debate_history.append({
+    def add_to_debate_history(self, speaker: str, message: str, round_num: int, iteration: int = 0):
+        entry = {
             'speaker': speaker,
             'message': message,
             'round': round_num,
-            'timestamp': asyncio.get_event_loop().time()
-        })
+            'iteration': iteration,
+            'timestamp': time.time()
+        }
+        self.debate_history.append(entry)
+        self.context_builder.add_history(entry)
+    
+    def exchange_count(self) -> int:
+        """Debate exchanges in the history (presentations are round 0; an exchange's
+        question and response share its iteration and round)"""
+        return len({(entry.get('iteration', 0), entry['round']) for entry in self.debate_history
+                    if entry['round'] > 0})
     
-    def get_context_for_agent(self, agent_name: str) -> str:
-        """Get formatted context for a specific agent"""
-        context = f"Global Context: {json.dumps(self.global_context, indent=2)}\n\n"
-        context += f"Recent Debate History:\n"
-        for entry in self.debate_history[-10:]:  # Last 10 entries
-            context += f"Round {entry['round']} - {entry['speaker']}: {entry['message']}\n"
+    def snapshot(self) -> Dict[str, Any]:
+        """Shared memory contents for a checkpoint"""
+        return {
+            'global_context': dict(self.global_context),
+            'debate_history': list(self.debate_history)
+        }
+    
+    def restore(self, snapshot: Dict[str, Any]):
+        """Reload shared memory (and the context index) from a checkpoint snapshot"""
+        for key, value in snapshot.get('global_context', {}).items():
+            self.update_global_context(key, value)
+        for entry in snapshot.get('debate_history', []):
+            self.debate_history.append(entry)
+            self.context_builder.add_history(entry)
+    
+    def get_context_for_agent(self, agent_name: str, token_budget: int = None) -> str:
+        """Get formatted context for a specific agent within a token budget"""
+        # Rebuilt only when shared memory has changed since the last call for this agent and budget
+        context, tokens_used = self.context_builder.build(agent_name, token_budget or self.context_token_budget)
+        tokens_full = self.context_builder.full_context_tokens()
+        
+        self.context_stats['calls'] += 1
+        self.context_stats['tokens_used'] += tokens_used
+        self.context_stats['tokens_full'] += tokens_full
+        self.context_stats['tokens_saved'] += max(0, tokens_full - tokens_used)
+        self.context_stats['cache_hits'] = self.context_builder.cache_hits
+        self.context_stats['summaries'] = self.context_builder.summaries_computed
         return context
 
+# Longest run_full_debate waits for queued database writes before returning
+PERSISTENCE_FLUSH_TIMEOUT = 60
+
+# Checkpoints record the last finished phase; phases run in this order within an iteration
+CHECKPOINT_VERSION = 1
+CHECKPOINT_PHASES = ('research', 'presentation', 'adjustment', 'debate', 'voting', 'final_report')
+
+
+def checkpoint_position(phase: str, iteration: int) -> tuple:
+    """Sortable position of a phase in the debate (research and presentation run once)"""
+    if phase in ('research', 'presentation'):
+        iteration = 0
+    return (iteration, CHECKPOINT_PHASES.index(phase))
+
 class DebateOrchestrator:
-    def __init__(self):
+    def __init__(self, max_parallel_agents: int = DEFAULT_MAX_PARALLEL_AGENTS,
+                 max_calls_per_agent: int = DEFAULT_MAX_CALLS_PER_AGENT,
+                 early_vote_stop: bool = True,
+                 llm_cache: 'LLMResponseCache' = None,
+                 llm_factory: Callable[[float], Any] = None,
+                 call_limiter: Any = None,
+                 history_manager: Any = None,
+                 rate_limiters: Any = None,
+                 stream_tokens: bool = False,
+                 vote_method: str = DEFAULT_TALLY_METHOD,
+                 convergence_stop: bool = True,
+                 convergence_threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+                 pairing: str = DEFAULT_TOPOLOGY,
+                 exchange_budget: Optional[int] = None,
+                 pairing_degree: int = DEFAULT_PAIRING_DEGREE):
         self.memory_manager = SharedMemoryManager()
-        self.agent_factory = DebateAgents(self.memory_manager)
+        self.agent_factory = DebateAgents(self.memory_manager, llm_cache=llm_cache, llm_factory=llm_factory,
+                                          rate_limiters=rate_limiters, stream_tokens=stream_tokens)
         self.task_factory = DebateTasks(self.memory_manager)
-        self.history_manager = DatabaseIntegratedHistoryManager()
+        self.history_manager = history_manager or DatabaseIntegratedHistoryManager()
         self.agents = []
         
+        # 1 restores the original strictly serial behaviour
+        self.max_parallel_agents = max(1, max_parallel_agents)
+        self.max_calls_per_agent = max(1, max_calls_per_agent)
+        # Skip outstanding votes once the consensus outcome is mathematically decided
+        self.early_vote_stop = early_vote_stop
+        # How ballots are counted (utils/tally.py TALLY_METHODS)
+        self.vote_method = vote_method
+        # Stop iterating once revised strategies stop changing between iterations
+        self.convergence_stop = convergence_stop
+        self.convergence_threshold = convergence_threshold
+        self.convergence = ConvergenceDetector(convergence_threshold)
+        # Who questions whom in the debate phase, and at most how many exchanges per iteration
+        self.pairing = PairingPlanner(pairing, exchange_budget, pairing_degree)
+        # Exchanges run per debate iteration this session
+        self.exchange_counts = {}
+        # Voting prompt digest size against the raw debate results, per iteration
+        self.digest_reports = {}
+        self._kickoff_loop = None
+        self._kickoff_semaphore = None
+        self._agent_semaphores = {}
+        # Optional cap on concurrent LLM calls shared with other debates (crew/session.py)
+        self.call_limiter = call_limiter
+        # Receives the agents' tokens as they are generated (utils/token_stream.py, set per session)
+        self.token_streamer = None
+        # Machine-readable progress events (utils/progress.py); no-op until a session gives it a sink
+        self.progress = ProgressEmitter()
+        # Per-agent wall-clock latency (seconds) of the most recent run of each per-agent phase
+        self.phase_latencies = {}
+        # Per-call, per-phase and persistence metrics, saved as metrics.json in the session folder
+        self.metrics = MetricsRecorder()
+        self.current_iteration = 0
+        
         # The 6 specialized agents for the board of long-term thinkers
         self.agent_configs = [
             {
@@ -122,33 +234,177 @@ class DebateOrchestrator:
         for agent in self.agents:
             print(f"  - {agent['name']} ({agent['specialty']})")
     
+    async def _kickoff(self, crew: Crew, phase: str, agent_name: str = None,
+                       per_agent_limit: bool = False, on_start: Callable[[], None] = None):
+        """Run the blocking crew.kickoff() in a worker thread and record its metrics.
+        
+        Concurrency is bounded globally by max_parallel_agents and, with per_agent_limit,
+        per agent by max_calls_per_agent; a shared call_limiter also bounds it across debates.
+        on_start is called once the call has its slots, just before the thread starts.
+        
+        A running kickoff thread cannot be interrupted, so if the caller is cancelled the
+        call keeps its slots until the thread finishes and only then raises CancelledError.
+        """
+        # Semaphores belong to the loop they were created on (the CLI may run several loops)
+        loop = asyncio.get_running_loop()
+        if self._kickoff_loop is not loop:
+            self._kickoff_loop = loop
+            self._kickoff_semaphore = asyncio.Semaphore(self.max_parallel_agents)
+            self._agent_semaphores = {}
+        
+        agent_limit = contextlib.nullcontext()
+        if per_agent_limit and agent_name is not None:
+            agent_limit = self._agent_semaphores.setdefault(
+                agent_name, asyncio.Semaphore(self.max_calls_per_agent)
+            )
+        
+        queued_at = time.perf_counter()
+        # Always take the per-agent slot before the global one so waiting never holds a global slot
+        async with agent_limit:
+            async with self._kickoff_semaphore:
+                async with self.call_limiter or contextlib.nullcontext():
+                    started_at = time.perf_counter()
+                    self.progress.emit('agent_start', phase=phase, iteration=self.current_iteration,
+                                       agent=agent_name, queue_wait=round(started_at - queued_at, 3))
+                    result = None
+                    try:
+                        if on_start is not None:
+                            on_start()
+                        with stream_tokens(self.token_streamer, agent_name, phase, self.current_iteration), \
+                                usage_scope():
+                            call = asyncio.ensure_future(asyncio.to_thread(crew.kickoff))
+                        try:
+                            result = await asyncio.shield(call)
+                        except asyncio.CancelledError:
+                            await asyncio.wait([call])
+                            raise
+                    finally:
+                        latency = time.perf_counter() - started_at
+                        usage = extract_token_usage(result) if result is not None else {}
+                        self.progress.emit('agent_end', phase=phase, iteration=self.current_iteration,
+                                           agent=agent_name, seconds=round(latency, 3),
+                                           ok=result is not None, **usage)
+        
+        self.metrics.record_call(
+            phase, self.current_iteration, agent_name,
+            latency=latency,
+            queue_wait=started_at - queued_at,
+            usage=usage
+        )
+        return result
+    
+    def _agent_for_call(self, agent_data: Dict) -> Agent:
+        """The crewai Agent to run one debate call with.
+        
+        Agents keep per-run state (executor, crew, tools handler), so when one agent may be
+        in several calls at once (max_calls_per_agent > 1) each call gets its own copy; the
+        copy shares the original's LLM.
+        """
+        if self.max_calls_per_agent == 1:
+            return agent_data['agent']
+        return agent_data['agent'].copy()
+    
+    @contextlib.contextmanager
+    def _timed_phase(self, phase: str, iteration: int):
+        """Time a phase for metrics.json and report its start and end as progress events"""
+        with self.progress.phase(phase, iteration), self.metrics.timed_phase(phase, iteration):
+            yield
+    
+    async def _run_per_agent_phase(self, phase: str, build_task: Callable[[Dict], Task],
+                                   verbose: bool = False,
+                                   stop_when: Callable[[Dict, Any], bool] = None) -> List[Any]:
+        """Run one single-agent crew per board member concurrently.
+        
+        build_task(agent_data) creates the Task for that agent. Results are returned in
+        agent order, and per-agent latencies are reported and kept in phase_latencies.
+        
+        If stop_when(agent_data, result) is given it is called as each result arrives;
+        once it returns True the agents still waiting for a slot are skipped (their results
+        are None and they are recorded in the metrics as skipped). Calls already running
+        cannot be interrupted, so they finish and their results are still passed to
+        stop_when and returned.
+        """
+        latencies = {}
+        started = set()
+        
+        async def run_agent(agent_data):
+            start_time = time.time()
+            crew = Crew(
+                agents=[agent_data['agent']],
+                tasks=[build_task(agent_data)],
+                # Verbose output from concurrent crews interleaves, so only enable it when serial
+                verbose=verbose and self.max_parallel_agents == 1
+            )
+            result = await self._kickoff(crew, phase, agent_data['name'],
+                                         on_start=lambda: started.add(agent_data['name']))
+            latencies[agent_data['name']] = time.time() - start_time
+            print(f"    ✅ {agent_data['name']} completed {phase} in {latencies[agent_data['name']]:.1f}s")
+            return result
+        
+        if stop_when is None:
+            results = await asyncio.gather(*(run_agent(agent_data) for agent_data in self.agents))
+        else:
+            results = [None] * len(self.agents)
+            tasks = [asyncio.ensure_future(run_agent(agent_data)) for agent_data in self.agents]
+            positions = {task: i for i, task in enumerate(tasks)}
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    stop = False
+                    # Handle simultaneous completions in agent order so decisions are deterministic
+                    for task in sorted(done, key=positions.get):
+                        i = positions[task]
+                        results[i] = task.result()
+                        stop = stop_when(self.agents[i], results[i]) or stop
+                    if stop:
+                        break
+            finally:
+                # Agents still waiting for a slot never start; running calls are let finish
+                unstarted = {task for task in pending if self.agents[positions[task]]['name'] not in started}
+                for task in unstarted:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task in sorted(pending - unstarted, key=positions.get):
+                i = positions[task]
+                results[i] = task.result()
+                stop_when(self.agents[i], results[i])
+            if unstarted:
+                skipped = [a['name'] for a, task in zip(self.agents, tasks) if task in unstarted]
+                self.metrics.record_skipped(phase, self.current_iteration, skipped)
+                print(f"  ⏭️  Skipped {len(skipped)} {phase} call(s): {', '.join(skipped)}")
+        
+        self.phase_latencies[phase] = {a['name']: latencies[a['name']] for a in self.agents
+                                       if a['name'] in latencies}
+        if self.phase_latencies[phase]:
+            slowest = max(self.phase_latencies[phase], key=self.phase_latencies[phase].get)
+            print(f"  ⏱️  {phase.capitalize()} latency: slowest {slowest} "
+                  f"({self.phase_latencies[phase][slowest]:.1f}s), "
+                  f"total agent time {sum(self.phase_latencies[phase].values()):.1f}s")
+        return results
+    
     async def run_research_phase(self, topic: str):
         """Phase 1: All agents research and create strategies (Rule 1)"""
         print(f"🔬 Phase 1: Research Phase for topic: {topic}")
         print("Each agent will develop a strategy (< 900 words)")
+        if self.max_parallel_agents > 1:
+            print(f"Running up to {self.max_parallel_agents} agents concurrently")
         
         strategies = {}
         
-        for agent_data in self.agents:
+        def build_task(agent_data):
             print(f"  → {agent_data['name']} researching...")
-            start_time = time.time()
-            
-            task = self.task_factory.research_task(
+            print(f"    ⏱️  Starting research for {agent_data['name']}...")
+            return self.task_factory.research_task(
                 agent_data['agent'], 
                 topic, 
                 agent_data['specialty']
             )
-            crew = Crew(
-                agents=[agent_data['agent']],
-                tasks=[task],
-                verbose=True  # Enable verbose output to see progress
-            )
-            
-            print(f"    ⏱️  Starting research for {agent_data['name']}...")
-            result = crew.kickoff()
-            elapsed = time.time() - start_time
-            print(f"    ✅ {agent_data['name']} completed research in {elapsed:.1f}s")
-            
+        
+        # Tasks are independent, so run them concurrently and persist the results in agent order
+        results = await self._run_per_agent_phase("research", build_task, verbose=True)
+        
+        for agent_data, result in zip(self.agents, results):
             # Handle CrewOutput object properly
             if hasattr(result, 'raw') or hasattr(result, 'content'):
                 # Try to extract content from CrewOutput object
@@ -158,19 +414,21 @@ class DebateOrchestrator:
             
             # Show a preview of the content
             preview = strategy_content[:200] + "..." if len(strategy_content) > 200 else strategy_content
-            print(f"    📄 Strategy preview: {preview}")
+            print(f"    📄 {agent_data['name']} strategy preview: {preview}")
             
             strategies[agent_data['name']] = strategy_content
             self.memory_manager.update_global_context(f"strategy_{agent_data['name']}", strategy_content)
             
             # Save to history
-            self.history_manager.save_agent_round(
-                agent_data['name'], 1, strategy_content, "research"
-            )
+            with self.metrics.timed_persistence("research", "save_agent_round"):
+                self.history_manager.save_agent_round(
+                    agent_data['name'], 1, strategy_content, "research"
+                )
             print(f"    💾 Saved strategy to database")
         
         # Save phase summary
-        self.history_manager.save_phase_summary("research", strategies)
+        with self.metrics.timed_persistence("research", "save_phase_summary"):
+            self.history_manager.save_phase_summary("research", strategies)
         return strategies
     
     async def run_presentation_phase(self, strategies: Dict[str, str]):
@@ -194,12 +452,14 @@ class DebateOrchestrator:
             
             presentations[agent_data['name']] = strategy
             # Save presentation to history
-            self.history_manager.save_agent_round(
-                agent_data['name'], 1, strategy, "presentation"
-            )
+            with self.metrics.timed_persistence("presentation", "save_agent_round"):
+                self.history_manager.save_agent_round(
+                    agent_data['name'], 1, strategy, "presentation"
+                )
         
         # Save phase summary
-        self.history_manager.save_phase_summary("presentation", presentations)
+        with self.metrics.timed_persistence("presentation", "save_phase_summary"):
+            self.history_manager.save_phase_summary("presentation", presentations)
         print("✅ All presentations complete")
         return presentations
     
@@ -210,34 +470,33 @@ class DebateOrchestrator:
         
         embodiments = {}
         
-        for agent_data in self.agents:
+        def build_task(agent_data):
             print(f"  → {agent_data['name']} embodying other perspectives...")
             
             other_strategies = {k: v for k, v in strategies.items() 
                              if k != agent_data['name']}
             
-            task = self.task_factory.perspective_embodiment_task(
+            return self.task_factory.perspective_embodiment_task(
                 agent_data['agent'], 
                 other_strategies
             )
-            crew = Crew(
-                agents=[agent_data['agent']],
-                tasks=[task],
-                verbose=False  # Reduce verbose output
-            )
-            
-            result = crew.kickoff()
+        
+        results = await self._run_per_agent_phase("embodiment", build_task)
+        
+        for agent_data, result in zip(self.agents, results):
             embodiment_content = str(result)
             embodiments[agent_data['name']] = embodiment_content
             self.memory_manager.update_global_context(f"embodiment_{agent_data['name']}", embodiment_content)
             
             # Save to history
-            self.history_manager.save_agent_round(
-                agent_data['name'], 1, embodiment_content, "embodiment"
-            )
+            with self.metrics.timed_persistence("embodiment", "save_agent_round"):
+                self.history_manager.save_agent_round(
+                    agent_data['name'], 1, embodiment_content, "embodiment"
+                )
         
         # Save phase summary
-        self.history_manager.save_phase_summary("embodiment", embodiments)
+        with self.metrics.timed_persistence("embodiment", "save_phase_summary"):
+            self.history_manager.save_phase_summary("embodiment", embodiments)
         return embodiments
     
     async def run_adjustment_phase(self, strategies: Dict[str, str], embodiments: Dict[str, str]):
@@ -247,103 +506,169 @@ class DebateOrchestrator:
         
         revised_strategies = {}
         
-        for agent_data in self.agents:
+        def build_task(agent_data):
             print(f"  → {agent_data['name']} adjusting strategy...")
             
             # Create revision task that considers other strategies directly
-            task = self.task_factory.strategy_revision_task_simplified(
+            return self.task_factory.strategy_revision_task_simplified(
                 agent_data['agent'],
                 strategies,  # Pass all strategies instead of embodiments
                 strategies[agent_data['name']]
             )
-            crew = Crew(
-                agents=[agent_data['agent']],
-                tasks=[task],
-                verbose=False  # Reduce verbose output
-            )
-            
-            result = crew.kickoff()
+        
+        results = await self._run_per_agent_phase("adjustment", build_task)
+        
+        for agent_data, result in zip(self.agents, results):
             revised_content = str(result)
             revised_strategies[agent_data['name']] = revised_content
             self.memory_manager.update_global_context(f"revised_{agent_data['name']}", revised_content)
             
             # Save to history
-            self.history_manager.save_agent_round(
-                agent_data['name'], 1, revised_content, "adjustment"
-            )
+            with self.metrics.timed_persistence("adjustment", "save_agent_round"):
+                self.history_manager.save_agent_round(
+                    agent_data['name'], 1, revised_content, "adjustment"
+                )
         
         # Save phase summary
-        self.history_manager.save_phase_summary("adjustment", revised_strategies)
+        with self.metrics.timed_persistence("adjustment", "save_phase_summary"):
+            self.history_manager.save_phase_summary("adjustment", revised_strategies)
         return revised_strategies
     
-    async def run_debate_phase(self, revised_strategies: Dict[str, str]):
-        """Phase 5: Structured debate with questions and responses (Rule 5)"""
+    async def run_debate_phase(self, revised_strategies: Dict[str, str],
+                               standings: Dict[str, float] = None,
+                               previous_exchanges: List[Dict] = None,
+                               resumed_exchanges: List[Dict] = None,
+                               on_exchange: Callable[[List[Dict]], None] = None):
+        """Phase 5: Structured debate with questions and responses (Rule 5)
+        
+        The pairing topology decides who questions whom; standings (last iteration's vote
+        distribution) and previous_exchanges feed the Swiss topology.
+        
+        resumed_exchanges are the exchanges an interrupted run of this phase already saved;
+        planned exchanges among them are reused instead of run and saved again.
+        on_exchange(debate_results) is called after each exchange is saved, in round order.
+        """
         print("⚔️ Phase 5: Debate Phase")
         print("Each agent prepares questions and engages in structured debate")
         
+        # Round numbers are fixed up front so they stay stable however the exchanges are scheduled
+        agents_by_name = {agent_data['name']: agent_data for agent_data in self.agents}
+        plan = self.pairing.plan(
+            list(agents_by_name), self.current_iteration, strategies=revised_strategies,
+            standings=standings,
+            previous=[(e['questioner'], e['responder']) for e in previous_exchanges or []]
+        )
+        pairings = [(round_num, agents_by_name[questioner], agents_by_name[responder])
+                    for round_num, questioner, responder in plan]
+        all_pairs = len(self.agents) * (len(self.agents) - 1)
+        print(f"Pairing: {self.pairing.topology}, {len(pairings)} exchanges "
+              f"({all_pairs} with a full round robin)")
+        self.exchange_counts[self.current_iteration] = len(pairings)
+        
         debate_results = []
-        round_num = 1
-        
-        # Each agent questions each other agent once
-        for questioner in self.agents:
-            for responder in self.agents:
-                if questioner['name'] != responder['name']:
-                    print(f"\n--- Round {round_num}: {questioner['name']} → {responder['name']} ---")
-                    
-                    # Generate question
-                    question_task = self.task_factory.debate_question_task(
-                        questioner['agent'],
-                        responder['name'],
-                        round_num
-                    )
-                    question_crew = Crew(
-                        agents=[questioner['agent']],
-                        tasks=[question_task],
-                        verbose=False  # Reduce verbose output
-                    )
-                    question = question_crew.kickoff()
-                    question_content = str(question)
-                    
-                    # Generate response
-                    response_task = self.task_factory.debate_response_task(
-                        responder['agent'],
-                        question_content,
-                        questioner['name']
-                    )
-                    response_crew = Crew(
-                        agents=[responder['agent']],
-                        tasks=[response_task],
-                        verbose=False  # Reduce verbose output
-                    )
-                    response = response_crew.kickoff()
-                    response_content = str(response)
-                    
-                    debate_entry = {
-                        'round': round_num,
-                        'questioner': questioner['name'],
-                        'responder': responder['name'],
-                        'question': question_content,
-                        'response': response_content
-                    }
-                    
-                    debate_results.append(debate_entry)
-                    
-                    # Save debate exchange to history
+        completed = {}
+        next_round = 1
+        
+        # Exchanges saved before an interruption, if the plan still has them in the same rounds
+        planned = {(round_num, questioner, responder) for round_num, questioner, responder in plan}
+        restored = {entry['round']: entry for entry in resumed_exchanges or []
+                    if (entry['round'], entry['questioner'], entry['responder']) in planned}
+        if restored:
+            print(f"♻️ Reusing {len(restored)} exchange(s) saved before the interruption")
+        
+        def flush_completed():
+            """Record finished exchanges strictly in round order"""
+            nonlocal next_round
+            while next_round in completed or next_round in restored:
+                if next_round in restored:
+                    debate_results.append(restored[next_round])
+                    next_round += 1
+                    continue
+                debate_entry = completed.pop(next_round)
+                debate_results.append(debate_entry)
+                
+                # Save debate exchange to history
+                with self.metrics.timed_persistence("debate", "save_debate_exchange"):
                     self.history_manager.save_debate_exchange(
-                        round_num, questioner['name'], responder['name'],
-                        question_content, response_content
+                        debate_entry['round'], debate_entry['questioner'], debate_entry['responder'],
+                        debate_entry['question'], debate_entry['response']
                     )
-                    
-                    # Don't print full debate content to CLI - just confirmation
-                    print(f"  ✅ Exchange saved to history files")
-                    
-                    round_num += 1
+                
+                self.progress.emit('exchange_complete', iteration=self.current_iteration,
+                                   round=debate_entry['round'], questioner=debate_entry['questioner'],
+                                   responder=debate_entry['responder'])
+                
+                # Don't print full debate content to CLI - just confirmation
+                print(f"  ✅ Round {debate_entry['round']} exchange saved to history files")
+                next_round += 1
+                if on_exchange is not None:
+                    on_exchange(debate_results)
+        
+        async def run_exchange(round_num, questioner, responder):
+            print(f"\n--- Round {round_num}: {questioner['name']} → {responder['name']} ---")
+            
+            # Generate question
+            questioner_agent = self._agent_for_call(questioner)
+            question_task = self.task_factory.debate_question_task(
+                questioner_agent,
+                responder['name'],
+                round_num
+            )
+            question_crew = Crew(
+                agents=[questioner_agent],
+                tasks=[question_task],
+                verbose=False  # Reduce verbose output
+            )
+            question = await self._kickoff(question_crew, "debate", questioner['name'], per_agent_limit=True)
+            question_content = str(question)
+            
+            # Generate response (only once its question exists)
+            responder_agent = self._agent_for_call(responder)
+            response_task = self.task_factory.debate_response_task(
+                responder_agent,
+                question_content,
+                questioner['name']
+            )
+            response_crew = Crew(
+                agents=[responder_agent],
+                tasks=[response_task],
+                verbose=False  # Reduce verbose output
+            )
+            response = await self._kickoff(response_crew, "debate", responder['name'], per_agent_limit=True)
+            response_content = str(response)
+            
+            completed[round_num] = {
+                'round': round_num,
+                'questioner': questioner['name'],
+                'responder': responder['name'],
+                'question': question_content,
+                'response': response_content
+            }
+            flush_completed()
+        
+        flush_completed()
+        await asyncio.gather(*(run_exchange(*pairing) for pairing in pairings
+                               if pairing[0] not in restored))
+        
+        # Into shared memory once the phase is over, so every exchange of this phase saw the
+        # same history; later prompts get the newest turns verbatim and the rest summarized
+        for debate_entry in debate_results:
+            self.memory_manager.add_to_debate_history(
+                debate_entry['questioner'], f"QUESTION to {debate_entry['responder']}: {debate_entry['question']}",
+                debate_entry['round'], self.current_iteration
+            )
+            self.memory_manager.add_to_debate_history(
+                debate_entry['responder'], f"RESPONSE to {debate_entry['questioner']}: {debate_entry['response']}",
+                debate_entry['round'], self.current_iteration
+            )
         
         # Save phase summary
-        self.history_manager.save_phase_summary("debate", {
-            "total_rounds": len(debate_results),
-            "debate_summary": "Full debate details saved in individual exchange files"
-        })
+        with self.metrics.timed_persistence("debate", "save_phase_summary"):
+            self.history_manager.save_phase_summary("debate", {
+                "total_rounds": len(debate_results),
+                "pairing": self.pairing.topology,
+                "debate_summary": "Full debate details saved in individual exchange files"
+            })
         return debate_results
     
     async def run_voting_phase(self, debate_results: List[Dict]):
@@ -353,43 +678,73 @@ class DebateOrchestrator:
         
         votes = {}
         final_positions = {}
+        all_agent_names = [a['name'] for a in self.agents]
+        tally = VoteTally(all_agent_names, total_voters=len(self.agents), method=self.vote_method)
         
-        for agent_data in self.agents:
+        # Digested once for the iteration; every voter's prompt shares the same text
+        digest = build_debate_digest(debate_results)
+        report = {key: value for key, value in digest.items() if key != 'text'}
+        report['prompts'] = 0
+        self.digest_reports[self.current_iteration] = report
+        print(f"🗜️ Debate digest: {report['exchanges']} exchanges in {report['digest_tokens']:,} tokens "
+              f"instead of {report['raw_tokens']:,} ({report['ratio']:.0%}) per voting prompt")
+        
+        def build_task(agent_data):
             print(f"  → {agent_data['name']} casting vote...")
+            report['prompts'] += 1
             
             # Create voting task
-            task = self.task_factory.voting_task(
+            return self.task_factory.voting_task(
                 agent_data['agent'],
-                debate_results,
-                [a['name'] for a in self.agents]
+                digest['text'],
+                all_agent_names
             )
-            crew = Crew(
-                agents=[agent_data['agent']],
-                tasks=[task],
-                verbose=False  # Reduce verbose output
-            )
-            
-            result = crew.kickoff()
+        
+        decided = False
+        
+        def count_vote(agent_data, result):
+            """Update the running tally and stop once the outcome can no longer change"""
+            nonlocal decided
+            choice = tally.add_vote_content(agent_data['name'], str(result))
+            self.progress.emit('vote_cast', iteration=self.current_iteration, voter=agent_data['name'],
+                               choice=choice, votes_cast=tally.votes_cast,
+                               total_voters=tally.total_voters, leader=tally.leader)
+            print(f"    🗳️ {agent_data['name']} → {choice or 'unparsed'} "
+                  f"({tally.votes_cast}/{tally.total_voters} votes in, "
+                  f"leader: {tally.leader or 'none'})")
+            if self.early_vote_stop and not decided and tally.votes_remaining and tally.is_decided():
+                decided = True
+                outcome = "reached" if tally.consensus_guaranteed() else "impossible"
+                print(f"  ⚡ Consensus already {outcome} - skipping remaining votes")
+            return decided
+        
+        results = await self._run_per_agent_phase("voting", build_task, stop_when=count_vote)
+        
+        for agent_data, result in zip(self.agents, results):
+            if result is None:
+                continue
             vote_content = str(result)
             votes[agent_data['name']] = vote_content
             final_positions[agent_data['name']] = vote_content
             
             # Save vote to history
-            self.history_manager.save_agent_round(
-                agent_data['name'], 1, vote_content, "voting"
-            )
+            with self.metrics.timed_persistence("voting", "save_agent_round"):
+                self.history_manager.save_agent_round(
+                    agent_data['name'], 1, vote_content, "voting"
+                )
         
-        # Analyze votes for consensus
-        consensus_result = self._analyze_consensus(votes)
+        consensus_result = tally.result()
         
         voting_results = {
             'votes': votes,
             'final_positions': final_positions,
-            'consensus': consensus_result
+            'consensus': consensus_result,
+            'skipped_voters': [name for name in all_agent_names if name not in votes]
         }
         
         # Save phase summary
-        self.history_manager.save_phase_summary("voting", voting_results)
+        with self.metrics.timed_persistence("voting", "save_phase_summary"):
+            self.history_manager.save_phase_summary("voting", voting_results)
         
         return voting_results
     
@@ -422,13 +777,14 @@ class DebateOrchestrator:
             verbose=False  # Reduce verbose output
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff(crew, "final_report", lead_agent['name'])
         collaborative_report = str(result)
         
         # Save collaborative report to history
-        self.history_manager.save_agent_round(
-            "Board Collective", 1, collaborative_report, "final_report"
-        )
+        with self.metrics.timed_persistence("final_report", "save_agent_round"):
+            self.history_manager.save_agent_round(
+                "Board Collective", 1, collaborative_report, "final_report"
+            )
         
         # Also save as a special final report file
         final_report_path = os.path.join(
@@ -443,7 +799,8 @@ class DebateOrchestrator:
         return collaborative_report
     
     async def run_collaborative_report_phase(self, final_strategies: Dict[str, str], 
-                                           voting_results: Dict[str, Any]) -> str:
+                                           voting_results: Dict[str, Any],
+                                           debate_exchanges: List[Dict] = None) -> str:
         """Phase 7: Generate collaborative final report that all agents agree on"""
         print("📝 Phase 7: Collaborative Final Report Generation")
         print("All agents collaborating to create a unified final report")
@@ -463,7 +820,8 @@ class DebateOrchestrator:
             winning_strategy,
             final_strategies,
             voting_results['votes'],
-            self.history_manager.current_session_folder
+            self.history_manager.current_session_folder,
+            debate_exchanges
         )
         
         crew = Crew(
@@ -472,13 +830,14 @@ class DebateOrchestrator:
             verbose=False
         )
         
-        result = crew.kickoff()
+        result = await self._kickoff(crew, "final_report", self.agents[0]['name'])
         final_report = str(result)
         
         # Save the collaborative report
-        self.history_manager.save_agent_round(
-            "Board Collective", 1, final_report, "final_report"
-        )
+        with self.metrics.timed_persistence("final_report", "save_agent_round"):
+            self.history_manager.save_agent_round(
+                "Board Collective", 1, final_report, "final_report"
+            )
         
         # Save as special final report file
         if self.history_manager.current_session_folder:
@@ -492,99 +851,208 @@ class DebateOrchestrator:
         
         return final_report
     
+    def _print_metrics_summary(self):
+        """Print per-phase latency, token and persistence totals for this session"""
+        summary = self.metrics.summary()
+        llm = summary['llm']
+        print(f"⏱️  LLM calls: {llm['calls']} ({llm['latency_total']:.1f}s total, "
+              f"p95 {llm['latency_p95']:.1f}s, {llm['prompt_tokens']:,} prompt / "
+              f"{llm['completion_tokens']:,} completion tokens)")
+        for phase, wall_time in summary['phase_wall_time'].items():
+            stats = summary['by_phase'].get(phase)
+            if stats:
+                print(f"   • {phase}: {wall_time:.1f}s wall, {stats['calls']} calls, "
+                      f"p95 {stats['latency_p95']:.1f}s, max {stats['latency_max']:.1f}s")
+            else:
+                print(f"   • {phase}: {wall_time:.1f}s wall")
+        print(f"💾 Persistence: {summary['persistence_seconds']:.2f}s across "
+              f"{sum(op['count'] for op in summary['persistence'].values())} writes")
+    
     def _analyze_consensus(self, votes: Dict[str, str]) -> Dict:
-        """Analyze votes to determine if consensus is reached"""
-        # This is a simplified consensus analysis
-        # In a real implementation, you'd parse the vote content more carefully
-        
-        vote_counts = {}
+        """Analyze a complete set of votes to determine if consensus is reached"""
+        tally = VoteTally([a['name'] for a in self.agents], total_voters=len(self.agents),
+                          method=self.vote_method)
         for voter, vote_content in votes.items():
-            # Extract the voted agent from the content (simplified)
-            # In practice, you'd need better parsing
-            for agent_name in [a['name'] for a in self.agents]:
-                if agent_name.lower() in vote_content.lower() and agent_name != voter:
-                    vote_counts[agent_name] = vote_counts.get(agent_name, 0) + 1
-                    break
-        
-        if vote_counts:
-            winner = max(vote_counts, key=vote_counts.get)
-            consensus_reached = vote_counts[winner] >= len(self.agents) * 0.67  # 67% threshold
-        else:
-            winner = None
-            consensus_reached = False
-        
-        return {
-            'consensus_reached': consensus_reached,
-            'winning_agent': winner,
-            'vote_distribution': vote_counts,
-            'total_votes': len(votes)
+            tally.add_vote_content(voter, vote_content)
+        return tally.result()
+    
+    def _checkpoint(self, topic: str, max_iterations: int, phase: str, iteration: int,
+                    state: Dict[str, Any]):
+        """Persist everything needed to continue the debate after this phase"""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'topic': topic,
+            'max_iterations': max_iterations,
+            'session_folder': self.history_manager.current_session_folder,
+            'phase': phase,
+            'iteration': iteration,
+            'state': state,
+            'memory': self.memory_manager.snapshot(),
+            'saved_at': datetime.datetime.now().isoformat()
         }
+        with self.metrics.timed_persistence(phase, "save_checkpoint"):
+            self.history_manager.save_checkpoint(checkpoint)
     
-    async def run_full_debate(self, topic: str, max_iterations: int = 3):
-        """Run the complete debate process following the 7-step rule"""
+    async def run_full_debate(self, topic: str, max_iterations: int = 3, checkpoint: Dict[str, Any] = None):
+        """Run the complete debate process following the 7-step rule.
+        
+        With a checkpoint (see ChatHistoryManager.load_checkpoint) the debate continues in
+        the checkpoint's session folder from the first phase that had not finished.
+        """
         print(f"🎯 Starting Complete Board Debate Session")
         print(f"Topic: {topic}")
         print("=" * 80)
         
-        # Initialize history manager and create session folder
-        session_folder = self.history_manager.create_session_folder(topic)
-        print(f"📁 Session history will be saved to: {session_folder}")
+        # Fresh metrics for this session
+        self.metrics = MetricsRecorder()
+        self.convergence = ConvergenceDetector(self.convergence_threshold)
+        # Seeded by topic, so a resumed debate's random pairings match the interrupted run
+        self.pairing.seed = topic
+        self.exchange_counts = {}
+        self.digest_reports = {}
+        self.current_iteration = 0
+        
+        if checkpoint:
+            # Reuse the interrupted session's folder and rebuild shared memory
+            session_folder = self.history_manager.open_session_folder(checkpoint['session_folder'])
+            self.memory_manager.restore(checkpoint.get('memory', {}))
+            state = dict(checkpoint['state'])
+            resumed_at = checkpoint_position(checkpoint['phase'], checkpoint['iteration'])
+            print(f"♻️ Resuming session in {session_folder} after {checkpoint['phase']} "
+                  f"(iteration {checkpoint['iteration']})")
+        else:
+            # Initialize history manager and create session folder
+            session_folder = self.history_manager.create_session_folder(topic)
+            print(f"📁 Session history will be saved to: {session_folder}")
+            state = {}
+            resumed_at = None
+        
+        def completed(phase: str, iteration: int = 0) -> bool:
+            return resumed_at is not None and checkpoint_position(phase, iteration) <= resumed_at
         
         await self.initialize_agents()
         
         # Phase 1: Research (Rule 1)
-        strategies = await self.run_research_phase(topic)
+        if not completed("research"):
+            with self._timed_phase("research", self.current_iteration):
+                state['strategies'] = await self.run_research_phase(topic)
+            self._checkpoint(topic, max_iterations, "research", 0, state)
+        strategies = state['strategies']
         
         # Phase 2: Presentation (Rule 2)
-        presentations = await self.run_presentation_phase(strategies)
+        if not completed("presentation"):
+            with self._timed_phase("presentation", self.current_iteration):
+                state['presentations'] = await self.run_presentation_phase(strategies)
+            self._checkpoint(topic, max_iterations, "presentation", 0, state)
         
         # Phase 3: Embodiment (Rule 3) - TEMPORARILY DISABLED FOR SPEED
         # embodiments = await self.run_embodiment_phase(strategies)
         embodiments = {}  # Empty for now to maintain compatibility
         
         # Iterative process for Rules 4-7
-        iteration = 1
-        consensus_reached = False
-        final_voting_results = None
-        final_revised_strategies = strategies
+        iteration = state.get('iteration', 1)
+        consensus_reached = state.get('consensus_reached', False)
+        final_voting_results = state.get('final_voting_results')
+        final_revised_strategies = state.get('final_revised_strategies', strategies)
+        self.convergence.restore(state.get('convergence'))
+        converged = state.get('converged', False)
         
-        while iteration <= max_iterations and not consensus_reached:
+        while iteration <= max_iterations and not consensus_reached and not converged:
             print(f"\n🔄 Starting Iteration {iteration}")
             print("=" * 50)
+            self.current_iteration = iteration
+            state['iteration'] = iteration
             
             # Phase 4: Adjustment (Rule 4)
-            revised_strategies = await self.run_adjustment_phase(strategies, embodiments)
+            if not completed("adjustment", iteration):
+                with self._timed_phase("adjustment", iteration):
+                    state['revised_strategies'] = await self.run_adjustment_phase(strategies, embodiments)
+                state['final_revised_strategies'] = state['revised_strategies']
+                self._checkpoint(topic, max_iterations, "adjustment", iteration, state)
+            revised_strategies = state['revised_strategies']
             final_revised_strategies = revised_strategies
             
             # Phase 5: Debate (Rule 5)
-            debate_results = await self.run_debate_phase(revised_strategies)
+            if not completed("debate", iteration):
+                partial = state.get('partial_debate') or {}
+                
+                def checkpoint_exchanges(debate_results, iteration=iteration):
+                    # Still positioned after adjustment: a resume reruns the debate phase,
+                    # reusing these exchanges instead of saving them (and their DB records) twice
+                    state['partial_debate'] = {'iteration': iteration, 'exchanges': list(debate_results)}
+                    self._checkpoint(topic, max_iterations, "adjustment", iteration, state)
+                
+                with self._timed_phase("debate", iteration):
+                    state['debate_results'] = await self.run_debate_phase(
+                        revised_strategies,
+                        standings=final_voting_results['consensus']['vote_distribution'] if final_voting_results else None,
+                        previous_exchanges=state.get('debate_results'),
+                        resumed_exchanges=partial.get('exchanges') if partial.get('iteration') == iteration else None,
+                        on_exchange=checkpoint_exchanges
+                    )
+                state.pop('partial_debate', None)
+                self._checkpoint(topic, max_iterations, "debate", iteration, state)
+            debate_results = state['debate_results']
             
             # Phase 6: Voting (Rule 6)
-            voting_results = await self.run_voting_phase(debate_results)
+            with self._timed_phase("voting", iteration):
+                voting_results = await self.run_voting_phase(debate_results)
             final_voting_results = voting_results
             consensus_reached = voting_results['consensus']['consensus_reached']
+            voted_iteration = iteration
+            
+            # How far this iteration moved each position (iteration 1: from the research strategies)
+            point = self.convergence.observe(iteration, strategies, revised_strategies)
+            self.progress.emit('convergence', iteration=iteration, similarity=point['similarity'],
+                               min_similarity=point['min_similarity'], least_stable=point['least_stable'],
+                               agreement=point['agreement'], converged=point['converged'])
+            print(f"📉 Convergence: similarity to previous positions {point['similarity']:.2f} "
+                  f"(least stable: {point['least_stable']} at {point['min_similarity']:.2f}), "
+                  f"board agreement {point['agreement']:.2f}")
             
             if consensus_reached:
                 print(f"🎉 CONSENSUS REACHED in iteration {iteration}!")
                 print(f"Winning approach: {voting_results['consensus']['winning_agent']}")
-                break
             else:
-                print(f"❌ No consensus in iteration {iteration}. Continuing...")
+                converged = self.convergence_stop and point['converged']
+                if converged:
+                    print(f"🧊 No consensus in iteration {iteration}, but positions have converged "
+                          f"(similarity ≥ {self.convergence_threshold:.2f}) - stopping iterations")
+                else:
+                    print(f"❌ No consensus in iteration {iteration}. Continuing...")
                 # Update strategies for next iteration
                 strategies = revised_strategies
                 iteration += 1
+            
+            state.update({
+                'strategies': strategies,
+                'iteration': iteration,
+                'consensus_reached': consensus_reached,
+                'converged': converged,
+                'convergence': self.convergence.trajectory,
+                'final_voting_results': final_voting_results
+            })
+            self._checkpoint(topic, max_iterations, "voting", voted_iteration, state)
         
-        if not consensus_reached:
+        if not consensus_reached and not converged:
             print(f"⏰ Maximum iterations ({max_iterations}) reached without consensus")
             print("Proceeding with best available result for collaborative report...")
         
         # Phase 7: Collaborative Final Report (Always run this, regardless of consensus)
         print(f"\n📝 Generating Collaborative Final Report")
         print("=" * 50)
-        collaborative_report = await self.run_collaborative_report_phase(
-            final_revised_strategies, 
-            final_voting_results
-        )
+        if not completed("final_report", iteration):
+            with self._timed_phase("final_report", self.current_iteration):
+                state['collaborative_report'] = await self.run_collaborative_report_phase(
+                    final_revised_strategies, 
+                    final_voting_results,
+                    state.get('debate_results')
+                )
+            self._checkpoint(topic, max_iterations, "final_report", iteration, state)
+        collaborative_report = state['collaborative_report']
+        
+        # Off the event loop: the database history manager waits for its queued writes here
+        session_files = await asyncio.to_thread(self.history_manager.get_session_summary)
         
         # Prepare final report with complete data
         final_report = {
@@ -595,17 +1063,51 @@ class DebateOrchestrator:
             'debate_history': self.memory_manager.debate_history,
             'voting_results': final_voting_results,
             'consensus_reached': consensus_reached,
+            'converged': converged,
+            'convergence': self.convergence.to_dict(),
             'iterations_completed': iteration - 1,
             'global_context': dict(self.memory_manager.global_context),
             'summary': {
                 'total_agents': len(self.agents),
-                'total_debate_rounds': len(self.memory_manager.debate_history) if hasattr(self.memory_manager, 'debate_history') else 0,
-                'session_files': self.history_manager.get_session_summary()
+                'total_debate_rounds': self.memory_manager.exchange_count(),
+                'context_tokens': dict(self.memory_manager.context_stats),
+                'session_files': session_files
             }
         }
         
         # Save final report to history
-        self.history_manager.save_final_report(final_report)
+        with self.metrics.timed_persistence("final_report", "save_final_report"):
+            self.history_manager.save_final_report(final_report)
+        
+        # Barrier: queued database writes must land before the debate counts as finished
+        if hasattr(self.history_manager, 'flush'):
+            with self.metrics.timed_persistence("final_report", "flush"):
+                if not await asyncio.to_thread(self.history_manager.flush, PERSISTENCE_FLUSH_TIMEOUT):
+                    print("⚠️ Some database writes are not confirmed yet; "
+                          "they stay in the session's write-ahead log and are replayed on the next start")
+        
+        # Save performance metrics next to the final report
+        metrics = self.metrics.to_dict()
+        if hasattr(self.history_manager, 'get_write_stats'):
+            metrics['write_queue'] = self.history_manager.get_write_stats()
+        if self.agent_factory.llm_factory is None:
+            # Process-wide: shared with any other debate running in this process
+            metrics['llm_clients'] = get_llm_registry().get_stats()
+        if self.call_limiter is not None:
+            metrics['call_limiter'] = self.call_limiter.get_stats()
+        if self.agent_factory.rate_limiters is not None:
+            # Process-wide as well: every debate draws from the same per-model limiters
+            metrics['rate_limits'] = self.agent_factory.rate_limiters.get_stats()
+        metrics['convergence'] = self.convergence.to_dict()
+        metrics['pairing'] = {**self.pairing.describe(), 'exchanges': dict(self.exchange_counts)}
+        metrics['vote_digest'] = {
+            'iterations': dict(self.digest_reports),
+            'tokens_saved': sum((r['raw_tokens'] - r['digest_tokens']) * r['prompts']
+                                for r in self.digest_reports.values()),
+        }
+        if self.token_streamer is not None:
+            metrics['token_stream'] = self.token_streamer.get_stats()
+        self.history_manager.save_metrics(metrics)
         
         # Print concise summary to CLI (not full text)
         print("\n" + "="*80)
@@ -615,6 +1117,48 @@ class DebateOrchestrator:
         print(f"🤖 Agents participated: {len(self.agents)}")
         print(f"🔄 Iterations completed: {iteration - 1}")
         print(f"🎯 Consensus reached: {consensus_reached}")
+        if self.convergence.trajectory:
+            print(f"📉 Convergence trajectory: "
+                  + " → ".join(f"{p['similarity']:.2f}" for p in self.convergence.trajectory)
+                  + (" (converged)" if converged else ""))
+        if self.digest_reports:
+            print(f"🗜️ Voting prompts: {metrics['vote_digest']['tokens_saved']:,} tokens saved by debate digests")
+        if self.exchange_counts:
+            print(f"🔀 Debate pairing: {self.pairing.topology}, "
+                  f"{sum(self.exchange_counts.values())} exchanges over {len(self.exchange_counts)} iterations")
+        context_stats = self.memory_manager.context_stats
+        if context_stats['calls']:
+            print(f"🧮 Prompt context: {context_stats['tokens_used']:,} tokens across {context_stats['calls']} prompts "
+                  f"({context_stats['tokens_saved']:,} saved vs. full shared memory, "
+                  f"{context_stats['cache_hits']} served from cache, "
+                  f"{context_stats['summaries']} history summaries computed once and shared)")
+        self._print_metrics_summary()
+        if 'write_queue' in metrics:
+            write_stats = metrics['write_queue']
+            print(f"📮 DB write queue: {write_stats['delivered']} delivered, {write_stats['failed']} failed, "
+                  f"{write_stats['retries']} retries, max depth {write_stats['max_depth']}, "
+                  f"p95 latency {write_stats['latency_p95']:.2f}s")
+        if 'llm_clients' in metrics:
+            client_stats = metrics['llm_clients']
+            print(f"🔌 LLM connections: {client_stats['clients']} shared clients, "
+                  f"{client_stats['http_requests']} requests over {client_stats['connections_opened']} connections "
+                  f"({client_stats['tls_handshakes']} TLS handshakes)")
+        for model, limit_stats in metrics.get('rate_limits', {}).items():
+            print(f"🚦 Rate limit {model}: {limit_stats['rpm']:.0f}/{limit_stats['rpm_limit']:.0f} RPM, "
+                  f"{limit_stats['tpm']:,.0f}/{limit_stats['tpm_limit']:,.0f} TPM, "
+                  f"{limit_stats['waited_calls']} calls waited {limit_stats['wait_seconds']:.1f}s, "
+                  f"{limit_stats['rate_limited']} rate-limited")
+        if 'token_stream' in metrics:
+            stream_stats = metrics['token_stream']
+            first_token = stream_stats['avg_time_to_first_token']
+            print(f"📡 Token stream: {stream_stats['tokens']:,} tokens in {stream_stats['requests']} requests, "
+                  f"{stream_stats['failed_requests']} failed"
+                  + (f", avg time to first token {first_token:.1f}s" if first_token is not None else ""))
+        if self.agent_factory.llm_cache is not None:
+            cache_stats = self.agent_factory.llm_cache.get_stats()
+            print(f"💽 LLM cache ({cache_stats['mode']}): {cache_stats['hits']} hits, "
+                  f"{cache_stats['misses']} misses, {cache_stats['entries']} entries "
+                  f"({cache_stats['size_bytes'] / 1024 / 1024:.1f} MB)")
         
         if consensus_reached and final_voting_results:
             print(f"🏆 Winning approach: {final_voting_results['consensus']['winning_agent']}")
@@ -657,7 +1201,7 @@ async def main():
     print("\n" + "="*50)
     print("DEBATE COMPLETE!")
     print("="*50)
-    print(f"Total debate rounds: {len(results['debate_history'])}")
+    print(f"Total debate rounds: {results['summary']['total_debate_rounds']}")
     print(f"Strategies developed: {len(results['final_strategies'])}")
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+LangChain chat models as crewai LLMs
+crewai rebuilds any llm that is not one of its own BaseLLMs as a litellm LLM from just the
+model name and temperature, which would silently drop everything configured on our
+LangChain clients: the response cache, the pooled HTTP transport, the rate limiter, the
+token-streaming callbacks and the offline fake backend. Agents get their chat model
+wrapped in LangChainLLM instead, which crewai keeps as it is and which sends every call
+through the wrapped model.
+
+Each DebateAgents wraps its clients itself, and one wrapper serves all of its agents with
+the same temperature; only the wrapped LangChain client and its HTTP transport are shared
+process-wide (utils/llm_clients.py). crewai's per-instance token counters would therefore
+add up the calls of every agent and iteration using the wrapper. Inside usage_scope() (one
+crew kickoff) the usage crewai reports is only that of the calls made in the scope;
+contextvars carry the scope into asyncio.to_thread and crewai's own worker threads.
+"""
+import contextlib
+import contextvars
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from crewai.types.usage_metrics import UsageMetrics
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from pydantic import Field
+
+# gpt-4o; crewai trims agent context to fit this
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+_MESSAGE_TYPES = {'system': SystemMessage, 'assistant': AIMessage}
+
+# Token usage of the calls made in the current usage_scope(), by wrapper
+_context_usage: contextvars.ContextVar[Optional[Dict[int, UsageMetrics]]] = contextvars.ContextVar(
+    'langchain_llm_usage', default=None)
+
+
+def to_langchain_messages(messages: Any) -> List[BaseMessage]:
+    """crewai messages (a string or role/content dicts) as LangChain messages"""
+    if isinstance(messages, str):
+        return [HumanMessage(content=messages)]
+    return [_MESSAGE_TYPES.get(m.get('role'), HumanMessage)(content=m.get('content') or '')
+            for m in messages]
+
+
+@contextlib.contextmanager
+def usage_scope():
+    """Report only the token usage of the calls made inside this block (one crew kickoff)"""
+    token = _context_usage.set({})
+    try:
+        yield
+    finally:
+        _context_usage.reset(token)
+
+
+class LangChainLLM(BaseLLM):
+    """A crewai LLM that runs each call on a LangChain chat model"""
+
+    llm_type: str = "langchain"
+    chat_model: Any = Field(exclude=True)
+    context_window: int = DEFAULT_CONTEXT_WINDOW
+
+    @classmethod
+    def wrap(cls, chat_model: Any) -> 'LangChainLLM':
+        """A new wrapper around chat_model (which may itself be a shared client)"""
+        model = getattr(chat_model, 'model_name', None) or getattr(chat_model, 'model', None)
+        return cls(model=str(model or type(chat_model).__name__), chat_model=chat_model,
+                   temperature=getattr(chat_model, 'temperature', None))
+
+    def call(self, messages: Any, tools: Optional[list] = None, callbacks: Optional[list] = None,
+             available_functions: Optional[dict] = None, from_task: Any = None,
+             from_agent: Any = None, response_model: Any = None) -> str:
+        # The board's agents have no tools, so this is a plain completion
+        message = self.chat_model.invoke(to_langchain_messages(messages),
+                                         stop=self.stop_sequences or None)
+        usage = getattr(message, 'usage_metadata', None)
+        if usage:
+            self._track_token_usage(dict(usage))
+        return str(message.content)
+
+    def _track_token_usage(self, usage: dict):
+        # Lifetime totals of the wrapper, plus the usage of the current scope's calls
+        self._track_token_usage_internal(usage)
+        metrics = UsageMetrics.from_provider_dict(usage)
+        scope = _context_usage.get()
+        if metrics is not None and scope is not None:
+            scope.setdefault(id(self), UsageMetrics()).add_usage_metrics(metrics)
+
+    def get_token_usage_summary(self) -> UsageMetrics:
+        """Token usage of this scope's calls, or the lifetime totals outside any scope"""
+        scope = _context_usage.get()
+        if scope is None:
+            return super().get_token_usage_summary()
+        usage = scope.get(id(self))
+        return usage.model_copy() if usage else UsageMetrics()
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return self.context_window
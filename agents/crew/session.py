@@ -0,0 +1,239 @@
+"""
+Per-debate sessions for running many debates in one process
+A DebateSession owns everything that belongs to one debate: its orchestrator (shared
+memory, agents and metrics), its history manager with the debate ID, session folder and
+API URL. A DebateRuntime holds what the sessions of a process share: the LLM settings
+(clients come from utils.llm_clients), the provider rate limiters (utils.rate_limiter)
+and a cap on concurrent LLM calls across debates. A session's progress events go to the
+sink it is opened with (utils.progress); with token streaming on, its own TokenStreamer
+relays its agents' tokens (utils.token_stream).
+"""
+import asyncio
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .flow import DebateOrchestrator
+from utils.convergence import DEFAULT_CONVERGENCE_THRESHOLD
+from utils.db_adapter import DatabaseIntegratedHistoryManager
+from utils.defaults import DEFAULT_MAX_PARALLEL_AGENTS, DEFAULT_MAX_CALLS_PER_AGENT
+from utils.rate_limiter import DEFAULT_LANE, LANES, RateLimiterRegistry, priority_lane
+from utils.pairing import DEFAULT_PAIRING_DEGREE, DEFAULT_TOPOLOGY
+from utils.progress import ProgressEmitter, ProgressSink
+from utils.tally import DEFAULT_TALLY_METHOD
+from utils.token_stream import TokenStreamer
+from utils.wal import DEFAULT_FSYNC
+
+if TYPE_CHECKING:
+    from utils.llm_cache import LLMResponseCache
+
+DEFAULT_MAX_ITERATIONS = 3
+
+
+class CallLimiter:
+    """Caps concurrent LLM calls across every debate of the process.
+
+    Used as an async context manager around each call; the semaphore is recreated when
+    the limiter is first used on a different event loop.
+    """
+
+    def __init__(self, max_concurrent_calls: int):
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self._loop = None
+        self._semaphore = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waited_calls = 0
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        if self._semaphore.locked():
+            self.waited_calls += 1
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'max_concurrent_calls': self.max_concurrent_calls,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'waited_calls': self.waited_calls,
+        }
+
+
+class DebateSession:
+    """One debate and all of its state; sessions never share mutable objects"""
+
+    def __init__(self, runtime: 'DebateRuntime', debate_id: Optional[str], topic: Optional[str],
+                 api_base_url: str = None, checkpoint: Dict[str, Any] = None,
+                 orchestrator: DebateOrchestrator = None, priority: str = DEFAULT_LANE,
+                 progress_sink: ProgressSink = None):
+        if priority not in LANES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {LANES}")
+        self.runtime = runtime
+        self.priority = priority
+        self.checkpoint = checkpoint
+        self.debate_id = debate_id or (checkpoint or {}).get('debate_id')
+        self.topic = topic or (checkpoint or {}).get('topic')
+        if not self.topic:
+            raise ValueError("A debate session needs a topic or a checkpoint to resume")
+        self.api_base_url = api_base_url
+
+        self.history_manager = DatabaseIntegratedHistoryManager(
+            runtime.base_path, wal_fsync=runtime.wal_fsync, api_base_url=api_base_url
+        )
+        self.history_manager.db_adapter.current_debate_id = self.debate_id
+        self.orchestrator = orchestrator or runtime.create_orchestrator(self.history_manager)
+        self.orchestrator.history_manager = self.history_manager
+        # Tokens are relayed per debate ID, so only sessions the server knows about stream
+        self.token_streamer = None
+        if runtime.stream_tokens and self.debate_id:
+            self.token_streamer = TokenStreamer(self.debate_id, self.history_manager.db_adapter.api_base_url)
+        self.orchestrator.token_streamer = self.token_streamer
+        self.progress = ProgressEmitter(progress_sink, self.debate_id)
+        self.orchestrator.progress = self.progress
+        self.status = 'created'
+
+    @property
+    def key(self) -> str:
+        """Identifies the session within its runtime (debate ID, else the resumed folder)"""
+        if self.debate_id:
+            return self.debate_id
+        return os.path.basename(self.checkpoint['session_folder']) if self.checkpoint else self.topic
+
+    def resolve_max_iterations(self, max_iterations: int = None) -> int:
+        return max_iterations or (self.checkpoint or {}).get('max_iterations') or DEFAULT_MAX_ITERATIONS
+
+    async def run(self, max_iterations: int = None) -> Dict[str, Any]:
+        """Run (or resume) the debate to completion"""
+        self.status = 'running'
+        max_iterations = self.resolve_max_iterations(max_iterations)
+        self.progress.emit('debate_start', topic=self.topic, max_iterations=max_iterations,
+                           resumed=self.checkpoint is not None)
+        try:
+            # Every LLM call of this debate (tasks and threads inherit the lane) waits in its lane
+            with priority_lane(self.priority):
+                results = await self.orchestrator.run_full_debate(
+                    self.topic, max_iterations, checkpoint=self.checkpoint
+                )
+        except BaseException as e:
+            self.status = 'cancelled' if isinstance(e, asyncio.CancelledError) else 'failed'
+            self.progress.emit('debate_end', status=self.status, error=str(e) or type(e).__name__)
+            raise
+        finally:
+            if self.token_streamer is not None:
+                await asyncio.to_thread(self.token_streamer.close)
+            self.runtime.close_session(self)
+        self.status = 'completed'
+        self.progress.emit('debate_end', status=self.status,
+                           consensus_reached=results.get('consensus_reached'),
+                           iterations_completed=results.get('iterations_completed'),
+                           session_folder=results.get('session_folder'))
+        return results
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """This debate's call, phase and persistence metrics so far"""
+        return self.orchestrator.metrics.summary()
+
+
+class DebateRuntime:
+    """Shared settings and limits for every debate session of a process"""
+
+    def __init__(self, max_parallel_agents: int = DEFAULT_MAX_PARALLEL_AGENTS,
+                 max_calls_per_agent: int = DEFAULT_MAX_CALLS_PER_AGENT,
+                 early_vote_stop: bool = True,
+                 llm_cache: 'LLMResponseCache' = None,
+                 llm_factory: Callable[[float], Any] = None,
+                 rate_limiters: RateLimiterRegistry = None,
+                 max_concurrent_calls: int = None,
+                 base_path: str = None,
+                 wal_fsync: str = DEFAULT_FSYNC,
+                 stream_tokens: bool = False,
+                 vote_method: str = DEFAULT_TALLY_METHOD,
+                 convergence_stop: bool = True,
+                 convergence_threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+                 pairing: str = DEFAULT_TOPOLOGY,
+                 exchange_budget: int = None,
+                 pairing_degree: int = DEFAULT_PAIRING_DEGREE):
+        self.max_parallel_agents = max_parallel_agents
+        self.max_calls_per_agent = max_calls_per_agent
+        self.early_vote_stop = early_vote_stop
+        self.llm_cache = llm_cache
+        self.llm_factory = llm_factory
+        self.rate_limiters = rate_limiters
+        self.call_limiter = CallLimiter(max_concurrent_calls) if max_concurrent_calls else None
+        self.base_path = base_path
+        self.wal_fsync = wal_fsync
+        self.stream_tokens = stream_tokens
+        self.vote_method = vote_method
+        self.convergence_stop = convergence_stop
+        self.convergence_threshold = convergence_threshold
+        self.pairing = pairing
+        self.exchange_budget = exchange_budget
+        self.pairing_degree = pairing_degree
+        self.sessions: Dict[str, DebateSession] = {}
+
+    def create_orchestrator(self, history_manager=None) -> DebateOrchestrator:
+        """A fresh orchestrator (own memory and metrics) using the shared settings and limits"""
+        return DebateOrchestrator(
+            max_parallel_agents=self.max_parallel_agents,
+            max_calls_per_agent=self.max_calls_per_agent,
+            early_vote_stop=self.early_vote_stop,
+            llm_cache=self.llm_cache,
+            llm_factory=self.llm_factory,
+            call_limiter=self.call_limiter,
+            history_manager=history_manager,
+            rate_limiters=self.rate_limiters,
+            stream_tokens=self.stream_tokens,
+            vote_method=self.vote_method,
+            convergence_stop=self.convergence_stop,
+            convergence_threshold=self.convergence_threshold,
+            pairing=self.pairing,
+            exchange_budget=self.exchange_budget,
+            pairing_degree=self.pairing_degree
+        )
+
+    def history_manager(self) -> DatabaseIntegratedHistoryManager:
+        """A history manager for maintenance work outside any session (replay, lookups)"""
+        return DatabaseIntegratedHistoryManager(self.base_path, wal_fsync=self.wal_fsync)
+
+    def open_session(self, debate_id: str = None, topic: str = None, api_base_url: str = None,
+                     resume: str = None, orchestrator: DebateOrchestrator = None,
+                     priority: str = DEFAULT_LANE, progress_sink: ProgressSink = None) -> DebateSession:
+        """Create a session; resume is a session folder or debate ID with a checkpoint.
+
+        progress_sink receives the session's progress events (see utils/progress.py).
+        Raises ValueError if there is nothing to resume or the debate is already open.
+        """
+        checkpoint = None
+        if resume:
+            manager = self.history_manager()
+            checkpoint = manager.load_checkpoint(manager.find_session_folder(resume))
+
+        session = DebateSession(self, debate_id, topic, api_base_url=api_base_url,
+                                checkpoint=checkpoint, orchestrator=orchestrator, priority=priority,
+                                progress_sink=progress_sink)
+        if session.key in self.sessions:
+            raise ValueError(f"Debate {session.key} is already running in this process")
+        self.sessions[session.key] = session
+        return session
+
+    def close_session(self, session: DebateSession):
+        if self.sessions.get(session.key) is session:
+            del self.sessions[session.key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-debate metrics of the open sessions, plus the shared call limiter"""
+        return {
+            'sessions': {key: session.metrics for key, session in self.sessions.items()},
+            'call_limiter': self.call_limiter.get_stats() if self.call_limiter else None,
+        }
@@ -5,8 +5,23 @@ from typing import Dict, List
 import json
 import json
 
+from utils.history_manager import debate_exchange_filename
+from utils.pairing import PairingPlanner
+
 A4_LIMIT = "(<900 words)"
 
+# Context token budget per task type (see crew/context.py). Tasks that already inline
+# strategies or debate results get a smaller shared-memory context.
+CONTEXT_BUDGETS = {
+    'research': 1000,
+    'embodiment': 1000,
+    'question': 2000,
+    'response': 2000,
+    'revision': 1200,
+    'voting': 1200,
+    'final_report': 2500,
+}
+
 class DebateTasks:
     def __init__(self, memory_manager):
         self.memory_manager = memory_manager
@@ -23,7 +38,7 @@ class DebateTasks:
             4. Consider potential counterarguments
             5. Deeply consider each other agent's potential perspectives before forming your strategy
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['research'])}
             
             You are among history's greatest minds. Your intellectual legacy and the advancement 
             of human understanding depends on the rigor and insight you bring to this analysis. 
@@ -48,7 +63,7 @@ class DebateTasks:
             3. Practice arguing from their perspective
             4. Prepare thoughtful questions for each position
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['embodiment'])}
             """,
             expected_output="A summary of understanding of each other agent's position and prepared questions for debate.",
             agent=agent,
@@ -65,7 +80,7 @@ class DebateTasks:
             3. Build on previous debate rounds
             4. Stay respectful but be intellectually rigorous
             
-            Debate History: {self.memory_manager.get_context_for_agent(questioner.role)}
+            Debate History: {self.memory_manager.get_context_for_agent(questioner.role, CONTEXT_BUDGETS['question'])}
             """,
             expected_output=f"One specific question directed at {target_agent}",
             agent=questioner,
@@ -90,7 +105,7 @@ class DebateTasks:
             If this question has genuinely changed your mind about something,
             say so explicitly and explain why.
             
-            Context: {self.memory_manager.get_context_for_agent(responder.role)}
+            Context: {self.memory_manager.get_context_for_agent(responder.role, CONTEXT_BUDGETS['response'])}
             """,
             expected_output="A direct, thoughtful response to the debate question",
             agent=responder,
@@ -115,7 +130,7 @@ class DebateTasks:
             If you've changed your position significantly, explain why.
             If you're sticking with your original position, explain why other perspectives haven't swayed you.
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['revision'])}
             """,
             expected_output="A refined strategy (max 1500 words) that incorporates lessons learned from other perspectives.",
             agent=agent,
@@ -145,18 +160,21 @@ class DebateTasks:
             If you've changed your position significantly, explain why.
             If you're strengthening your original position, explain how the other perspectives have helped you refine it.
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['revision'])}
             """,
             expected_output="A refined strategy (max 1500 words) that incorporates insights from considering other perspectives.",
             agent=agent,
         )
     
-    def voting_task(self, agent: Agent, debate_results: List[Dict], all_agent_names: List[str]) -> Task:
+    def voting_task(self, agent: Agent, debate_digest: str, all_agent_names: List[str]) -> Task:
+        """debate_digest: the iteration's exchanges digested once for all voters (utils/digest.py)"""
         return Task(
             description=f"""
             After the complete debate, cast your vote for the best overall approach.
             
-            Complete debate history: {debate_results}
+            Debate digest (each exchange's question, key claims, concessions and changed minds;
+            full exchanges are in the session's debate_round files):
+            {debate_digest}
             
             Available agents to vote for: {all_agent_names}
             
@@ -172,17 +190,23 @@ class DebateTasks:
             - You can vote for another agent if their arguments convinced you
             - Be intellectually honest - the goal is finding the best solution, not winning
             
-            Format your response as:
-            "I vote for [AGENT NAME] because [detailed reasoning]"
+            Format your response as a single JSON object and nothing else:
+            {{"ranking": ["<AGENT NAME>", "<AGENT NAME>", ...],
+              "weights": {{"<AGENT NAME>": <number>, ...}},
+              "reasoning": "<detailed reasoning>"}}
+            - "ranking": agents from most to least preferred, your vote first; use the exact
+              names listed above
+            - "weights" (optional): how strongly you back each agent you rank, e.g. 3 and 1
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['voting'])}
             """,
-            expected_output="A clear vote with detailed reasoning for why that approach is best.",
+            expected_output="A JSON ballot with a ranking of the agents, optional weights and detailed reasoning.",
             agent=agent,
         )
     
     def collaborative_final_report_task(self, agent: Agent, winning_strategy: str, all_strategies: Dict[str, str], 
-                                      voting_results: Dict[str, str], session_folder: str) -> Task:
+                                      voting_results: Dict[str, str], session_folder: str,
+                                      debate_exchanges: List[Dict] = None) -> Task:
         
         # Generate list of available files for reference
         agent_names = list(all_strategies.keys())
@@ -195,17 +219,14 @@ class DebateTasks:
                 f"{clean_name}_voting_round1.txt"
             ])
         
-        # Add debate files
-        debate_files = []
-        for i, questioner in enumerate(agent_names):
-            for j, responder in enumerate(agent_names):
-                if questioner != responder:
-                    round_num = i * (len(agent_names) - 1) + j + 1
-                    if j > i:
-                        round_num -= 1
-                    questioner_clean = questioner.lower().replace(' ', '_')
-                    responder_clean = responder.lower().replace(' ', '_')
-                    debate_files.append(f"debate_round_{round_num:02d}_{questioner_clean}_to_{responder_clean}.txt")
+        # Add debate files: the exchanges the pairing topology actually ran (round robin if unknown)
+        if debate_exchanges is None:
+            debate_exchanges = [{'round': round_num, 'questioner': questioner, 'responder': responder}
+                                for round_num, questioner, responder in PairingPlanner().plan(agent_names, 1)]
+        debate_files = [debate_exchange_filename(e['round'], e['questioner'], e['responder'])
+                        for e in debate_exchanges]
+        more_debate_files = (f"... (and {len(debate_files) - 10} more debate exchanges)"
+                             if len(debate_files) > 10 else "")
         
         return Task(
             description=f"""
@@ -220,7 +241,7 @@ class DebateTasks:
             Research files: {[f for f in file_references if 'research' in f]}
             Adjustment files: {[f for f in file_references if 'adjustment' in f]}
             Voting files: {[f for f in file_references if 'voting' in f]}
-            Debate files: {debate_files[:10]}... (and {len(debate_files)-10} more debate exchanges)
+            Debate files: {debate_files[:10]}{more_debate_files}
             
             Your task:
             1. Create an executive summary that synthesizes insights from ALL agent perspectives
@@ -249,7 +270,7 @@ class DebateTasks:
             You represent the collective wisdom of history's greatest minds. This document should 
             be worthy of guiding civilization-level decisions. The power is in synthesis, not repetition.
             
-            Context: {self.memory_manager.get_context_for_agent(agent.role)}
+            Context: {self.memory_manager.get_context_for_agent(agent.role, CONTEXT_BUDGETS['final_report'])}
             """,
             expected_output="A comprehensive final report (1500-2500 words) that synthesizes all perspectives into actionable recommendations with specific file references for detailed analysis.",
             agent=agent,
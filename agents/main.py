@@ -3,76 +3,179 @@ import sys
 import asyncio
 import argparse
 import warnings
-from decouple import config
 
 # Suppress deprecation warnings from Google packages
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated", category=UserWarning)
 
-# Configure environment variables
-try:
-    openai_key = config("OPENAI_API_KEY")
-    anthropic_key = config("ANTHROPIC_API_KEY", default="")
+# Only lightweight modules here: crewai/langchain (crew.flow, utils.cli, utils.llm_cache)
+# and the database adapter are imported on the paths that run a debate
+from utils.defaults import DEFAULT_MAX_PARALLEL_AGENTS, DEFAULT_MAX_CALLS_PER_AGENT, CACHE_MODES
+from utils.convergence import DEFAULT_CONVERGENCE_THRESHOLD
+from utils.pairing import TOPOLOGIES, DEFAULT_TOPOLOGY, DEFAULT_PAIRING_DEGREE
+from utils.tally import TALLY_METHODS, DEFAULT_TALLY_METHOD
+from utils.wal import FSYNC_MODES, DEFAULT_FSYNC
+from utils.worker import DebateWorker, DEFAULT_WORKER_HOST, DEFAULT_WORKER_PORT, DEFAULT_WORKER_SLOTS
+
+def load_api_keys():
+    """Configure environment variables; exits if the OpenAI key is missing"""
+    from decouple import config
     
-    # Validate API keys
-    if not openai_key or openai_key == "your_openai_api_key_here":
-        print("❌ OPENAI_API_KEY not set or is placeholder. Please add your actual API key to agents/.env")
+    try:
+        openai_key = config("OPENAI_API_KEY")
+        anthropic_key = config("ANTHROPIC_API_KEY", default="")
+        
+        # Validate API keys
+        if not openai_key or openai_key == "your_openai_api_key_here":
+            print("❌ OPENAI_API_KEY not set or is placeholder. Please add your actual API key to agents/.env")
+            sys.exit(1)
+        
+        os.environ["OPENAI_API_KEY"] = openai_key
+        os.environ["ANTHROPIC_API_KEY"] = anthropic_key
+        
+        print("✅ API keys loaded successfully")
+        
+    except Exception as e:
+        print(f"❌ Failed to load API keys: {e}")
+        print("Please ensure you have a proper .env file in the agents/ directory with:")
+        print("OPENAI_API_KEY=your_actual_openai_key")
+        print("ANTHROPIC_API_KEY=your_actual_anthropic_key")
         sys.exit(1)
-    
-    os.environ["OPENAI_API_KEY"] = openai_key
-    os.environ["ANTHROPIC_API_KEY"] = anthropic_key
-    
-    print("✅ API keys loaded successfully")
-    
-except Exception as e:
-    print(f"❌ Failed to load API keys: {e}")
-    print("Please ensure you have a proper .env file in the agents/ directory with:")
-    print("OPENAI_API_KEY=your_actual_openai_key")
-    print("ANTHROPIC_API_KEY=your_actual_anthropic_key")
-    sys.exit(1)
-
-# Import after setting environment variables
-from utils.cli import DebateCLI
-from crew.flow import DebateOrchestrator
-from utils.db_adapter import DatabaseIntegratedHistoryManager
 
 async def main():
     """Main entry point for the AI Board of Directors system"""
     parser = argparse.ArgumentParser(description='AI Board of Directors Debate System')
     parser.add_argument('--topic', type=str, help='Debate topic')
     parser.add_argument('--debate-id', type=str, help='Database debate session ID')
-    parser.add_argument('--max-iterations', type=int, default=3, help='Maximum debate iterations')
+    parser.add_argument('--max-iterations', type=int,
+                        help='Maximum debate iterations (default 3, or the resumed debate\'s setting)')
     parser.add_argument('--api-url', type=str, help='Backend API URL')
-    parser.add_argument('--watch', action='store_true', help='Watch mode for development')
+    parser.add_argument('--max-parallel-agents', type=int, default=DEFAULT_MAX_PARALLEL_AGENTS,
+                        help='Maximum concurrent agent LLM calls per phase (1 = serial)')
+    parser.add_argument('--max-calls-per-agent', type=int, default=DEFAULT_MAX_CALLS_PER_AGENT,
+                        help='Maximum concurrent LLM calls by the same agent during the debate phase')
+    parser.add_argument('--no-early-vote-stop', action='store_true',
+                        help='Always collect every vote, even once the consensus outcome is decided')
+    parser.add_argument('--llm-cache', choices=CACHE_MODES,
+                        help='Enable the on-disk LLM response cache: on, refresh (overwrite) or bypass')
+    parser.add_argument('--wal-fsync', choices=FSYNC_MODES, default=DEFAULT_FSYNC,
+                        help='When the database write-ahead log is fsynced: always, interval or never')
+    parser.add_argument('--resume', type=str, metavar='SESSION_FOLDER|DEBATE_ID',
+                        help='Continue an interrupted debate from its last checkpoint')
+    parser.add_argument('--watch', action='store_true',
+                        help='Run as a worker service that accepts debate jobs over local HTTP')
+    parser.add_argument('--worker-host', type=str, default=DEFAULT_WORKER_HOST, help='Worker service host')
+    parser.add_argument('--worker-port', type=int, default=DEFAULT_WORKER_PORT, help='Worker service port')
+    parser.add_argument('--worker-slots', type=int, default=DEFAULT_WORKER_SLOTS,
+                        help='Debates the worker runs concurrently')
+    parser.add_argument('--max-concurrent-calls', type=int,
+                        help='Maximum concurrent LLM calls across all debates of this process (default: no cap)')
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='MODEL=RPM,TPM',
+                        help='Throttle a model to these requests and tokens per minute (repeatable; default: '
+                             'no limiter), e.g. gpt-4o=500,30000')
+    parser.add_argument('--priority', choices=('interactive', 'batch'), default='interactive',
+                        help='Rate limiter lane of this debate; interactive calls go ahead of batch ones')
+    parser.add_argument('--stream-tokens', action='store_true',
+                        help='Send agent output to the server token by token while it is generated')
+    parser.add_argument('--vote-method', choices=TALLY_METHODS, default=DEFAULT_TALLY_METHOD,
+                        help='How ballots are counted: top choices, ranked instant runoff or ballot weights')
+    parser.add_argument('--no-convergence-stop', action='store_true',
+                        help='Keep iterating even when the strategies stop changing between iterations')
+    parser.add_argument('--convergence-threshold', type=float, default=DEFAULT_CONVERGENCE_THRESHOLD,
+                        help='Similarity (0-1) to the previous iteration at which positions count as '
+                             f'converged (default: {DEFAULT_CONVERGENCE_THRESHOLD})')
+    parser.add_argument('--pairing', choices=TOPOLOGIES, default=DEFAULT_TOPOLOGY,
+                        help='Who questions whom in the debate phase (round_robin runs every ordered pair)')
+    parser.add_argument('--exchange-budget', type=int, metavar='N',
+                        help='Maximum debate exchanges per iteration, spread over the questioners (default: no cap)')
+    parser.add_argument('--pairing-degree', type=int, default=DEFAULT_PAIRING_DEGREE, metavar='K',
+                        help='Exchanges each agent starts with the random_regular and most_disagreeing '
+                             f'pairings (default: {DEFAULT_PAIRING_DEGREE})')
+    parser.add_argument('--progress-fd', type=int, metavar='FD',
+                        help='Write machine-readable progress events (JSON lines) to this inherited file descriptor')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report the import time of each module a debate run loads, then exit')
     
     args = parser.parse_args()
     
-    # If specific topic provided, run headless debate
-    if args.topic and args.debate_id:
-        print(f"🤖 Starting headless debate for: {args.topic}")
-        print(f"📊 Database ID: {args.debate_id}")
-        print(f"🔄 Max iterations: {args.max_iterations}")
-        
-        # Set API URL if provided
+    if args.profile_startup:
+        from utils.startup import profile_imports, print_import_profile
+        print_import_profile(profile_imports())
+        return 0
+    
+    # Every remaining path talks to the LLM providers
+    load_api_keys()
+    
+    # Shared by every debate this process runs (LLM clients come from utils.llm_clients)
+    from crew.session import DebateRuntime
+    from utils.llm_cache import LLMResponseCache
+    from utils.llm_clients import get_llm_registry
+    from utils.rate_limiter import get_rate_limiters, parse_rate_limit
+    
+    for rate_limit in args.rate_limit:
+        try:
+            get_rate_limiters().configure(*parse_rate_limit(rate_limit))
+        except ValueError as e:
+            print(f"❌ Invalid --rate-limit: {e}")
+            return 1
+    
+    def create_runtime():
+        return DebateRuntime(
+            max_parallel_agents=args.max_parallel_agents,
+            max_calls_per_agent=args.max_calls_per_agent,
+            early_vote_stop=not args.no_early_vote_stop,
+            llm_cache=LLMResponseCache(mode=args.llm_cache) if args.llm_cache else None,
+            max_concurrent_calls=args.max_concurrent_calls,
+            wal_fsync=args.wal_fsync,
+            stream_tokens=args.stream_tokens,
+            vote_method=args.vote_method,
+            convergence_stop=not args.no_convergence_stop,
+            convergence_threshold=args.convergence_threshold,
+            pairing=args.pairing,
+            exchange_budget=args.exchange_budget,
+            pairing_degree=args.pairing_degree
+        )
+    
+    # If specific topic provided (or a debate to resume), run headless debate
+    if (args.topic and args.debate_id) or args.resume:
         if args.api_url:
-            os.environ['DEBATE_API_URL'] = args.api_url
-            print(f"🌐 API URL set to: {args.api_url}")
+            print(f"🌐 API URL: {args.api_url}")
         
-        # Create orchestrator with database integration
+        # Create the debate session (orchestrator with database integration)
         print("🏗️ Creating debate orchestrator...")
-        orchestrator = DebateOrchestrator()
+        runtime = create_runtime()
+        progress_sink = None
+        if args.progress_fd is not None:
+            from utils.progress import fd_sink
+            progress_sink = fd_sink(args.progress_fd)
+        try:
+            session = runtime.open_session(args.debate_id, args.topic, api_base_url=args.api_url,
+                                           resume=args.resume, priority=args.priority,
+                                           progress_sink=progress_sink)
+        except ValueError as e:
+            print(f"❌ Cannot resume: {e}")
+            return 1
+        # Open the API connections in the background while the session is being set up
+        warm_up = asyncio.get_running_loop().run_in_executor(
+            None, get_llm_registry().warm_up, args.max_parallel_agents)
         
-        # Override history manager with database integration
-        print("🗄️ Setting up database integration...")
-        db_manager = DatabaseIntegratedHistoryManager()
-        # Set the debate ID from command line
-        db_manager.db_adapter.current_debate_id = args.debate_id
-        print(f"✅ Database manager configured with debate ID: {args.debate_id}")
-        orchestrator.history_manager = db_manager
+        if session.checkpoint:
+            print(f"♻️ Resuming debate from checkpoint in {session.checkpoint['session_folder']}")
+        max_iterations = session.resolve_max_iterations(args.max_iterations)
+        
+        print(f"🤖 Starting headless debate for: {session.topic}")
+        print(f"📊 Database ID: {session.debate_id}")
+        print(f"🔄 Max iterations: {max_iterations}")
+        print(f"⚡ Max parallel agents: {args.max_parallel_agents}")
+        print(f"✅ Database manager configured with debate ID: {session.debate_id}")
+        # Deliver writes that earlier runs logged but could not send
+        session.history_manager.replay_unacked_writes(
+            skip_folder=session.checkpoint['session_folder'] if session.checkpoint else None)
         
         # Run the debate
         print("🚀 Starting debate execution...")
         try:
-            results = await orchestrator.run_full_debate(args.topic, args.max_iterations)
+            await warm_up
+            results = await session.run(max_iterations)
             print(f"✅ Debate completed successfully!")
             print(f"📁 Results saved to: {results.get('session_folder', 'Unknown')}")
             return 0
@@ -82,19 +185,21 @@ async def main():
             traceback.print_exc()
             return 1
     
-    # If watch mode, just exit (for development)
+    # Watch mode: long-lived worker service that runs debate jobs submitted by the backend
     elif args.watch:
-        print("👀 Watch mode - agents are ready for backend requests")
-        # Keep process alive for development
+        # One connection per slot's concurrent agents, shared by every job
+        await asyncio.to_thread(get_llm_registry().warm_up, args.max_parallel_agents * args.worker_slots)
+        worker = DebateWorker(create_runtime(), slots=args.worker_slots)
         try:
-            while True:
-                await asyncio.sleep(60)
+            await worker.serve(args.worker_host, args.worker_port)
         except KeyboardInterrupt:
             print("\n👋 Shutting down agents...")
             return 0
     
     # Otherwise run CLI interface
     else:
+        from utils.cli import DebateCLI
+        
         # Check if stdin is available for interactive mode
         if not sys.stdin.isatty():
             print("🤖 No interactive terminal detected - running in headless mode")
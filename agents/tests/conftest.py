@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the agents package modules the way main.py does, from the agents directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
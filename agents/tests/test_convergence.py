@@ -0,0 +1,31 @@
+from utils.convergence import ConvergenceDetector, cosine, tfidf_vectors
+
+
+def test_identical_texts_are_fully_similar():
+    a, b, c = tfidf_vectors(['compound learning habits', 'compound learning habits', 'market timing risk'])
+    assert cosine(a, b) == 1.0 or abs(cosine(a, b) - 1.0) < 1e-9
+    assert cosine(a, c) == 0.0
+
+
+def test_converges_once_positions_stop_moving():
+    detector = ConvergenceDetector(threshold=0.9, patience=2)
+    first = {'A': 'build deep expertise first', 'B': 'explore many fields broadly'}
+    second = {'A': 'breadth matters more than depth', 'B': 'explore many fields broadly'}
+
+    point = detector.observe(1, first, second)
+    assert point['least_stable'] == 'A'
+    assert point['per_agent']['B'] == 1.0
+    assert not point['converged']
+
+    assert not detector.observe(2, second, second)['converged']
+    assert detector.observe(3, second, second)['converged']
+
+
+def test_trajectory_survives_a_checkpoint():
+    detector = ConvergenceDetector(threshold=0.9, patience=2)
+    positions = {'A': 'same text', 'B': 'other words'}
+    detector.observe(1, positions, positions)
+
+    resumed = ConvergenceDetector(threshold=0.9, patience=2)
+    resumed.restore(detector.to_dict()['trajectory'])
+    assert resumed.observe(2, positions, positions)['converged']
@@ -0,0 +1,33 @@
+from utils.digest import build_debate_digest, digest_exchange
+
+RESPONSE = (
+    "Depth compounds because expertise builds on itself. "
+    "You are right that breadth helps early on. "
+    "In light of your point I now think a short exploration phase is worth it. "
+    "Specialists still capture most of the value in mature fields."
+)
+
+
+def exchange(round_num=1):
+    return {'round': round_num, 'questioner': 'A', 'responder': 'B',
+            'question': 'Why not explore first? ' * 3, 'response': RESPONSE}
+
+
+def test_exchange_is_split_into_claims_concessions_and_changed_mind():
+    digest = digest_exchange(exchange())
+    assert 'Depth compounds' in digest['claims']
+    assert 'You are right' in digest['concessions']
+    assert 'I now think' in digest['changed_mind']
+    assert 'You are right' not in digest['claims']
+
+
+def test_digest_is_smaller_than_the_raw_results():
+    results = [exchange(r) for r in range(1, 7)]
+    digest = build_debate_digest(results)
+    assert digest['exchanges'] == 6
+    assert digest['digest_tokens'] < digest['raw_tokens']
+    assert digest['text'].startswith('Round 1: A → B')
+
+
+def test_no_exchanges():
+    assert build_debate_digest([])['text'] == '(no debate exchanges)'
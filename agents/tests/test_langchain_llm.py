@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import socket
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('langchain_core')
+
+from crewai import Agent, Crew, Task
+from langchain_core.messages import AIMessage
+
+from crew.fake_llm import FakeDebateLLM
+from crew.langchain_llm import LangChainLLM, usage_scope
+
+
+def make_agent(llm):
+    return Agent(role="Tester", goal="Answer briefly", backstory="A test agent", llm=llm)
+
+
+def test_agent_keeps_the_wrapped_llm():
+    fake = FakeDebateLLM(temperature=0.4, response_words=10)
+    llm = LangChainLLM.wrap(fake)
+    agent = make_agent(llm)
+    assert agent.llm is llm
+    assert agent.llm.chat_model is fake
+    assert agent.copy().llm.chat_model is fake
+
+
+def test_debate_agents_wrap_the_factory_llm():
+    from crew.agents import DebateAgents
+    created = []
+
+    def factory(temperature):
+        created.append(FakeDebateLLM(temperature=temperature, response_words=10))
+        return created[-1]
+
+    agent = DebateAgents(memory_manager=None, llm_factory=factory).first_principles_physicist()
+    assert isinstance(agent.llm, LangChainLLM)
+    assert agent.llm.chat_model in created
+
+
+def test_usage_is_reported_per_kickoff():
+    class CountingLLM(FakeDebateLLM):
+        def invoke(self, *args, **kwargs):
+            return AIMessage(content="Brief answer.",
+                             usage_metadata={'input_tokens': 10, 'output_tokens': 5, 'total_tokens': 15})
+
+    agent = make_agent(LangChainLLM.wrap(CountingLLM(temperature=0.4)))
+
+    async def kickoff():
+        # Concurrent calls run on agent copies sharing the wrapper, as in DebateOrchestrator
+        copy = agent.copy()
+        crew = Crew(agents=[copy], tasks=[Task(description="Say hi", expected_output="hi", agent=copy)])
+        with usage_scope():
+            return await asyncio.to_thread(crew.kickoff)
+
+    async def two_kickoffs():
+        return await asyncio.gather(kickoff(), kickoff())
+
+    for output in asyncio.run(two_kickoffs()):
+        assert output.token_usage.total_tokens == 15
+        assert output.token_usage.prompt_tokens == 10
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    attempts = []
+
+    def connect(sock, address):
+        attempts.append(address)
+        raise OSError("network access in an offline test")
+
+    monkeypatch.setattr(socket.socket, 'connect', connect)
+    monkeypatch.setattr(socket.socket, 'connect_ex', connect)
+    return attempts
+
+
+def test_benchmark_run_makes_no_network_calls(no_network, monkeypatch):
+    monkeypatch.setenv('CREWAI_DISABLE_TELEMETRY', 'true')
+    monkeypatch.setenv('OTEL_SDK_DISABLED', 'true')
+    from benchmark import run_benchmark
+
+    args = argparse.Namespace(iterations=1, latency=0.0, response_words=20, max_parallel_agents=6,
+                              max_calls_per_agent=2, verbose=False)
+    report = asyncio.run(run_benchmark(args))
+    assert report['llm_calls'] > 0
+    assert report['iterations_completed'] == 1
+    assert no_network == []
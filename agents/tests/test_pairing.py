@@ -0,0 +1,61 @@
+from collections import Counter
+
+import pytest
+
+from utils.pairing import PairingPlanner, apply_budget
+
+AGENTS = ['A', 'B', 'C', 'D']
+
+
+def test_apply_budget_takes_one_exchange_per_questioner_in_turn():
+    pairs = [('A', 'B'), ('A', 'C'), ('A', 'D'), ('B', 'A'), ('B', 'C'), ('C', 'A')]
+    assert apply_budget(pairs, 4) == [('A', 'B'), ('A', 'C'), ('B', 'A'), ('C', 'A')]
+
+
+def test_apply_budget_without_limit_or_under_it_keeps_the_plan():
+    pairs = [('A', 'B'), ('B', 'A')]
+    assert apply_budget(pairs, None) == pairs
+    assert apply_budget(pairs, 5) == pairs
+
+
+def test_round_robin_plans_every_ordered_pair():
+    plan = PairingPlanner().plan(AGENTS, iteration=1)
+    assert len(plan) == 12
+    assert [round_num for round_num, _, _ in plan] == list(range(1, 13))
+
+
+def test_budgeted_plan_is_renumbered():
+    plan = PairingPlanner(exchange_budget=5).plan(AGENTS, iteration=1)
+    assert [round_num for round_num, _, _ in plan] == [1, 2, 3, 4, 5]
+    # Every agent questions someone before anyone asks twice
+    assert Counter(questioner for _, questioner, _ in plan) == {'A': 2, 'B': 1, 'C': 1, 'D': 1}
+
+
+def test_ring_moves_its_offset_every_iteration():
+    planner = PairingPlanner('ring')
+    first = [(q, r) for _, q, r in planner.plan(AGENTS, iteration=1)]
+    second = [(q, r) for _, q, r in planner.plan(AGENTS, iteration=2)]
+    assert first == [('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'A')]
+    assert second == [('A', 'C'), ('B', 'D'), ('C', 'A'), ('D', 'B')]
+
+
+def test_random_regular_is_seeded_and_regular():
+    planner = PairingPlanner('random_regular', degree=2, seed='topic')
+    plan = planner.plan(AGENTS, iteration=1)
+    assert plan == PairingPlanner('random_regular', degree=2, seed='topic').plan(AGENTS, iteration=1)
+    asked = Counter(q for _, q, _ in plan)
+    answered = Counter(r for _, _, r in plan)
+    assert set(asked.values()) == {2} and set(answered.values()) == {2}
+    assert all(q != r for _, q, r in plan)
+
+
+def test_swiss_pairs_neighbours_in_the_standings():
+    plan = PairingPlanner('swiss').plan(AGENTS, iteration=2, standings={'D': 3, 'C': 2, 'B': 1})
+    assert [(q, r) for _, q, r in plan] == [('D', 'C'), ('C', 'D'), ('B', 'A'), ('A', 'B')]
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        PairingPlanner('everyone')
+    with pytest.raises(ValueError):
+        PairingPlanner(exchange_budget=0)
@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip('langchain_core')
+
+from utils.rate_limiter import (BURST_SECONDS, RATE_LIMIT_BACKOFF, ModelRateLimiter, RateLimiterRegistry,
+                                _TokenBucket, parse_rate_limit)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_bucket_waits_for_the_missing_tokens():
+    bucket = _TokenBucket(60)  # one per second, ten second burst
+    now = bucket.updated
+    assert bucket.capacity == 60 / 60 * BURST_SECONDS
+    assert bucket.wait_time(10, now) == 0.0
+    bucket.take(10)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == pytest.approx(0.0)
+
+
+def test_bucket_caps_a_request_at_a_full_bucket():
+    bucket = _TokenBucket(60)
+    now = bucket.updated
+    # Larger than the bucket: only waits until the bucket is full, then may go negative
+    assert bucket.wait_time(1000, now) == 0.0
+    bucket.take(1000)
+    assert bucket.tokens < 0
+
+
+def test_unbounded_bucket_never_waits():
+    bucket = _TokenBucket(None)
+    bucket.take(10 ** 9)
+    bucket.scale(0.5)
+    assert bucket.wait_time(10 ** 9, bucket.updated) == 0.0
+
+
+def test_reservation_is_settled_against_real_usage():
+    limiter = ModelRateLimiter('model', rpm=600, tpm=60000)
+    full = limiter.tokens.tokens
+    limiter.start_call('run', prompt_tokens=100)
+    reserve = 100 + int(limiter.completion_tokens_ewma)
+    assert limiter.acquire()
+    assert limiter.tokens.tokens == pytest.approx(full - reserve, abs=1)
+
+    limiter.end_call('run', {'total_tokens': 150, 'completion_tokens': 50})
+    # Over-reserved tokens are refunded; only the 150 used stay taken
+    assert limiter.tokens.tokens == pytest.approx(full - 150, abs=1)
+    assert limiter.get_stats()['calls'] == 1
+
+
+@pytest.mark.parametrize('rpm, tpm', [(600, None), (None, 60000)])
+def test_single_limit_recovers_after_a_call(rpm, tpm):
+    limiter = ModelRateLimiter('model', rpm=rpm, tpm=tpm)
+    for usage in ({'total_tokens': 150}, {'total_tokens': 150, 'completion_tokens': 50}):
+        limiter.start_call('run', prompt_tokens=100)
+        assert limiter.acquire()
+        limiter.end_call('run', usage)
+    stats = limiter.get_stats()
+    assert stats['calls'] == 2
+    assert (stats['rpm'], stats['tpm']) == (rpm and float(rpm), tpm)
+
+
+def test_calls_that_never_acquired_are_not_settled():
+    limiter = ModelRateLimiter('model', rpm=600, tpm=60000)
+    full = limiter.tokens.tokens
+    limiter.start_call('cached', prompt_tokens=100)
+    limiter.end_call('cached', {'total_tokens': 5000})
+    assert limiter.tokens.tokens == pytest.approx(full, abs=1)
+
+
+def test_rate_limit_error_backs_off_and_pauses():
+    limiter = ModelRateLimiter('model', rpm=600, tpm=60000)
+    limiter.start_call('run', prompt_tokens=10)
+    limiter.acquire()
+    limiter.fail_call('run', RateLimitError('429 Too Many Requests'))
+    stats = limiter.get_stats()
+    assert stats['rate_limited'] == 1
+    assert stats['rpm'] == 600 * RATE_LIMIT_BACKOFF
+    assert not limiter.acquire(blocking=False)
+
+
+def test_registry_only_throttles_configured_models():
+    class Model:
+        rate_limiter = None
+        callbacks = None
+
+    registry = RateLimiterRegistry()
+    model = registry.attach(Model(), 'gpt-4o')
+    assert model.rate_limiter is None
+
+    registry.configure('gpt-4o', tpm=800000)
+    registry.attach(model, 'gpt-4o')
+    registry.attach(model, 'gpt-4o')
+    assert model.rate_limiter.get_stats()['tpm_limit'] == 800000
+    assert model.rate_limiter.get_stats()['rpm_limit'] is None
+    assert len(model.callbacks) == 1
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit('gpt-4o=500,30000') == ('gpt-4o', 500.0, 30000.0)
+    assert parse_rate_limit('gpt-4o=,30000') == ('gpt-4o', None, 30000.0)
+    with pytest.raises(ValueError):
+        parse_rate_limit('gpt-4o')
@@ -0,0 +1,23 @@
+from utils.summarize import split_sentences, summarize
+from utils.tokens import estimate_tokens
+
+
+def test_summary_fits_its_budget_without_repeats():
+    text = "The same point again. " * 20 + "A different closing thought here."
+    summary = summarize(text, 12)
+    assert estimate_tokens(summary) <= 12
+    assert summary.count("The same point again.") <= 1
+
+
+def test_short_text_is_kept_whole():
+    assert summarize("Short enough.", 50) == "Short enough."
+    assert summarize("Anything", 0) == ""
+
+
+def test_sentences_keep_their_original_order():
+    text = ("Compounding expertise drives returns. Weather was mild. "
+            "Expertise compounds when returns drive more expertise. Lunch was late.")
+    summary = summarize(text, 20)
+    kept = split_sentences(summary)
+    assert kept == [s for s in split_sentences(text) if s in kept]
+    assert "Expertise compounds" in summary
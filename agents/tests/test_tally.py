@@ -0,0 +1,105 @@
+import pytest
+
+from utils.tally import VoteTally, parse_ballot
+
+CANDIDATES = ['Alpha', 'Beta', 'Gamma']
+
+
+def test_json_ballot_keeps_known_candidates_in_order():
+    ballot = parse_ballot('Alpha', '{"ranking": ["Beta", "Nobody", "gamma", "Beta"], "reasoning": "r"}',
+                          CANDIDATES)
+    assert ballot.ranking == ['Beta', 'Gamma']
+    assert ballot.reasoning == 'r'
+    assert ballot.format == 'json'
+
+
+def test_fenced_json_ballot_with_weights_is_normalised():
+    text = 'My vote:\n```json\n{"weights": {"Gamma": 3, "Beta": 1, "Alpha": 0}}\n```'
+    ballot = parse_ballot('Alpha', text, CANDIDATES)
+    assert ballot.weights == {'Gamma': 0.75, 'Beta': 0.25}
+    assert ballot.ranking == ['Gamma', 'Beta']
+
+
+def test_text_ballot_falls_back_to_vote_for():
+    ballot = parse_ballot('Alpha', 'Alpha made good points, but I vote for Gamma.', CANDIDATES)
+    assert ballot.choice == 'Gamma'
+    assert ballot.format == 'text'
+
+
+def test_text_ballot_without_vote_for_skips_the_voter():
+    ballot = parse_ballot('Alpha', 'Alpha agrees most with Beta.', CANDIDATES)
+    assert ballot.choice == 'Beta'
+
+
+def test_unparsed_ballot_counts_as_cast_for_nobody():
+    tally = VoteTally(CANDIDATES, total_voters=3)
+    assert tally.add_vote_content('Alpha', 'No opinion.') is None
+    assert tally.votes_cast == 1
+    assert tally.result()['unparsed_voters'] == ['Alpha']
+
+
+def test_instant_runoff_eliminates_weakest_and_transfers():
+    tally = VoteTally(CANDIDATES, total_voters=5, method='instant_runoff')
+    tally.add_vote_content('v1', '{"ranking": ["Alpha", "Beta"]}')
+    tally.add_vote_content('v2', '{"ranking": ["Alpha", "Gamma"]}')
+    tally.add_vote_content('v3', '{"ranking": ["Beta", "Alpha"]}')
+    tally.add_vote_content('v4', '{"ranking": ["Beta", "Alpha"]}')
+    tally.add_vote_content('v5', '{"ranking": ["Gamma", "Beta"]}')
+    # Gamma has fewest first choices and goes first; its ballot moves to Beta
+    assert tally.vote_counts == {'Alpha': 2, 'Beta': 3}
+    assert tally.leader == 'Beta'
+
+
+def test_instant_runoff_tie_for_last_drops_the_later_candidate():
+    tally = VoteTally(CANDIDATES, total_voters=3, method='instant_runoff')
+    tally.add_vote_content('v1', '{"ranking": ["Alpha"]}')
+    tally.add_vote_content('v2', '{"ranking": ["Beta", "Alpha"]}')
+    tally.add_vote_content('v3', '{"ranking": ["Gamma", "Alpha"]}')
+    # A three-way tie: Gamma is listed last, so it goes first and its ballot moves to Alpha
+    assert tally.vote_counts == {'Alpha': 2, 'Beta': 1}
+
+
+def test_instant_runoff_is_not_decided_before_every_vote():
+    tally = VoteTally(CANDIDATES, total_voters=3, method='instant_runoff')
+    tally.add_vote_content('v1', '{"ranking": ["Alpha"]}')
+    tally.add_vote_content('v2', '{"ranking": ["Alpha"]}')
+    assert not tally.is_decided()
+
+
+def test_consensus_guaranteed_with_voter_weights():
+    tally = VoteTally(CANDIDATES, total_voters=4, voter_weights={'chair': 3})
+    tally.add_vote_content('chair', '{"ranking": ["Beta"]}')
+    # 3 of a total weight of 6 is below the 67% threshold
+    assert not tally.is_decided()
+    tally.add_vote_content('v1', '{"ranking": ["Beta"]}')
+    # 4 of 6 is still just below it
+    assert not tally.consensus_guaranteed()
+    tally.add_vote_content('v2', '{"ranking": ["Beta"]}')
+    assert tally.consensus_guaranteed()
+    assert tally.votes_remaining == 1
+
+
+def test_consensus_impossible_once_remaining_weight_cannot_reach_threshold():
+    tally = VoteTally(CANDIDATES, total_voters=4, voter_weights={'chair': 3})
+    tally.add_vote_content('chair', '{"ranking": ["Alpha"]}')
+    tally.add_vote_content('v1', '{"ranking": ["Beta"]}')
+    # Beta could reach at most 1 + 2 = 3 of 6; Alpha at most 3 + 2 = 5 of 6
+    assert not tally.consensus_impossible()
+    tally.add_vote_content('v2', '{"ranking": ["Gamma"]}')
+    # Alpha can reach at most 3 + 1 = 4 of 6, below 67%
+    assert tally.consensus_impossible()
+    assert tally.is_decided()
+
+
+def test_recount_from_voting_results_matches():
+    tally = VoteTally(CANDIDATES, total_voters=3, method='weighted')
+    tally.add_vote_content('v1', '{"ranking": ["Alpha"], "weights": {"Alpha": 1, "Beta": 1}}')
+    tally.add_vote_content('v2', 'I vote for Beta')
+    votes = {'v1': '{"ranking": ["Alpha"], "weights": {"Alpha": 1, "Beta": 1}}', 'v2': 'I vote for Beta'}
+    recount = VoteTally.from_voting_results({'votes': votes, 'consensus': tally.result()})
+    assert recount.result()['vote_distribution'] == {'Alpha': 0.5, 'Beta': 1.5}
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        VoteTally(CANDIDATES, total_voters=3, method='plurality')
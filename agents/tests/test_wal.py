@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from utils.wal import OWNER_SUFFIX, REJECTED_SUFFIX, WriteAheadLog, make_idempotency_key, wal_in_use
+
+
+@pytest.fixture
+def wal_path(tmp_path):
+    return str(tmp_path / "db_wal.jsonl")
+
+
+def write(wal, key):
+    wal.append(key, 'debate', 'request', method='PATCH', path='/debates/debate', payload={'n': key})
+
+
+def test_replay_sees_unacked_writes_in_order(wal_path):
+    wal = WriteAheadLog(wal_path)
+    for key in ('a', 'b', 'c'):
+        write(wal, key)
+    wal.ack(['b', 'unknown'])
+    wal.close()
+
+    reopened = WriteAheadLog(wal_path)
+    assert [entry['key'] for entry in reopened.pending()] == ['a', 'c']
+    reopened.close()
+
+
+def test_rewritten_key_is_pending_again(wal_path):
+    wal = WriteAheadLog(wal_path)
+    write(wal, 'a')
+    write(wal, 'b')
+    wal.ack(['a'])
+    write(wal, 'a')
+    wal.close()
+    # Pending in the order of their latest write
+    assert [entry['key'] for entry in WriteAheadLog(wal_path).pending()] == ['b', 'a']
+
+
+def test_torn_last_line_is_ignored(wal_path):
+    wal = WriteAheadLog(wal_path)
+    write(wal, 'a')
+    wal.close()
+    with open(wal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "write", "key": "b", "deb')
+    assert [entry['key'] for entry in WriteAheadLog(wal_path).pending()] == ['a']
+
+
+def test_rejected_writes_move_to_the_dead_letter_file(wal_path):
+    wal = WriteAheadLog(wal_path)
+    write(wal, 'a')
+    write(wal, 'b')
+    wal.reject(['a', 'unknown'], '400 Client Error')
+    wal.close()
+
+    with open(wal_path + REJECTED_SUFFIX, encoding='utf-8') as f:
+        rejected = [json.loads(line) for line in f]
+    assert [(entry['key'], entry['reason']) for entry in rejected] == [('a', '400 Client Error')]
+    assert [entry['key'] for entry in WriteAheadLog(wal_path).pending()] == ['b']
+
+
+def test_compaction_keeps_only_pending_entries(wal_path):
+    wal = WriteAheadLog(wal_path)
+    for key in ('a', 'b', 'c'):
+        write(wal, key)
+    wal.ack(['a', 'c'])
+    wal.compact()
+    with open(wal_path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [(line['op'], line['key']) for line in lines] == [('write', 'b')]
+
+    # The log stays usable after compaction
+    wal.ack(['b'])
+    wal.close()
+    assert WriteAheadLog(wal_path).pending() == []
+
+
+def test_close_drops_the_owner_marker_and_append_reopens(wal_path):
+    wal = WriteAheadLog(wal_path)
+    assert wal_in_use(wal_path)
+    wal.close()
+    assert not os.path.exists(wal_path + OWNER_SUFFIX)
+    assert not wal_in_use(wal_path)
+
+    write(wal, 'a')
+    assert wal_in_use(wal_path)
+    wal.close()
+    assert [entry['key'] for entry in WriteAheadLog(wal_path).pending()] == ['a']
+
+
+def test_log_of_a_dead_or_idle_owner_is_not_in_use(wal_path):
+    wal = WriteAheadLog(wal_path)
+    write(wal, 'a')
+    with open(wal_path + OWNER_SUFFIX, encoding='utf-8') as f:
+        owner = json.load(f)
+    assert wal_in_use(wal_path)
+    assert not wal_in_use(wal_path, stale_after=-1)
+
+    with open(wal_path + OWNER_SUFFIX, 'w', encoding='utf-8') as f:
+        json.dump({**owner, 'pid': 2 ** 22 + 12345}, f)
+    assert not wal_in_use(wal_path)
+
+
+def test_idempotency_key_depends_on_content():
+    first = make_idempotency_key('debate', 'debate', 'A->B', 1, 'question one')
+    assert first == make_idempotency_key('debate', 'debate', 'A->B', 1, 'question one')
+    assert first != make_idempotency_key('debate', 'debate', 'A->B', 1, 'question two')
+
+
+def test_unknown_fsync_mode_is_rejected(wal_path):
+    with pytest.raises(ValueError):
+        WriteAheadLog(wal_path, fsync='sometimes')
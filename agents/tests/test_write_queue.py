@@ -0,0 +1,53 @@
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from utils.write_queue import WriteBehindQueue, is_rejected, is_retryable
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.mark.parametrize('error, retryable, rejected', [
+    (requests.ConnectionError("refused"), True, False),
+    (requests.Timeout("slow"), True, False),
+    (http_error(503), True, False),
+    (http_error(429), True, False),
+    (http_error(400), False, True),
+    (http_error(404), False, True),
+    (ValueError("bug"), False, False),
+])
+def test_error_classification(error, retryable, rejected):
+    assert is_retryable(error) is retryable
+    assert is_rejected(error) is rejected
+
+
+def deliver(error):
+    queue = WriteBehindQueue(workers=1, max_attempts=3, retry_backoff=0)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise error
+
+    queue.submit('debate', 'save', send)
+    assert queue.flush(timeout=5)
+    queue.close()
+    return len(attempts), queue.get_stats()
+
+
+def test_transient_failures_are_retried():
+    attempts, stats = deliver(http_error(502))
+    assert attempts == 3
+    assert stats['retries'] == 2
+    assert stats['failed'] == 1
+
+
+def test_client_errors_are_not_retried():
+    attempts, stats = deliver(http_error(422))
+    assert attempts == 1
+    assert stats['retries'] == 0
+    assert stats['failed'] == 1
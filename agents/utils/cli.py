@@ -141,7 +141,7 @@ class DebateCLI:
         
         print(f"\n📈 Debate Statistics:")
         print(f"  • Iterations completed: {results['iterations_completed']}")
-        print(f"  • Total debate rounds: {len(results['debate_history'])}")
+        print(f"  • Total debate rounds: {results['summary']['total_debate_rounds']}")
         print(f"  • Strategies developed: {len(results['final_strategies'])}")
         
         # Ask if user wants to see detailed results
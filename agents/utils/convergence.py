@@ -0,0 +1,101 @@
+"""
+Convergence detection for the debate iteration loop
+Compares each agent's revised strategy with its previous position using TF-IDF cosine
+similarity (local, no model or network needed). Once positions stop changing, another
+round of adjustment, debate and voting would cost a full iteration of LLM calls without
+moving anyone, so the orchestrator stops iterating.
+"""
+import math
+import re
+from collections import Counter
+from itertools import combinations
+from typing import Any, Dict, List, Optional
+
+# Mean similarity to the previous positions at which the board counts as converged
+DEFAULT_CONVERGENCE_THRESHOLD = 0.9
+# Consecutive converged iterations needed before stopping
+DEFAULT_CONVERGENCE_PATIENCE = 1
+
+_WORD = re.compile(r"[a-z][a-z0-9'-]+")
+_STOP_WORDS = frozenset("""
+    the and for that this with are was were have has had not but from they their them its
+    our your you his her she him who what which when where why how all any can will would
+    should could into than then there these those also such each other more most some very
+    just only over about been being both own same out off too does did doing because while
+""".split())
+
+
+def _terms(text: str) -> Counter:
+    return Counter(word for word in _WORD.findall(str(text).lower()) if word not in _STOP_WORDS)
+
+
+def tfidf_vectors(texts: List[str]) -> List[Dict[str, float]]:
+    """Unit-length TF-IDF vectors (sublinear tf, smoothed idf over the given texts)"""
+    counts = [_terms(text) for text in texts]
+    document_frequency = Counter(term for terms in counts for term in terms)
+    idf = {term: math.log((1 + len(texts)) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    vectors = []
+    for terms in counts:
+        vector = {term: (1 + math.log(n)) * idf[term] for term, n in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({term: w / norm for term, w in vector.items()} if norm else {})
+    return vectors
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+class ConvergenceDetector:
+    """Tracks how much the board's positions change from one iteration to the next"""
+
+    def __init__(self, threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+                 patience: int = DEFAULT_CONVERGENCE_PATIENCE):
+        self.threshold = threshold
+        self.patience = max(1, patience)
+        self.trajectory: List[Dict[str, Any]] = []
+
+    def observe(self, iteration: int, previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, Any]:
+        """Record one iteration: each agent's similarity to its previous position.
+
+        The point also has the board's agreement, the mean similarity between the
+        agents' current positions, to show whether they are moving towards each other.
+        """
+        agents = [name for name in current if name in previous]
+        vectors = tfidf_vectors([previous[name] for name in agents] + [current[name] for name in agents])
+        before, after = vectors[:len(agents)], vectors[len(agents):]
+
+        per_agent = {name: round(cosine(before[i], after[i]), 4) for i, name in enumerate(agents)}
+        pairs = [cosine(a, b) for a, b in combinations(after, 2)]
+        least_stable = min(per_agent, key=per_agent.get) if per_agent else None
+        point = {
+            'iteration': iteration,
+            'similarity': round(sum(per_agent.values()) / len(per_agent), 4) if per_agent else 0.0,
+            'min_similarity': per_agent[least_stable] if least_stable else 0.0,
+            'least_stable': least_stable,
+            'agreement': round(sum(pairs) / len(pairs), 4) if pairs else 0.0,
+            'per_agent': per_agent,
+        }
+        self.trajectory.append(point)
+        point['converged'] = self.converged
+        return point
+
+    @property
+    def converged(self) -> bool:
+        recent = self.trajectory[-self.patience:]
+        return len(recent) == self.patience and all(p['similarity'] >= self.threshold for p in recent)
+
+    def restore(self, trajectory: Optional[List[Dict[str, Any]]]):
+        """Continue from a checkpointed trajectory"""
+        self.trajectory = [dict(point) for point in trajectory or []]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'threshold': self.threshold,
+            'patience': self.patience,
+            'converged': self.converged,
+            'trajectory': [dict(point) for point in self.trajectory],
+        }
@@ -4,17 +4,176 @@ Handles saving debate data from Python to MongoDB
 """
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import os
+import threading
 from pathlib import Path
 
+from utils.tally import VoteTally
+from utils.write_queue import WriteBehindQueue, get_write_queue, is_rejected
+from utils.wal import (WriteAheadLog, WAL_FILENAME, REJECTED_SUFFIX, DEFAULT_FSYNC,
+                       make_idempotency_key, wal_in_use)
+
+REQUEST_TIMEOUT = 30  # seconds, for every call to the debate API
+HTTP_POOL_SIZE = 4
+# Agent outputs and debate exchanges are sent in batches of up to BATCH_SIZE records,
+# or whatever has accumulated BATCH_WINDOW seconds after the first one
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_BATCH_WINDOW = 2.0
+
+# Batch endpoint and payload key for each batched record type
+BATCH_ENDPOINTS = {
+    'agent-outputs': ('/agent-outputs/batch', 'outputs'),
+    'debate-exchanges': ('/debate-exchanges/batch', 'exchanges'),
+}
+
+
+def create_http_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """requests.Session with a keep-alive connection pool for the debate API"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class MongoDBAdapter:
-    """Adapter to save debate data to MongoDB via REST API"""
+    """Adapter to save debate data to MongoDB via REST API.
     
-    def __init__(self, api_base_url: str = None):
+    Session creation and reads are synchronous. Writes go through a write-behind queue
+    (delivered in order per debate on a background thread), so call flush() before
+    relying on them having reached the API. Agent outputs and debate exchanges are
+    grouped into batch requests by size or time window (with batch_size=1 every record is
+    its own batch of one). With a write-ahead log attached, every write is logged before
+    it is queued and acked once delivered, and failed writes are replayed from the log on
+    flush(), which closes the log once every write is acknowledged.
+    """
+    
+    def __init__(self, api_base_url: str = None, session: requests.Session = None,
+                 write_queue: WriteBehindQueue = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_window: float = DEFAULT_BATCH_WINDOW):
         self.api_base_url = api_base_url or os.getenv('DEBATE_API_URL', 'http://localhost:3001/api')
         self.current_debate_id = None
+        self.session = session or create_http_session()
+        self.write_queue = write_queue or get_write_queue()
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # (debate_id, record type) -> records waiting to be sent as one batch
+        self._batches: Dict[tuple, List[Dict]] = {}
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_lock = threading.Lock()
+        # Serializes flushes so batches reach the write queue in the order they were taken
+        self._flush_lock = threading.Lock()
+        self.batch_stats = {'batches': 0, 'batched_records': 0}
+        self.wal: Optional[WriteAheadLog] = None
+    
+    def _request(self, method: str, url: str, payload: Dict = None) -> requests.Response:
+        response = self.session.request(method, url, json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response
+    
+    def _send_logged(self, method: str, url: str, payload: Dict, wal: Optional[WriteAheadLog],
+                     keys: List[str]):
+        """Send logged writes and ack them; writes the API rejected go to the dead-letter file"""
+        try:
+            self._request(method, url, payload)
+        except requests.HTTPError as e:
+            if wal is not None and is_rejected(e):
+                wal.reject(keys, str(e))
+                print(f"⚠️ API rejected {len(keys)} write(s), moved to {wal.path + REJECTED_SUFFIX}")
+            raise
+        if wal is not None:
+            wal.ack(keys)
+    
+    def _log_and_dispatch(self, kind: str, key: str, **data: Any) -> bool:
+        """Record a write in the write-ahead log, then queue it for delivery"""
+        entry = {'key': key, 'debate_id': self.current_debate_id, 'kind': kind, **data}
+        if self.wal is not None:
+            self.wal.append(**entry)
+        self._dispatch(entry, self.wal)
+        return True
+    
+    def _dispatch(self, entry: Dict[str, Any], wal: Optional[WriteAheadLog]):
+        """Queue one logged write (fresh or replayed); it is acked in wal once delivered"""
+        if entry['kind'] in BATCH_ENDPOINTS:
+            self._add_to_batch(entry['debate_id'], entry['kind'], entry['record'], wal)
+            return
+        
+        url = f"{self.api_base_url}{entry['path']}"
+        
+        def send():
+            self._send_logged(entry['method'], url, entry['payload'], wal, [entry['key']])
+            if entry.get('message'):
+                print(entry['message'])
+        
+        # Earlier batched records go first so the debate's writes stay in order
+        self.flush_batches()
+        self.write_queue.submit(entry['debate_id'], entry['description'], send)
+    
+    def _add_to_batch(self, debate_id: str, record_type: str, record: Dict,
+                      wal: Optional[WriteAheadLog]):
+        """Buffer a record; the batch is queued when full or when the window closes"""
+        key = (debate_id, record_type, wal)
+        with self._batch_lock:
+            batch = self._batches.setdefault(key, [])
+            batch.append(record)
+            full = len(batch) >= self.batch_size
+            if not full and self._batch_timer is None:
+                self._batch_timer = threading.Timer(self.batch_window, self.flush_batches)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+        if full:
+            self.flush_batches()
+    
+    def flush_batches(self):
+        """Queue every buffered batch now.
+        
+        The buffer is swapped out under the batch lock and submitted after releasing it,
+        so a write queue applying backpressure never blocks threads adding records.
+        """
+        with self._flush_lock:
+            with self._batch_lock:
+                batches, self._batches = self._batches, {}
+                if self._batch_timer is not None:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+            for (debate_id, record_type, wal), records in batches.items():
+                path, items_key = BATCH_ENDPOINTS[record_type]
+                url = f"{self.api_base_url}{path}"
+                payload = {'debateId': debate_id, items_key: records}
+                
+                def send(url=url, payload=payload, record_type=record_type, records=records, wal=wal):
+                    self._send_logged('POST', url, payload, wal,
+                                      [record['idempotencyKey'] for record in records])
+                    print(f"✅ Saved {len(records)} {record_type.replace('-', ' ')} to MongoDB")
+                
+                self.write_queue.submit(debate_id, f"save {len(records)} {record_type} to MongoDB", send)
+                self.batch_stats['batches'] += 1
+                self.batch_stats['batched_records'] += len(records)
+    
+    def replay(self, wal: WriteAheadLog) -> int:
+        """Queue the unacknowledged writes of a write-ahead log again"""
+        entries = wal.pending()
+        for entry in entries:
+            self._dispatch(entry, wal)
+        self.flush_batches()
+        return len(entries)
+    
+    def close_wal_when_delivered(self, wal: WriteAheadLog):
+        """Close a log once the writes queued so far are delivered (compacting it if all
+        were acknowledged); an ack arriving later opens it again"""
+        def finish():
+            if not wal.pending_count():
+                wal.compact()
+            wal.close()
+        
+        debate_ids = {entry['debate_id'] for entry in wal.pending()}
+        if not debate_ids:
+            finish()
+        for debate_id in debate_ids:
+            self.write_queue.submit(debate_id, "close write-ahead log", finish)
     
     def create_debate_session(self, topic: str, session_folder: str) -> Optional[str]:
         """Create a new debate session in MongoDB"""
@@ -32,8 +191,7 @@ class MongoDBAdapter:
                 ]
             }
             
-            response = requests.post(f"{self.api_base_url}/debates", json=payload)
-            response.raise_for_status()
+            response = self._request('POST', f"{self.api_base_url}/debates", payload)
             
             data = response.json()
             self.current_debate_id = data.get('_id')
@@ -46,114 +204,110 @@ class MongoDBAdapter:
     
     def save_agent_output(self, agent_name: str, phase: str, round_number: int, 
                          content: str, metadata: Dict = None) -> bool:
-        """Save agent output to MongoDB"""
+        """Queue an agent output for saving to MongoDB"""
         if not self.current_debate_id:
             print("❌ No active debate session")
             return False
-            
-        try:
-            payload = {
-                'debateId': self.current_debate_id,
-                'agentName': agent_name,
-                'phase': phase,
-                'roundNumber': round_number,
-                'content': content,
-                'metadata': metadata or {}
-            }
-            
-            print(f"🔄 Sending agent output to {self.api_base_url}/agent-outputs")
-            print(f"   Agent: {agent_name}, Phase: {phase}, Round: {round_number}")
-            print(f"   Content length: {len(content)} characters")
-            print(f"   Content preview: {content[:100]}..." if len(content) > 100 else f"   Content: {content}")
-            
-            response = requests.post(f"{self.api_base_url}/agent-outputs", json=payload, timeout=30)
-            
-            print(f"   Response status: {response.status_code}")
-            if response.status_code != 200:
-                print(f"   Response content: {response.text}")
-            
-            response.raise_for_status()
-            
-            print(f"✅ Saved {agent_name} {phase} output to MongoDB")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to save agent output to MongoDB: {e}")
-            print(f"   Response: {getattr(response, 'text', 'No response')}")
-            import traceback
-            traceback.print_exc()
-            return False
+        
+        record = {
+            'agentName': agent_name,
+            'phase': phase,
+            'roundNumber': round_number,
+            'content': content,
+            'metadata': metadata or {},
+            'idempotencyKey': make_idempotency_key(
+                self.current_debate_id, phase, agent_name, round_number, content
+            )
+        }
+        return self._log_and_dispatch('agent-outputs', record['idempotencyKey'], record=record)
     
     def save_debate_exchange(self, round_number: int, questioner: str, responder: str,
                            question: str, response: str) -> bool:
-        """Save debate exchange to MongoDB"""
+        """Queue a debate exchange for saving to MongoDB"""
         if not self.current_debate_id:
             print("❌ No active debate session")
             return False
-            
-        try:
-            payload = {
-                'debateId': self.current_debate_id,
-                'roundNumber': round_number,
-                'questioner': questioner,
-                'responder': responder,
-                'question': question,
-                'response': response
-            }
-            
-            response = requests.post(f"{self.api_base_url}/debate-exchanges", json=payload)
-            response.raise_for_status()
-            
-            print(f"✅ Saved debate exchange {questioner}→{responder} to MongoDB")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to save debate exchange to MongoDB: {e}")
-            return False
+        
+        record = {
+            'roundNumber': round_number,
+            'questioner': questioner,
+            'responder': responder,
+            'question': question,
+            'response': response,
+            'idempotencyKey': make_idempotency_key(
+                self.current_debate_id, 'debate', f"{questioner}->{responder}", round_number,
+                question + response
+            )
+        }
+        return self._log_and_dispatch('debate-exchanges', record['idempotencyKey'], record=record)
     
     def complete_debate_session(self, voting_results: List[Dict], consensus_analysis: Dict,
                                final_report: Dict = None) -> bool:
-        """Complete the debate session with final results"""
+        """Queue the final results that complete the debate session"""
         if not self.current_debate_id:
             print("❌ No active debate session")
             return False
-            
-        try:
-            payload = {
-                'votingResults': voting_results,
-                'consensusAnalysis': consensus_analysis,
-                'finalReport': final_report
-            }
-            
-            response = requests.put(f"{self.api_base_url}/debates/{self.current_debate_id}/complete", 
-                                  json=payload)
-            response.raise_for_status()
-            
-            print(f"✅ Completed debate session in MongoDB: {self.current_debate_id}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to complete debate session in MongoDB: {e}")
-            return False
+        
+        payload = {
+            'votingResults': voting_results,
+            'consensusAnalysis': consensus_analysis,
+            'finalReport': final_report
+        }
+        return self._log_and_dispatch(
+            'request',
+            make_idempotency_key(self.current_debate_id, 'complete', 'session', 0,
+                                 json.dumps(payload, sort_keys=True, default=str)),
+            method='PUT', path=f"/debates/{self.current_debate_id}/complete", payload=payload,
+            description="complete debate session in MongoDB",
+            message=f"✅ Completed debate session in MongoDB: {self.current_debate_id}"
+        )
     
     def update_phase(self, phase: str, iteration: int = None) -> bool:
-        """Update the current phase of the debate"""
+        """Queue an update of the current phase of the debate"""
         if not self.current_debate_id:
             return False
-            
-        try:
-            payload = {'currentPhase': phase}
-            if iteration is not None:
-                payload['currentIteration'] = iteration
-                
-            response = requests.patch(f"{self.api_base_url}/debates/{self.current_debate_id}", 
-                                    json=payload)
-            response.raise_for_status()
+        
+        payload = {'currentPhase': phase}
+        if iteration is not None:
+            payload['currentIteration'] = iteration
+        return self._log_and_dispatch(
+            'request',
+            make_idempotency_key(self.current_debate_id, phase, 'session', iteration or 0,
+                                 json.dumps(payload, sort_keys=True)),
+            method='PATCH', path=f"/debates/{self.current_debate_id}", payload=payload,
+            description="update debate phase"
+        )
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued write for the current debate is delivered.
+        
+        Writes that failed all their attempts are replayed once from the write-ahead log;
+        returns False if any are still unacknowledged (they stay in the log).
+        """
+        self.flush_batches()
+        if not self.current_debate_id:
             return True
-            
-        except Exception as e:
-            print(f"❌ Failed to update debate phase: {e}")
-            return False
+        drained = self.write_queue.flush(self.current_debate_id, timeout=timeout)
+        if self.wal is None or not drained:
+            return drained
+        
+        if self.wal.pending_count():
+            print(f"🔁 Replaying {self.wal.pending_count()} unacknowledged database writes")
+            self.replay(self.wal)
+            drained = self.write_queue.flush(self.current_debate_id, timeout=timeout)
+        if drained and not self.wal.pending_count():
+            self.wal.compact()
+            self.wal.close()
+            return True
+        self.close_wal_when_delivered(self.wal)
+        return False
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Write-behind queue depth, delivery counters, latency and batching"""
+        stats = {**self.write_queue.get_stats(), **self.batch_stats}
+        if self.wal is not None:
+            stats['wal_pending'] = self.wal.pending_count()
+        return stats
     
     def get_debate_session(self, debate_id: str = None) -> Optional[Dict]:
         """Get debate session data"""
@@ -162,9 +316,7 @@ class MongoDBAdapter:
             return None
             
         try:
-            response = requests.get(f"{self.api_base_url}/debates/{debate_id}")
-            response.raise_for_status()
-            return response.json()
+            return self._request('GET', f"{self.api_base_url}/debates/{debate_id}").json()
             
         except Exception as e:
             print(f"❌ Failed to get debate session: {e}")
@@ -173,10 +325,11 @@ class MongoDBAdapter:
 class DatabaseIntegratedHistoryManager:
     """Extended history manager that also saves to MongoDB"""
     
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, wal_fsync: str = DEFAULT_FSYNC, api_base_url: str = None):
         from utils.history_manager import ChatHistoryManager
         self.file_manager = ChatHistoryManager(base_path)
-        self.db_adapter = MongoDBAdapter()
+        self.db_adapter = MongoDBAdapter(api_base_url)
+        self.wal_fsync = wal_fsync
         self.current_session_folder = None
     
     @property
@@ -202,8 +355,62 @@ class DatabaseIntegratedHistoryManager:
             print(f"♻️ Using existing debate ID: {self.db_adapter.current_debate_id}")
             # TODO: Optionally update the session folder in the existing session
         
+        # Log every database write of this session before it is sent
+        self._release_wal()
+        self.db_adapter.wal = WriteAheadLog(os.path.join(session_folder, WAL_FILENAME), fsync=self.wal_fsync)
+        
         return session_folder
     
+    def open_session_folder(self, session_folder: str) -> str:
+        """Continue an existing session folder, including its write-ahead log"""
+        self.file_manager.open_session_folder(session_folder)
+        # Unacknowledged writes of the interrupted run are replayed on the next flush
+        self._release_wal()
+        self.db_adapter.wal = WriteAheadLog(os.path.join(session_folder, WAL_FILENAME), fsync=self.wal_fsync)
+        return session_folder
+    
+    def _release_wal(self):
+        """Close the previous session's log once its queued writes are delivered"""
+        if self.db_adapter.wal is not None:
+            self.db_adapter.close_wal_when_delivered(self.db_adapter.wal)
+            self.db_adapter.wal = None
+    
+    def save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Save the resume checkpoint (file system only), tagged with the debate ID"""
+        self.file_manager.save_checkpoint({**checkpoint, 'debate_id': self.db_adapter.current_debate_id})
+    
+    def find_session_folder(self, target: str) -> str:
+        """Resolve a session folder or debate ID to a folder with a checkpoint"""
+        return self.file_manager.find_session_folder(target)
+    
+    def load_checkpoint(self, session_folder: str) -> Optional[Dict[str, Any]]:
+        return self.file_manager.load_checkpoint(session_folder)
+    
+    def replay_unacked_writes(self, skip_folder: str = None) -> int:
+        """Queue the writes earlier sessions logged but never got acknowledged.
+        
+        Only logs no live process has open are replayed (see wal_in_use): a debate still
+        running elsewhere delivers and compacts its own log. skip_folder is a session about
+        to be resumed; its log is replayed by its own flush. Each replayed log is closed
+        once its writes are delivered.
+        """
+        base_path = self.file_manager.base_path
+        if not os.path.isdir(base_path):
+            return 0
+        
+        replayed = 0
+        for folder in sorted(os.listdir(base_path)):
+            wal_path = os.path.join(base_path, folder, WAL_FILENAME)
+            if not os.path.exists(wal_path) or wal_in_use(wal_path) or (
+                    skip_folder and os.path.samefile(os.path.join(base_path, folder), skip_folder)):
+                continue
+            wal = WriteAheadLog(wal_path, fsync=self.wal_fsync)
+            if wal.pending_count():
+                print(f"🔁 Replaying {wal.pending_count()} unacknowledged database writes from {folder}")
+                replayed += self.db_adapter.replay(wal)
+            self.db_adapter.close_wal_when_delivered(wal)
+        return replayed
+    
     def save_agent_round(self, agent_name: str, round_num: int, content: str, phase: str = "debate"):
         """Save to both file system and MongoDB"""
         # Save to file system
@@ -226,32 +433,37 @@ class DatabaseIntegratedHistoryManager:
         # Save to file system
         self.file_manager.save_final_report(report_data)
         
-        # Prepare data for MongoDB
+        # Prepare data for MongoDB, counting the votes exactly as the voting phase did
         voting_results = []
-        if 'voting_results' in report_data and 'votes' in report_data['voting_results']:
-            for voter, vote_content in report_data['voting_results']['votes'].items():
-                # Parse voted agent from content (simplified - you might want to improve this)
-                voted_for = "Unknown"
-                for agent in ['First Principles Physicist', 'Systems Futurist', 'Pattern Synthesizer',
-                             'Civilizational Architect', 'Entrepreneurial Visionary', 'Meta-Learning Strategist']:
-                    if agent.lower() in str(vote_content).lower() and agent != voter:
-                        voted_for = agent
-                        break
-                
-                voting_results.append({
-                    'voterAgent': voter,
-                    'votedForAgent': voted_for,
-                    'reasoning': str(vote_content),
-                    'timestamp': datetime.utcnow().isoformat()
-                })
-        
         consensus_analysis = {
             'consensusReached': report_data.get('consensus_reached', False),
-            'winningAgent': report_data.get('voting_results', {}).get('consensus', {}).get('winning_agent'),
+            'winningAgent': None,
             'voteDistribution': {},
             'consensusPercentage': 0,
-            'totalVotes': len(voting_results)
+            'totalVotes': 0
         }
+        if report_data.get('voting_results', {}).get('votes'):
+            tally = VoteTally.from_voting_results(report_data['voting_results'],
+                                                  list(report_data.get('final_strategies') or {}))
+            timestamp = datetime.utcnow().isoformat()
+            for voter, ballot in tally.ballots.items():
+                vote = {
+                    'voterAgent': voter,
+                    'reasoning': ballot.reasoning,
+                    'ranking': ballot.ranking,
+                    'timestamp': timestamp
+                }
+                if ballot.choice:
+                    vote['votedForAgent'] = ballot.choice
+                voting_results.append(vote)
+            
+            result = tally.result()
+            consensus_analysis.update({
+                'winningAgent': result['winning_agent'],
+                'voteDistribution': result['vote_distribution'],
+                'consensusPercentage': round(result['winning_share'] * 100, 1),
+                'totalVotes': result['total_votes']
+            })
         
         final_report = None
         if 'final_strategies' in report_data:
@@ -263,10 +475,22 @@ class DatabaseIntegratedHistoryManager:
         # Save to MongoDB
         self.db_adapter.complete_debate_session(voting_results, consensus_analysis, final_report)
     
+    def save_metrics(self, metrics: Dict[str, Any]):
+        """Save performance metrics (file system only)"""
+        self.file_manager.save_metrics(metrics)
+    
     def update_phase(self, phase: str, iteration: int = None):
         """Update the current phase"""
         self.db_adapter.update_phase(phase, iteration)
     
+    def flush(self, timeout: float = None) -> bool:
+        """Wait for queued database writes of this debate; False if the timeout expired"""
+        return self.db_adapter.flush(timeout)
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Database write queue metrics"""
+        return self.db_adapter.get_write_stats()
+    
     def save_phase_summary(self, phase_name: str, phase_data: Dict[str, Any]):
         """Save phase summary to both file system and database"""
         # Save to file system
@@ -278,6 +502,8 @@ class DatabaseIntegratedHistoryManager:
     def get_session_summary(self) -> Dict[str, Any]:
         """Get summary from both file system and database"""
         file_summary = self.file_manager.get_session_summary()
+        # Read our own writes: let queued ones reach the API first
+        self.db_adapter.flush(timeout=REQUEST_TIMEOUT)
         db_summary = self.db_adapter.get_debate_session()
         
         return {
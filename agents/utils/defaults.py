@@ -0,0 +1,16 @@
+"""
+Run settings shared by the orchestrator and the command line
+Kept free of crewai/langchain imports so main.py can build its argument parser
+(and answer --help) before any of the heavy modules load.
+"""
+
+# Default upper bound on concurrent crew.kickoff() calls within a phase (one per board member)
+DEFAULT_MAX_PARALLEL_AGENTS = 6
+# Default upper bound on concurrent calls made by the same agent (debate phase exchanges)
+DEFAULT_MAX_CALLS_PER_AGENT = 2
+
+# LLM response cache modes (see utils.llm_cache):
+# on:      read and write the cache
+# refresh: never read, but overwrite entries with fresh responses
+# bypass:  neither read nor write (fresh output, cache left untouched)
+CACHE_MODES = ('on', 'refresh', 'bypass')
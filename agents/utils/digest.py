@@ -0,0 +1,78 @@
+"""
+Compact digests of debate exchanges for the voting prompt
+Each exchange becomes a few lines: the question, the responder's key claims, and any
+concessions or changed minds. The digest is built once per iteration from the debate
+results and every voter's prompt shares it, instead of each prompt inlining every full
+question and response.
+"""
+import re
+from typing import Any, Dict, List
+
+from utils.summarize import split_sentences, summarize
+from utils.tokens import estimate_tokens
+
+# Token budget of each part of one exchange's digest
+QUESTION_TOKENS = 30
+CLAIM_TOKENS = 50
+CONCESSION_TOKENS = 30
+CHANGED_MIND_TOKENS = 30
+
+_CONCESSION = re.compile(
+    r"\b(i (?:agree|concede|acknowledge|accept|grant)|you(?:'re| are) right|fair point|good point"
+    r"|valid (?:point|concern|critique|challenge)|admittedly|to be fair|that is true)\b",
+    re.IGNORECASE)
+_CHANGED_MIND = re.compile(
+    r"\b(changed? my (?:mind|view|position)|i (?:would )?now (?:think|believe|see|recognize)"
+    r"|(?:revise|update|adjust|refine|modify) my|reconsider|in light of (?:this|your)"
+    r"|(?:persuaded|convinced) me|i was wrong)\b",
+    re.IGNORECASE)
+
+
+def digest_exchange(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Question, claims, concessions and changed minds of one debate exchange"""
+    sentences = split_sentences(entry.get('response', ''))
+    concessions = [s for s in sentences if _CONCESSION.search(s)]
+    changed = [s for s in sentences if _CHANGED_MIND.search(s)]
+    claims = [s for s in sentences if s not in concessions and s not in changed]
+    return {
+        'round': entry['round'],
+        'questioner': entry['questioner'],
+        'responder': entry['responder'],
+        'question': summarize(" ".join(split_sentences(entry.get('question', ''))), QUESTION_TOKENS),
+        'claims': summarize(" ".join(claims), CLAIM_TOKENS),
+        'concessions': summarize(" ".join(concessions), CONCESSION_TOKENS),
+        'changed_mind': summarize(" ".join(changed), CHANGED_MIND_TOKENS),
+    }
+
+
+def format_digests(digests: List[Dict[str, Any]]) -> str:
+    """The digests as prompt text; empty parts are left out"""
+    blocks = []
+    for d in digests:
+        lines = [f"Round {d['round']}: {d['questioner']} → {d['responder']}",
+                 f"  Q: {d['question']}",
+                 f"  Claims: {d['claims']}"]
+        if d['concessions']:
+            lines.append(f"  Concedes: {d['concessions']}")
+        if d['changed_mind']:
+            lines.append(f"  Changed mind: {d['changed_mind']}")
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks) if blocks else "(no debate exchanges)"
+
+
+def build_debate_digest(debate_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Digest text of an iteration's exchanges, with its size against the raw results.
+
+    raw_tokens is the size of the results as the voting prompt used to inline them
+    (their Python repr).
+    """
+    text = format_digests([digest_exchange(entry) for entry in debate_results])
+    raw_tokens = estimate_tokens(str(debate_results))
+    digest_tokens = estimate_tokens(text)
+    return {
+        'text': text,
+        'exchanges': len(debate_results),
+        'raw_tokens': raw_tokens,
+        'digest_tokens': digest_tokens,
+        'ratio': round(digest_tokens / raw_tokens, 4) if raw_tokens else 0.0,
+    }
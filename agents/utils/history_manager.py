@@ -4,6 +4,13 @@ import datetime
 from typing import Dict, Any, List
 from pathlib import Path
 
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+
+def debate_exchange_filename(round_num: int, questioner: str, responder: str) -> str:
+    """File name of one debate exchange in the session folder"""
+    return f"debate_round_{round_num:02d}_{questioner.lower().replace(' ', '_')}_to_{responder.lower().replace(' ', '_')}.txt"
+
 class ChatHistoryManager:
     """Manages chat history storage for debate sessions"""
     
@@ -104,14 +111,65 @@ class ChatHistoryManager:
                         f.write(f"{agent_name}'s vote:\n")
                         f.write(str(vote) + "\n\n")
     
+    def save_metrics(self, metrics: Dict[str, Any]):
+        """Save performance metrics for the session as metrics.json"""
+        if not self.current_session_folder:
+            raise ValueError("No session folder created. Call create_session_folder first.")
+        
+        with open(os.path.join(self.current_session_folder, "metrics.json"), 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, indent=2, ensure_ascii=False)
+    
+    def open_session_folder(self, session_folder: str) -> str:
+        """Continue writing to an existing session folder (resuming a debate)"""
+        if not os.path.isdir(session_folder):
+            raise ValueError(f"Session folder does not exist: {session_folder}")
+        self.current_session_folder = session_folder
+        return session_folder
+    
+    def save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Atomically replace the session's resume checkpoint"""
+        if not self.current_session_folder:
+            raise ValueError("No session folder created. Call create_session_folder first.")
+        
+        path = os.path.join(self.current_session_folder, CHECKPOINT_FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def find_session_folder(self, target: str) -> str:
+        """Resolve a session folder path, folder name or debate ID to a folder with a checkpoint"""
+        for folder in (target, os.path.join(self.base_path, target)):
+            if os.path.exists(os.path.join(folder, CHECKPOINT_FILENAME)):
+                return folder
+        
+        # Otherwise look for the most recent checkpoint of that debate ID
+        if os.path.isdir(self.base_path):
+            for name in sorted(os.listdir(self.base_path), reverse=True):
+                checkpoint = self.load_checkpoint(os.path.join(self.base_path, name))
+                if checkpoint and checkpoint.get('debate_id') == target:
+                    return os.path.join(self.base_path, name)
+        raise ValueError(f"No checkpoint found for '{target}'")
+    
+    @staticmethod
+    def load_checkpoint(session_folder: str) -> Dict[str, Any]:
+        """Read a session's checkpoint, or None if it has none"""
+        path = os.path.join(session_folder, CHECKPOINT_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     def save_debate_exchange(self, round_num: int, questioner: str, responder: str, 
                            question: str, response: str):
         """Save a specific debate exchange"""
         if not self.current_session_folder:
             raise ValueError("No session folder created. Call create_session_folder first.")
         
-        filename = f"debate_round_{round_num:02d}_{questioner.lower().replace(' ', '_')}_to_{responder.lower().replace(' ', '_')}.txt"
-        filepath = os.path.join(self.current_session_folder, filename)
+        filepath = os.path.join(self.current_session_folder,
+                                debate_exchange_filename(round_num, questioner, responder))
         
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"DEBATE EXCHANGE - Round {round_num}\n")
@@ -0,0 +1,150 @@
+"""
+Process-wide registry of shared LLM clients
+One ChatOpenAI per model and sampling parameters, all sending through a single pooled
+HTTP client, so every orchestrator (and every debate in a worker) reuses the same
+keep-alive connections instead of opening a pool and TLS session per client.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from langchain_openai import ChatOpenAI
+
+if TYPE_CHECKING:
+    from utils.llm_cache import LLMResponseCache
+
+# Six agents can call concurrently per debate; leave room for a few debates per process
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_MAX_KEEPALIVE = 16
+KEEPALIVE_EXPIRY = 60.0  # seconds an idle connection stays in the pool
+WARM_UP_TIMEOUT = 5.0
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+class LLMClientRegistry:
+    """Hands out one shared, thread-safe LLM client per (model, sampling parameters, cache).
+
+    All clients share one httpx.Client; httpcore trace events count the connections and
+    TLS handshakes it really opens, so get_stats() shows how often a call reused one.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive: int = DEFAULT_MAX_KEEPALIVE):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, Any] = {}
+        self._http_client = None
+        self._stats = {
+            'clients_created': 0,
+            'client_reuses': 0,
+            'http_requests': 0,
+            'connections_opened': 0,
+            'tls_handshakes': 0,
+        }
+
+    @property
+    def http_client(self):
+        """The pooled transport every client sends through (created on first use)"""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_keepalive,
+                                        keepalive_expiry=KEEPALIVE_EXPIRY),
+                    event_hooks={'request': [self._on_request]},
+                )
+            return self._http_client
+
+    def _on_request(self, request):
+        request.extensions['trace'] = self._trace
+        self._count('http_requests')
+
+    def _trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == 'connection.connect_tcp.complete':
+            self._count('connections_opened')
+        elif event_name == 'connection.start_tls.complete':
+            self._count('tls_handshakes')
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, model: str, temperature: float, cache: Optional['LLMResponseCache'] = None,
+            **params: Any):
+        """Shared client for these settings; created once, then reused by every caller"""
+        key = (model, temperature, cache, tuple(sorted(params.items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._stats['client_reuses'] += 1
+                return client
+
+        http_client = self.http_client
+        kwargs = dict(params)
+        if cache is not None:
+            kwargs['cache'] = cache
+        client = ChatOpenAI(model=model, temperature=temperature, http_client=http_client, **kwargs)
+
+        with self._lock:
+            # Another thread may have created it meanwhile; keep the first one
+            if key in self._clients:
+                self._stats['client_reuses'] += 1
+                return self._clients[key]
+            self._clients[key] = client
+            self._stats['clients_created'] += 1
+            return client
+
+    def warm_up(self, connections: int = 1, base_url: str = None) -> int:
+        """Open keep-alive connections to the API ahead of the first call.
+
+        Returns how many connections answered; failures are ignored, the first real
+        call then simply pays for its own handshake.
+        """
+        url = base_url or os.environ.get("OPENAI_BASE_URL", DEFAULT_OPENAI_BASE_URL)
+        http_client = self.http_client
+
+        def touch(_):
+            try:
+                # Any response (even 401/404) leaves an established connection in the pool
+                http_client.head(url, timeout=WARM_UP_TIMEOUT)
+                return True
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(touch, range(connections)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, clients=len(self._clients))
+        requests = stats['http_requests']
+        stats['connection_reuse_rate'] = (
+            round(1 - stats['connections_opened'] / requests, 3) if requests else 0.0
+        )
+        return stats
+
+    def close(self):
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            self._clients.clear()
+        if http_client is not None:
+            http_client.close()
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """The registry shared by every DebateAgents in this process"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry()
+            atexit.register(_registry.close)
+        return _registry
@@ -0,0 +1,153 @@
+"""
+Performance metrics for a debate session
+Records every LLM crew call, phase wall time and persistence time, and summarises them
+for metrics.json in the session folder
+"""
+import contextlib
+import datetime
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def extract_token_usage(result: Any) -> Dict[str, int]:
+    """Prompt/completion token counts from a CrewOutput, where crewai reports them"""
+    usage = getattr(result, 'token_usage', None)
+    if usage is None:
+        return {}
+    if not isinstance(usage, dict):
+        usage = getattr(usage, '__dict__', {})
+    return {key: int(usage[key]) for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')
+            if isinstance(usage.get(key), (int, float))}
+
+
+class MetricsRecorder:
+    """Collects per-call, per-phase and persistence metrics for one debate"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.datetime.now().isoformat()
+        self.calls: List[Dict[str, Any]] = []
+        self.phases: List[Dict[str, Any]] = []
+        self.persistence: List[Dict[str, Any]] = []
+        self.skipped: List[Dict[str, Any]] = []
+
+    def record_call(self, phase: str, iteration: int, agent: Optional[str], latency: float,
+                    queue_wait: float = 0.0, usage: Dict[str, int] = None):
+        """Record one crew.kickoff() call"""
+        entry = {
+            'phase': phase,
+            'iteration': iteration,
+            'agent': agent,
+            'latency': round(latency, 4),
+            'queue_wait': round(queue_wait, 4),
+            **(usage or {})
+        }
+        with self._lock:
+            self.calls.append(entry)
+
+    def record_skipped(self, phase: str, iteration: int, agents: List[str]):
+        """Record calls a phase stopped before they started (no LLM call was made)"""
+        with self._lock:
+            self.skipped.extend({'phase': phase, 'iteration': iteration, 'agent': agent}
+                                for agent in agents)
+
+    @contextlib.contextmanager
+    def timed_phase(self, phase: str, iteration: int):
+        """Record the wall time of a whole phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append({
+                    'phase': phase,
+                    'iteration': iteration,
+                    'seconds': round(time.perf_counter() - start, 4)
+                })
+
+    @contextlib.contextmanager
+    def timed_persistence(self, phase: str, operation: str):
+        """Record time spent in a history/database write"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.persistence.append({
+                    'phase': phase,
+                    'operation': operation,
+                    'seconds': round(time.perf_counter() - start, 4)
+                })
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates by phase, by agent and by persistence operation"""
+        with self._lock:
+            calls = list(self.calls)
+            phases = list(self.phases)
+            persistence = list(self.persistence)
+            skipped = list(self.skipped)
+
+        def aggregate(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+            latencies = [c['latency'] for c in group]
+            return {
+                'calls': len(group),
+                'latency_total': round(sum(latencies), 3),
+                'latency_p50': round(percentile(latencies, 50), 3),
+                'latency_p95': round(percentile(latencies, 95), 3),
+                'latency_max': round(max(latencies, default=0.0), 3),
+                'queue_wait_total': round(sum(c['queue_wait'] for c in group), 3),
+                'prompt_tokens': sum(c.get('prompt_tokens', 0) for c in group),
+                'completion_tokens': sum(c.get('completion_tokens', 0) for c in group),
+            }
+
+        by_phase: Dict[str, List[Dict]] = {}
+        by_agent: Dict[str, List[Dict]] = {}
+        for call in calls:
+            by_phase.setdefault(call['phase'], []).append(call)
+            by_agent.setdefault(call['agent'] or 'unknown', []).append(call)
+
+        phase_wall: Dict[str, float] = {}
+        for entry in phases:
+            phase_wall[entry['phase']] = round(phase_wall.get(entry['phase'], 0.0) + entry['seconds'], 3)
+
+        persistence_summary: Dict[str, Dict[str, Any]] = {}
+        for entry in persistence:
+            op = persistence_summary.setdefault(entry['operation'], {'count': 0, 'seconds': 0.0})
+            op['count'] += 1
+            op['seconds'] = round(op['seconds'] + entry['seconds'], 4)
+
+        skipped_by_phase: Dict[str, int] = {}
+        for entry in skipped:
+            skipped_by_phase[entry['phase']] = skipped_by_phase.get(entry['phase'], 0) + 1
+
+        return {
+            'llm': aggregate(calls),
+            'skipped_calls': skipped_by_phase,
+            'phase_wall_time': phase_wall,
+            'by_phase': {phase: aggregate(group) for phase, group in by_phase.items()},
+            'by_agent': {agent: aggregate(group) for agent, group in by_agent.items()},
+            'persistence': persistence_summary,
+            'persistence_seconds': round(sum(e['seconds'] for e in persistence), 4),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full metrics document (raw records plus summary)"""
+        summary = self.summary()
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'summary': summary,
+                'calls': list(self.calls),
+                'phases': list(self.phases),
+                'persistence': list(self.persistence),
+                'skipped': list(self.skipped),
+            }
@@ -0,0 +1,139 @@
+"""
+Pairing topologies for the debate phase
+Decides which agent questions which in an iteration. The original all-pairs round robin
+needs N·(N-1) exchanges (two LLM calls each), so it grows quadratically with the board;
+the other topologies need about N·k:
+
+    round_robin       every agent questions every other agent
+    ring              each agent questions the next one; the offset moves every iteration
+    random_regular    each agent questions k others and is questioned by k (seeded per iteration)
+    swiss             agents with similar standings (last iteration's votes) question each other,
+                      avoiding last iteration's pairings
+    most_disagreeing  the pairs whose strategies are least similar (TF-IDF), at most k per agent
+
+An optional per-iteration exchange budget trims any plan, taking exchanges from every
+questioner in turn so no agent is left out first. Rounds are numbered 1..n in plan order.
+"""
+import random
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.convergence import cosine, tfidf_vectors
+
+TOPOLOGIES = ('round_robin', 'ring', 'random_regular', 'swiss', 'most_disagreeing')
+DEFAULT_TOPOLOGY = 'round_robin'
+# Exchanges each agent starts (and, where the topology allows, answers) in the k-based topologies
+DEFAULT_PAIRING_DEGREE = 2
+
+Pair = Tuple[str, str]  # (questioner, responder)
+
+
+def _round_robin(agents: List[str]) -> List[Pair]:
+    return [(q, r) for q in agents for r in agents if q != r]
+
+
+def _ring(agents: List[str], iteration: int) -> List[Pair]:
+    n = len(agents)
+    offset = 1 + (max(iteration, 1) - 1) % (n - 1)
+    return [(agents[i], agents[(i + offset) % n]) for i in range(n)]
+
+
+def _random_regular(agents: List[str], degree: int, rng: random.Random) -> List[Pair]:
+    # A circulant graph over a random order: everyone asks the next `degree` agents in it
+    order = list(agents)
+    rng.shuffle(order)
+    n = len(order)
+    return [(order[i], order[(i + step) % n]) for i in range(n) for step in range(1, degree + 1)]
+
+
+def _swiss(agents: List[str], standings: Dict[str, float], previous: Sequence[Pair]) -> List[Pair]:
+    met = {frozenset(pair) for pair in previous}
+    ranked = sorted(agents, key=lambda a: (-standings.get(a, 0), agents.index(a)))
+    unpaired = list(ranked)
+    pairs = []
+    while len(unpaired) > 1:
+        first = unpaired.pop(0)
+        # The closest-ranked opponent not met last iteration, else simply the closest
+        opponent = next((a for a in unpaired if frozenset((first, a)) not in met), unpaired[0])
+        unpaired.remove(opponent)
+        pairs += [(first, opponent), (opponent, first)]
+    if unpaired:
+        # Odd board: the last agent debates the lowest-ranked pair's higher-ranked agent
+        last, partner = unpaired[0], pairs[-2][0] if pairs else None
+        if partner:
+            pairs += [(last, partner), (partner, last)]
+    return pairs
+
+
+def _most_disagreeing(agents: List[str], strategies: Dict[str, str], degree: int) -> List[Pair]:
+    vectors = dict(zip(agents, tfidf_vectors([strategies.get(a, '') for a in agents])))
+    distances = sorted(combinations(agents, 2),
+                       key=lambda pair: (cosine(vectors[pair[0]], vectors[pair[1]]),
+                                         agents.index(pair[0]), agents.index(pair[1])))
+    asked = {a: 0 for a in agents}
+    answered = {a: 0 for a in agents}
+    pairs = []
+    for a, b in distances:
+        for questioner, responder in ((a, b), (b, a)):
+            if asked[questioner] < degree and answered[responder] < degree:
+                pairs.append((questioner, responder))
+                asked[questioner] += 1
+                answered[responder] += 1
+    return pairs
+
+
+def apply_budget(pairs: List[Pair], budget: Optional[int]) -> List[Pair]:
+    """Keep at most `budget` exchanges, one per questioner in turn, in their plan order"""
+    if budget is None or len(pairs) <= budget:
+        return list(pairs)
+    by_questioner: Dict[str, List[int]] = {}
+    for index, (questioner, _) in enumerate(pairs):
+        by_questioner.setdefault(questioner, []).append(index)
+    keep = set()
+    depth = 0
+    while len(keep) < budget:
+        for indices in by_questioner.values():
+            if depth < len(indices) and len(keep) < budget:
+                keep.add(indices[depth])
+        depth += 1
+    return [pair for index, pair in enumerate(pairs) if index in keep]
+
+
+class PairingPlanner:
+    """Plans each iteration's debate exchanges for one topology"""
+
+    def __init__(self, topology: str = DEFAULT_TOPOLOGY, exchange_budget: Optional[int] = None,
+                 degree: int = DEFAULT_PAIRING_DEGREE, seed: str = ""):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown pairing topology '{topology}', expected one of {TOPOLOGIES}")
+        if exchange_budget is not None and exchange_budget < 1:
+            raise ValueError("The exchange budget must be at least 1")
+        self.topology = topology
+        self.exchange_budget = exchange_budget
+        self.degree = max(1, degree)
+        self.seed = seed
+
+    def plan(self, agents: List[str], iteration: int, strategies: Dict[str, str] = None,
+             standings: Dict[str, float] = None, previous: Sequence[Pair] = ()) -> List[Tuple[int, str, str]]:
+        """(round, questioner, responder) for every exchange of this iteration"""
+        agents = list(agents)
+        degree = min(self.degree, len(agents) - 1)
+        if len(agents) < 2:
+            pairs = []
+        elif self.topology == 'ring':
+            pairs = _ring(agents, iteration)
+        elif self.topology == 'random_regular':
+            # Seeded by debate and iteration, so a resumed debate plans the same exchanges
+            pairs = _random_regular(agents, degree, random.Random(f"{self.seed}:{iteration}"))
+        elif self.topology == 'swiss':
+            pairs = _swiss(agents, standings or {}, previous)
+        elif self.topology == 'most_disagreeing':
+            pairs = _most_disagreeing(agents, strategies or {}, degree)
+        else:
+            pairs = _round_robin(agents)
+        pairs = apply_budget(pairs, self.exchange_budget)
+        return [(round_num, questioner, responder)
+                for round_num, (questioner, responder) in enumerate(pairs, start=1)]
+
+    def describe(self) -> Dict[str, object]:
+        return {'topology': self.topology, 'exchange_budget': self.exchange_budget, 'degree': self.degree}
@@ -0,0 +1,84 @@
+"""
+Machine-readable progress events
+The orchestrator reports what it is doing as versioned events: phase start/end, per-agent
+task start/end with timings, finished debate exchanges and cast votes. They go to a
+channel of their own (a file descriptor the server reads as JSON lines, or a worker job's
+event log), so print() output stays human-readable logging and nobody has to parse it.
+
+Each event is one JSON object, e.g.
+    {"v": 1, "seq": 7, "ts": 1735732800.12, "debate_id": "...", "type": "agent_end",
+     "phase": "research", "iteration": 0, "agent": "Systems Futurist", "seconds": 41.2, "ok": true}
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Bump when an event type changes incompatibly; consumers ignore versions they don't know
+PROGRESS_VERSION = 1
+
+EVENT_TYPES = (
+    'debate_start',       # topic, max_iterations, resumed
+    'debate_end',         # status, consensus_reached, iterations_completed, session_folder
+    'phase_start',        # phase, iteration
+    'phase_end',          # phase, iteration, seconds, ok
+    'agent_start',        # phase, iteration, agent, queue_wait
+    'agent_end',          # phase, iteration, agent, seconds, ok, prompt/completion_tokens
+    'exchange_complete',  # iteration, round, questioner, responder
+    'vote_cast',          # iteration, voter, choice, votes_cast, total_voters, leader
+    'convergence',        # iteration, similarity, min_similarity, least_stable, agreement, converged
+)
+
+ProgressSink = Callable[[Dict[str, Any]], None]
+
+
+class ProgressEmitter:
+    """Sends one debate's progress events to a sink; without a sink emit() does nothing"""
+
+    def __init__(self, sink: Optional[ProgressSink] = None,
+                 debate_id: Optional[str] = None):
+        self._sink = sink
+        self.debate_id = debate_id
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def emit(self, event_type: str, **fields: Any):
+        if self._sink is None:
+            return
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown progress event type '{event_type}'")
+        with self._lock:
+            self._seq += 1
+            event = {'v': PROGRESS_VERSION, 'seq': self._seq, 'ts': round(time.time(), 3),
+                     'debate_id': self.debate_id, 'type': event_type, **fields}
+            try:
+                self._sink(event)
+            except Exception as e:
+                # Progress is advisory; losing the channel must not stop the debate
+                print(f"⚠️ Progress events disabled: {e}")
+                self._sink = None
+
+    @contextlib.contextmanager
+    def phase(self, phase: str, iteration: int):
+        """Emit phase_start and, with the phase's wall time, phase_end around the block"""
+        self.emit('phase_start', phase=phase, iteration=iteration)
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.emit('phase_end', phase=phase, iteration=iteration,
+                      seconds=round(time.perf_counter() - start, 3), ok=ok)
+
+
+def fd_sink(fd: int) -> ProgressSink:
+    """Sink writing each event as one JSON line to an inherited file descriptor"""
+    stream = os.fdopen(fd, 'w', buffering=1, encoding='utf-8')
+
+    def write(event: Dict[str, Any]):
+        stream.write(json.dumps(event, default=str, ensure_ascii=False) + "\n")
+
+    return write
@@ -0,0 +1,379 @@
+"""
+Adaptive rate limiting for LLM provider calls
+Opt-in: models get a limiter only once their limits are configured (--rate-limit), since
+account tiers differ by orders of magnitude and a guessed default throttles most of them
+for nothing. Every agent LLM of a configured model then draws from one limiter per model,
+made of a requests-per-minute and a tokens-per-minute token bucket (either may be left
+unbounded). Rates back off
+multiplicatively on 429s and when latency climbs well above its baseline, and recover
+additively while calls succeed. Waiting calls are served by priority lane, so
+interactive debates go ahead of batch runs.
+
+The limiter plugs into LangChain twice: as the model's rate_limiter (acquire() runs
+before every request that is not served from the LLM cache) and as a callback handler
+that reports prompt size, token usage, latency and errors of each call.
+"""
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from utils.tokens import estimate_tokens
+
+# Highest priority first
+LANES = ('interactive', 'batch')
+DEFAULT_LANE = 'interactive'
+
+
+BURST_SECONDS = 10.0          # bucket capacity, in seconds of the current rate
+MIN_RATE_SHARE = 0.05         # never adapt below this share of the configured limit
+RATE_LIMIT_BACKOFF = 0.5      # rate multiplier after a 429
+RATE_LIMIT_COOLDOWN = 5.0     # seconds nothing is sent after a 429 without Retry-After
+LATENCY_BACKOFF = 0.9         # rate multiplier while latency is congested
+LATENCY_CONGESTION = 2.0      # seconds per completion token above this multiple of the baseline
+LATENCY_CONGESTION_MIN = 0.01 # ...and at least this much (seconds per token) above it
+LATENCY_EWMA_ALPHA = 0.2
+RECOVERY_SHARE = 0.02         # share of the configured limit regained per successful call
+DEFAULT_COMPLETION_TOKENS = 1000  # expected completion size until some are observed
+
+_lane: contextvars.ContextVar = contextvars.ContextVar('rate_limit_lane', default=DEFAULT_LANE)
+# The call announced by the callback handler, read by acquire() (same thread or task)
+_current_call: contextvars.ContextVar = contextvars.ContextVar('rate_limit_call', default=None)
+
+
+@contextlib.contextmanager
+def priority_lane(lane: str):
+    """Run the calls made within (including in tasks and threads started there) in a lane"""
+    if lane not in LANES:
+        raise ValueError(f"Unknown priority lane '{lane}', expected one of {LANES}")
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return (getattr(error, 'status_code', None) == 429
+            or type(error).__name__ == 'RateLimitError'
+            or '429' in str(error))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class _TokenBucket:
+    """Refills at rate per minute up to BURST_SECONDS worth; may go negative on large takes.
+
+    A bucket without a limit never makes anyone wait.
+    """
+
+    def __init__(self, limit_per_minute: Optional[float]):
+        self.limit = float(limit_per_minute) if limit_per_minute else None
+        self.rate = self.limit
+        self.tokens = self.capacity if self.limit else 0.0
+        self.updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate / 60.0 * BURST_SECONDS)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount (at most a full bucket) is available"""
+        if self.limit is None:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return 0.0 if missing <= 0 else missing * 60.0 / self.rate
+
+    def take(self, amount: float):
+        if self.limit is not None:
+            self.tokens -= amount
+
+    def scale(self, factor: float):
+        if self.limit is not None:
+            self.set_rate(self.rate * factor)
+
+    def recover(self, share: float):
+        """Regain share of the configured limit"""
+        if self.limit is not None:
+            self.set_rate(self.rate + self.limit * share)
+
+    def set_rate(self, rate: float):
+        if self.limit is None:
+            return
+        self._refill(time.monotonic())
+        self.rate = min(self.limit, max(self.limit * MIN_RATE_SHARE, rate))
+        self.tokens = min(self.tokens, self.capacity)
+
+
+def _streamed_usage(response) -> Dict[str, int]:
+    """Token usage of a streamed response, which reports it on the message (stream_usage=True)"""
+    for generations in getattr(response, 'generations', None) or []:
+        for generation in generations:
+            metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+            if metadata:
+                return {
+                    'prompt_tokens': metadata.get('input_tokens', 0),
+                    'completion_tokens': metadata.get('output_tokens', 0),
+                    'total_tokens': metadata.get('total_tokens', 0),
+                }
+    return {}
+
+
+class _RateLimitCallback(BaseCallbackHandler):
+    """Feeds each call's prompt size, usage, latency and errors back to its limiter"""
+
+    # Called in the caller's thread/task, so the announced call is visible to acquire()
+    run_inline = True
+
+    def __init__(self, limiter: 'ModelRateLimiter'):
+        self.limiter = limiter
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        prompt_tokens = sum(estimate_tokens(str(message.content)) for batch in messages for message in batch)
+        self.limiter.start_call(run_id, prompt_tokens)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        usage = (getattr(response, 'llm_output', None) or {}).get('token_usage') or _streamed_usage(response)
+        self.limiter.end_call(run_id, usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self.limiter.fail_call(run_id, error)
+
+
+class ModelRateLimiter(BaseRateLimiter):
+    """Adaptive RPM + TPM limiter for one model, with priority lanes"""
+
+    def __init__(self, model: str, rpm: Optional[float], tpm: Optional[float]):
+        self.model = model
+        self.requests = _TokenBucket(rpm)
+        self.tokens = _TokenBucket(tpm)
+        self.callback = _RateLimitCallback(self)
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+        self.paused_until = 0.0
+        self.latency_ewma = None
+        self.latency_baseline = None
+        self.completion_tokens_ewma = float(DEFAULT_COMPLETION_TOKENS)
+        self.stats = {
+            'calls': 0,
+            'waited_calls': 0,
+            'wait_seconds': 0.0,
+            'rate_limited': 0,
+            'latency_backoffs': 0,
+            'by_lane': {lane: 0 for lane in LANES},
+        }
+
+    # ----- called by the callback handler -----
+
+    def start_call(self, run_id, prompt_tokens: int):
+        call = {'reserve': prompt_tokens + int(self.completion_tokens_ewma), 'acquired': False}
+        with self._cond:
+            self._calls[run_id] = call
+        _current_call.set(call)
+
+    def end_call(self, run_id, usage: Dict[str, int]):
+        with self._cond:
+            call = self._calls.pop(run_id, None)
+            # Calls answered from the LLM cache never acquired and say nothing about the provider
+            if call is None or not call['acquired']:
+                return
+            latency = time.monotonic() - call['started']
+            if usage.get('total_tokens'):
+                # Settle the reservation against the real usage (refunds if we over-reserved)
+                self.tokens.take(usage['total_tokens'] - call['reserve'])
+            completion_tokens = usage.get('completion_tokens')
+            if completion_tokens:
+                self.completion_tokens_ewma += LATENCY_EWMA_ALPHA * (
+                    completion_tokens - self.completion_tokens_ewma)
+                # Long answers are slow anyway; per-token latency is what congestion changes
+                self._observe_latency(latency / completion_tokens)
+            else:
+                self._recover()
+            self._cond.notify_all()
+
+    def fail_call(self, run_id, error: BaseException):
+        with self._cond:
+            call = self._calls.pop(run_id, None)
+            if call is None or not is_rate_limit_error(error):
+                return
+            self.stats['rate_limited'] += 1
+            self.requests.scale(RATE_LIMIT_BACKOFF)
+            self.tokens.scale(RATE_LIMIT_BACKOFF)
+            self.paused_until = max(self.paused_until,
+                                    time.monotonic() + (_retry_after(error) or RATE_LIMIT_COOLDOWN))
+            self._cond.notify_all()
+
+    def _observe_latency(self, seconds_per_token: float):
+        """Additive increase while latency is normal, gentle decrease when it is congested"""
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds_per_token
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (seconds_per_token - self.latency_ewma)
+        self.latency_baseline = min(self.latency_baseline or self.latency_ewma, self.latency_ewma)
+
+        congested_above = max(LATENCY_CONGESTION * self.latency_baseline,
+                              self.latency_baseline + LATENCY_CONGESTION_MIN)
+        if self.latency_ewma > congested_above:
+            self.stats['latency_backoffs'] += 1
+            self.requests.scale(LATENCY_BACKOFF)
+            self.tokens.scale(LATENCY_BACKOFF)
+        else:
+            self._recover()
+
+    def _recover(self):
+        self.requests.recover(RECOVERY_SHARE)
+        self.tokens.recover(RECOVERY_SHARE)
+
+    # ----- BaseRateLimiter -----
+
+    def _ready_in(self, reserve: float) -> float:
+        now = time.monotonic()
+        return max(self.paused_until - now,
+                   self.requests.wait_time(1, now),
+                   self.tokens.wait_time(reserve, now))
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        call = _current_call.get()
+        reserve = call['reserve'] if call is not None and not call['acquired'] else int(self.completion_tokens_ewma)
+        lane = _lane.get()
+        ticket = (LANES.index(lane), next(self._sequence))
+        start = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    # Only the first waiter of the best lane may take from the buckets
+                    wait = self._ready_in(reserve) if self._waiters[0] == ticket else None
+                    if wait is not None and wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(reserve)
+                        break
+                    if not blocking:
+                        return False
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self.stats['calls'] += 1
+            self.stats['by_lane'][lane] += 1
+            self.stats['wait_seconds'] += waited
+            if waited > 0.001:
+                self.stats['waited_calls'] += 1
+
+        if call is not None:
+            call.update(acquired=True, started=time.monotonic())
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        # to_thread copies the context, so the lane and announced call carry over
+        return await asyncio.to_thread(self.acquire, blocking=blocking)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self.stats,
+                'wait_seconds': round(self.stats['wait_seconds'], 3),
+                'by_lane': dict(self.stats['by_lane']),
+                'rpm': round(self.requests.rate, 1) if self.requests.limit else None,
+                'rpm_limit': self.requests.limit,
+                'tpm': round(self.tokens.rate) if self.tokens.limit else None,
+                'tpm_limit': self.tokens.limit,
+                'seconds_per_token': round(self.latency_ewma, 5) if self.latency_ewma is not None else None,
+                'waiting': len(self._waiters),
+            }
+
+
+class RateLimiterRegistry:
+    """One ModelRateLimiter per configured model, shared by every LLM client of the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Dict[str, Optional[float]]] = {}
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def configure(self, model: str, rpm: float = None, tpm: float = None):
+        """Set a model's limits (before its limiter is first used); None leaves one unbounded"""
+        with self._lock:
+            limits = self._limits.setdefault(model, {'rpm': None, 'tpm': None})
+            if rpm:
+                limits['rpm'] = rpm
+            if tpm:
+                limits['tpm'] = tpm
+            self._limiters.pop(model, None)
+
+    def is_limited(self, model: str) -> bool:
+        with self._lock:
+            return model in self._limits
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limits = self._limits.get(model, {'rpm': None, 'tpm': None})
+                limiter = self._limiters[model] = ModelRateLimiter(model, limits['rpm'], limits['tpm'])
+            return limiter
+
+    def attach(self, llm, model: str):
+        """Throttle a LangChain chat model through the model's limiter (idempotent).
+
+        Models without configured limits are left alone.
+        """
+        if not self.is_limited(model):
+            return llm
+        limiter = self.for_model(model)
+        llm.rate_limiter = limiter
+        callbacks = list(llm.callbacks or [])
+        callbacks = [cb for cb in callbacks if not isinstance(cb, _RateLimitCallback)]
+        llm.callbacks = callbacks + [limiter.callback]
+        return llm
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {model: limiter.get_stats() for model, limiter in limiters.items()}
+
+
+def parse_rate_limit(text: str) -> tuple:
+    """Parse a MODEL=RPM,TPM command line value (either number may be left empty)"""
+    model, _, numbers = text.partition("=")
+    rpm, _, tpm = numbers.partition(",")
+    if not model or not (rpm or tpm):
+        raise ValueError(f"Expected MODEL=RPM,TPM, got '{text}'")
+    return model.strip(), float(rpm) if rpm else None, float(tpm) if tpm else None
+
+
+_registry: Optional[RateLimiterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiters() -> RateLimiterRegistry:
+    """The rate limiters shared by every debate in this process"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RateLimiterRegistry()
+        return _registry
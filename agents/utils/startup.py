@@ -0,0 +1,91 @@
+"""
+Startup-time measurement for main.py
+Profiles module import times in a fresh interpreter (python -X importtime), so modules
+already imported by the caller don't hide their cost, and times the fast CLI path.
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Sequence
+
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules main.py imports lazily, only on the paths that run a debate
+HEAVY_MODULES = ('crew.flow', 'utils.db_adapter', 'utils.llm_cache', 'utils.cli')
+
+
+def _run_python(args: Sequence[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    # utils.cli reads the key on import; profiling must not need a real one
+    env.setdefault("OPENAI_API_KEY", "startup-profile")
+    return subprocess.run([sys.executable, *args], cwd=AGENTS_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def profile_imports(modules: Sequence[str] = HEAVY_MODULES) -> List[Dict[str, Any]]:
+    """Import modules in a fresh interpreter; one entry per imported module.
+
+    Each entry has the module name, its nesting depth in the import tree and its own
+    and cumulative (including the modules it imported) time in seconds.
+    """
+    result = _run_python(['-X', 'importtime', '-c', f"import {', '.join(modules)}"])
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr.strip()}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        entries.append({
+            'module': stripped.strip(),
+            'depth': (len(name) - len(stripped) - 1) // 2,
+            'self_seconds': int(self_us) / 1e6,
+            'cumulative_seconds': int(cumulative_us) / 1e6,
+        })
+    return entries
+
+
+def print_import_profile(entries: List[Dict[str, Any]], modules: Sequence[str] = HEAVY_MODULES,
+                         top: int = 20):
+    """Print the requested modules' import times and the slowest imports overall"""
+    by_name = {entry['module']: entry for entry in entries}
+    total = sum(entry['cumulative_seconds'] for entry in entries if entry['depth'] == 0)
+
+    print("⏱️ Startup import profile (fresh interpreter)")
+    print("=" * 60)
+    for module in modules:
+        entry = by_name.get(module)
+        # Modules an earlier one already imported are timed where it imported them
+        seconds = entry['cumulative_seconds'] if entry else 0.0
+        print(f"  {module:<40} {seconds:8.3f}s")
+    print(f"  {'total':<40} {total:8.3f}s  ({len(entries)} modules)")
+    print("-" * 60)
+    print(f"Slowest {top} imports by own time:")
+    for entry in sorted(entries, key=lambda e: e['self_seconds'], reverse=True)[:top]:
+        print(f"  {entry['module']:<40} {entry['self_seconds']:8.3f}s "
+              f"(cumulative {entry['cumulative_seconds']:.3f}s)")
+
+
+def measure_startup(modules: Sequence[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """Wall time of `main.py --help` (the fast path) and of importing the heavy modules"""
+    start = time.perf_counter()
+    result = _run_python(['main.py', '--help'])
+    help_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"main.py --help failed:\n{result.stderr.strip()}")
+
+    result = _run_python([
+        '-c',
+        "import time; start = time.perf_counter(); "
+        f"import {', '.join(modules)}; print(time.perf_counter() - start)"
+    ])
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr.strip()}")
+
+    return {
+        'help_seconds': help_seconds,
+        'import_seconds': float(result.stdout.strip().splitlines()[-1]),
+    }
@@ -0,0 +1,49 @@
+"""
+Extractive summaries for prompt context
+Keeps the sentences closest to the text's TF-IDF centroid, in their original order,
+within a token budget. Local and deterministic (no LLM call), so a summary is computed
+once and stays the same for every prompt that reuses it.
+"""
+import re
+from typing import List
+
+from utils.convergence import cosine, tfidf_vectors
+from utils.tokens import estimate_tokens, truncate_to_tokens
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of text with whitespace normalised"""
+    return [s for s in _SENTENCE_END.split(" ".join(str(text).split())) if s]
+
+
+def summarize(text: str, max_tokens: int) -> str:
+    """The most representative sentences of text that fit in max_tokens"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return str(text)
+
+    sentences = split_sentences(text)
+    vectors = tfidf_vectors(sentences)
+    centroid = {}
+    for vector in vectors:
+        for term, weight in vector.items():
+            centroid[term] = centroid.get(term, 0.0) + weight
+    # Earlier sentences win ties: openings tend to state the point
+    ranked = sorted(range(len(sentences)), key=lambda i: (-cosine(vectors[i], centroid), i))
+
+    chosen = []
+    used = 0
+    for i in ranked:
+        if any(sentences[j] == sentences[i] for j in chosen):
+            continue
+        cost = estimate_tokens(sentences[i] + " ")
+        if used + cost <= max_tokens:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        # Not even one sentence fits; fall back to the opening words
+        return truncate_to_tokens(text, max_tokens)
+    return " ".join(sentences[i] for i in sorted(chosen))
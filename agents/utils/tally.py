@@ -0,0 +1,292 @@
+"""
+Vote tallying for the debate voting phase
+Parses ballots and keeps a running tally so the outcome can be known before every vote
+is in. The orchestrator and the database adapter both count votes here, so the consensus
+they report is always the same.
+
+Votes are JSON ballots (see DebateTasks.voting_task), for example
+    {"ranking": ["Systems Futurist", "Pattern Synthesizer"], "reasoning": "..."}
+"ranking" lists candidates from most to least preferred; optional "weights" spread the
+ballot over several candidates, e.g. {"Systems Futurist": 3, "Pattern Synthesizer": 1}
+(normalised to sum to 1). Votes that are not valid JSON fall back to the candidate named
+after "I vote for".
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# Share of the board that must back one agent for consensus
+CONSENSUS_THRESHOLD = 0.67
+
+# How ballots are counted:
+#   first_choice    each ballot counts for its top-ranked candidate
+#   instant_runoff  the weakest candidate is eliminated and its ballots move to their next choice
+#   weighted        each ballot's weights (all on its top choice when it has none) are added up
+TALLY_METHODS = ('first_choice', 'instant_runoff', 'weighted')
+DEFAULT_TALLY_METHOD = 'first_choice'
+
+_VOTE_FOR = re.compile(r"\bvote\s+for\b", re.IGNORECASE)
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+@dataclass
+class Ballot:
+    """One voter's parsed vote"""
+    voter: str
+    ranking: List[str] = field(default_factory=list)
+    weights: Dict[str, float] = field(default_factory=dict)
+    reasoning: str = ""
+    format: str = "json"  # json, text (fallback parse) or unparsed
+
+    @property
+    def choice(self) -> Optional[str]:
+        return self.ranking[0] if self.ranking else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'ranking': list(self.ranking), 'weights': dict(self.weights), 'format': self.format}
+
+
+def _match_candidate(name: Any, candidates: List[str]) -> Optional[str]:
+    wanted = str(name).strip().strip("[]'\"").lower()
+    for candidate in candidates:
+        if candidate.lower() == wanted:
+            return candidate
+    return None
+
+
+def _json_objects(text: str) -> Iterator[Dict[str, Any]]:
+    """JSON objects in a vote: the whole text, fenced blocks, then any embedded object"""
+    candidates = [text.strip()] + _JSON_FENCE.findall(text)
+    for candidate in candidates:
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            yield value
+
+    decoder = json.JSONDecoder()
+    position = text.find("{")
+    while position != -1:
+        try:
+            value, end = decoder.raw_decode(text, position)
+        except ValueError:
+            position = text.find("{", position + 1)
+            continue
+        if isinstance(value, dict):
+            yield value
+        position = text.find("{", end)
+
+
+def _first_mentioned(text: str, candidates: List[str], exclude: Optional[str] = None) -> Optional[str]:
+    lowered = text.lower()
+    positions = {c: lowered.find(c.lower()) for c in candidates if c != exclude}
+    found = {c: p for c, p in positions.items() if p != -1}
+    return min(found, key=found.get) if found else None
+
+
+def parse_ballot(voter: str, vote_content: Any, candidates: List[str]) -> Ballot:
+    """Parse a vote into a Ballot; names that are not candidates are ignored"""
+    text = str(vote_content)
+    for data in _json_objects(text):
+        ranking = data.get('ranking', data.get('vote'))
+        if isinstance(ranking, str):
+            ranking = [ranking]
+        ranked = []
+        for name in ranking if isinstance(ranking, list) else []:
+            candidate = _match_candidate(name, candidates)
+            if candidate and candidate not in ranked:
+                ranked.append(candidate)
+
+        weights = {}
+        raw_weights = data.get('weights')
+        for name, weight in (raw_weights.items() if isinstance(raw_weights, dict) else []):
+            candidate = _match_candidate(name, candidates)
+            try:
+                weight = float(weight)
+            except (TypeError, ValueError):
+                continue
+            if candidate and weight > 0:
+                weights[candidate] = weights.get(candidate, 0.0) + weight
+        total = sum(weights.values())
+        weights = {c: round(w / total, 6) for c, w in weights.items()}
+        if not ranked and weights:
+            ranked = sorted(weights, key=lambda c: (-weights[c], candidates.index(c)))
+
+        if ranked:
+            return Ballot(voter, ranked, weights, str(data.get('reasoning', '')), 'json')
+
+    # Plain text: the candidate named right after "vote for", else the first other agent named
+    match = _VOTE_FOR.search(text)
+    choice = _first_mentioned(text[match.end():], candidates) if match else None
+    choice = choice or _first_mentioned(text, candidates, exclude=voter)
+    if choice:
+        return Ballot(voter, [choice], {}, text, 'text')
+    return Ballot(voter, reasoning=text, format='unparsed')
+
+
+def _number(value: float):
+    """Whole numbers as int (plain vote counts), others rounded"""
+    return int(value) if float(value).is_integer() else round(value, 4)
+
+
+class VoteTally:
+    """Running tally of board votes with early-decision detection.
+
+    voter_weights gives some voters more say (default 1 each); the consensus threshold is
+    a share of the total voter weight.
+    """
+
+    def __init__(self, candidates: List[str], total_voters: int,
+                 threshold: float = CONSENSUS_THRESHOLD,
+                 method: str = DEFAULT_TALLY_METHOD,
+                 voter_weights: Dict[str, float] = None):
+        if method not in TALLY_METHODS:
+            raise ValueError(f"Unknown tally method '{method}', expected one of {TALLY_METHODS}")
+        self.candidates = list(candidates)
+        self.total_voters = total_voters
+        self.threshold = threshold
+        self.method = method
+        self.voter_weights = dict(voter_weights or {})
+        self.ballots: Dict[str, Ballot] = {}
+
+    @classmethod
+    def from_voting_results(cls, voting_results: Dict[str, Any],
+                            candidates: List[str] = None) -> 'VoteTally':
+        """Recount a finished voting phase with its own candidates and settings.
+
+        Parsing is deterministic, so this reproduces the phase's result exactly.
+        """
+        votes = voting_results.get('votes') or {}
+        consensus = voting_results.get('consensus') or {}
+        tally = cls(consensus.get('candidates') or candidates or [],
+                    consensus.get('total_voters') or len(votes),
+                    threshold=consensus.get('threshold', CONSENSUS_THRESHOLD),
+                    method=consensus.get('method', DEFAULT_TALLY_METHOD),
+                    voter_weights=consensus.get('voter_weights'))
+        for voter, vote_content in votes.items():
+            tally.add_vote_content(voter, vote_content)
+        return tally
+
+    def weight_of(self, voter: str) -> float:
+        return self.voter_weights.get(voter, 1.0)
+
+    def parse_vote(self, voter: str, vote_content: str) -> Optional[str]:
+        """Extract the agent a vote is for (its top choice)"""
+        return parse_ballot(voter, vote_content, self.candidates).choice
+
+    def add_ballot(self, ballot: Ballot):
+        self.ballots[ballot.voter] = ballot
+
+    def add_vote(self, voter: str, choice: Optional[str]):
+        """Record a single-choice vote; a choice of None counts as cast but for nobody"""
+        self.add_ballot(Ballot(voter, [choice] if choice else [], format='json' if choice else 'unparsed'))
+
+    def add_vote_content(self, voter: str, vote_content: str) -> Optional[str]:
+        """Parse and record a raw vote, returning the parsed choice"""
+        ballot = parse_ballot(voter, vote_content, self.candidates)
+        self.add_ballot(ballot)
+        return ballot.choice
+
+    @property
+    def votes_cast(self) -> int:
+        return len(self.ballots)
+
+    @property
+    def votes_remaining(self) -> int:
+        return max(0, self.total_voters - self.votes_cast)
+
+    @property
+    def total_weight(self) -> float:
+        """Weight of the whole board, counting voters not seen yet as 1"""
+        unweighted = max(0, self.total_voters - len(self.voter_weights))
+        return sum(self.voter_weights.values()) + unweighted
+
+    @property
+    def remaining_weight(self) -> float:
+        return max(0.0, self.total_weight - sum(self.weight_of(v) for v in self.ballots))
+
+    def _instant_runoff(self) -> Dict[str, float]:
+        """Final-round counts: eliminate the weakest candidate until one has a majority"""
+        remaining = [c for c in self.candidates
+                     if any(c in ballot.ranking for ballot in self.ballots.values())]
+        while True:
+            counts = {c: 0.0 for c in remaining}
+            for ballot in self.ballots.values():
+                choice = next((c for c in ballot.ranking if c in counts), None)
+                if choice is not None:
+                    counts[choice] += self.weight_of(ballot.voter)
+            total = sum(counts.values())
+            if len(remaining) <= 1 or max(counts.values()) * 2 > total:
+                return counts
+            # Ties for last place drop the candidate listed last, so the result is deterministic
+            weakest = min(reversed(remaining), key=counts.get)
+            remaining.remove(weakest)
+
+    @property
+    def vote_counts(self) -> Dict[str, float]:
+        """Support per candidate under the tally method (only candidates with support)"""
+        if self.method == 'instant_runoff':
+            counts = self._instant_runoff()
+        else:
+            counts = {}
+            for ballot in self.ballots.values():
+                weight = self.weight_of(ballot.voter)
+                if self.method == 'weighted' and ballot.weights:
+                    for candidate, share in ballot.weights.items():
+                        counts[candidate] = counts.get(candidate, 0.0) + weight * share
+                elif ballot.choice is not None:
+                    counts[ballot.choice] = counts.get(ballot.choice, 0.0) + weight
+        return {c: _number(counts[c]) for c in self.candidates if counts.get(c)}
+
+    @property
+    def leader(self) -> Optional[str]:
+        counts = self.vote_counts
+        if not counts:
+            return None
+        # Ties go to the candidate listed first
+        return max(counts, key=lambda c: (counts[c], -self.candidates.index(c)))
+
+    def _reaches_threshold(self, support: float) -> bool:
+        return support >= self.total_weight * self.threshold
+
+    def consensus_guaranteed(self) -> bool:
+        """The leader already has enough votes, whatever the remaining voters do"""
+        # Later ballots can reorder a runoff's eliminations, so it is only final when complete
+        if self.method == 'instant_runoff' and self.votes_remaining:
+            return False
+        leader = self.leader
+        return leader is not None and self._reaches_threshold(self.vote_counts[leader])
+
+    def consensus_impossible(self) -> bool:
+        """No agent can reach the threshold even if every remaining vote goes its way"""
+        if self.method == 'instant_runoff' and self.votes_remaining:
+            return False
+        counts = self.vote_counts
+        best = max((counts.get(c, 0) for c in self.candidates), default=0)
+        return not self._reaches_threshold(best + self.remaining_weight)
+
+    def is_decided(self) -> bool:
+        """Whether the consensus outcome can no longer change"""
+        return self.consensus_guaranteed() or self.consensus_impossible()
+
+    def result(self) -> Dict:
+        """Consensus summary in the shape used by the voting phase results"""
+        counts = self.vote_counts
+        winner = self.leader
+        support = counts[winner] if winner else 0
+        return {
+            'consensus_reached': winner is not None and self._reaches_threshold(support),
+            'winning_agent': winner,
+            'winning_share': round(support / self.total_weight, 4) if self.total_weight else 0.0,
+            'vote_distribution': counts,
+            'total_votes': self.votes_cast,
+            'total_voters': self.total_voters,
+            'candidates': list(self.candidates),
+            'method': self.method,
+            'threshold': self.threshold,
+            'voter_weights': dict(self.voter_weights),
+            'ballots': {voter: ballot.to_dict() for voter, ballot in self.ballots.items()},
+            'unparsed_voters': [voter for voter, ballot in self.ballots.items() if ballot.format == 'unparsed'],
+        }
@@ -0,0 +1,204 @@
+"""
+Token-level streaming of agent output to the debate server
+With streaming LLM clients every generated token goes through one process-wide callback;
+a context variable set around each crew kickoff tells it which debate, agent, phase and
+round the token belongs to. Each debate's TokenStreamer sends its tokens to the server in
+small batches, and the server relays them to the SSE clients without storing them. The
+complete output is still saved once, through the history manager, when the call returns.
+"""
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.db_adapter import REQUEST_TIMEOUT, create_http_session
+
+# Tokens arriving within this many seconds of each other go to the server in one request
+TOKEN_FLUSH_INTERVAL = 0.1
+# Tokens beyond this many unsent chunks are dropped (a slow server must not hold up the debate)
+MAX_PENDING_CHUNKS = 1000
+CLOSE_TIMEOUT = 2.0
+
+
+class _StreamTarget:
+    """Where the tokens of the current kickoff go; set by stream_tokens()"""
+
+    def __init__(self, streamer: 'TokenStreamer', agent: str, phase: str, round_number: int):
+        self.streamer = streamer
+        self.agent = agent
+        self.phase = phase
+        self.round_number = round_number
+        self.started = time.monotonic()
+        self.first_token = None
+
+
+# Copied into asyncio.to_thread, so the kickoff thread's LLM callbacks see it
+_stream_target: contextvars.ContextVar = contextvars.ContextVar('token_stream_target', default=None)
+
+
+@contextlib.contextmanager
+def stream_tokens(streamer: Optional['TokenStreamer'], agent: Optional[str], phase: str,
+                  round_number: int):
+    """Stream the tokens generated within the block as this agent's output (no-op without a streamer)"""
+    if streamer is None or agent is None:
+        yield
+        return
+    token = _stream_target.set(_StreamTarget(streamer, agent, phase, round_number))
+    try:
+        yield
+    finally:
+        _stream_target.reset(token)
+
+
+class TokenStreamCallback(BaseCallbackHandler):
+    """Hands each new token to the streamer of the kickoff that produced it"""
+
+    # Must run in the calling thread to see the kickoff's context variable
+    run_inline = True
+
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs):
+        target = _stream_target.get()
+        if target is not None and token:
+            target.streamer.push(target, str(run_id), token)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        target = _stream_target.get()
+        if target is not None:
+            target.streamer.finish(target, str(run_id))
+
+
+_callback = TokenStreamCallback()
+
+
+def attach_token_stream(llm):
+    """Route a streaming LangChain chat model's tokens to the current debate (idempotent)"""
+    callbacks = [cb for cb in (llm.callbacks or []) if not isinstance(cb, TokenStreamCallback)]
+    llm.callbacks = callbacks + [_callback]
+    return llm
+
+
+class TokenStreamer:
+    """Sends one debate's streamed tokens to POST {api}/debates/<id>/tokens from a background thread.
+
+    Tokens are best effort: a failed request is counted and dropped, never retried, since
+    the saved agent output replaces the streamed text anyway.
+    """
+
+    def __init__(self, debate_id: str, api_base_url: str,
+                 flush_interval: float = TOKEN_FLUSH_INTERVAL, session=None):
+        self.debate_id = debate_id
+        self.url = f"{api_base_url.rstrip('/')}/debates/{debate_id}/tokens"
+        self.flush_interval = flush_interval
+        self._session = session or create_http_session(pool_size=1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending: List[Dict[str, Any]] = []
+        self._open_chunks: Dict[str, Dict[str, Any]] = {}  # stream -> its unsent chunk
+        self._sequence: Dict[str, int] = {}
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._first_token_latencies: List[float] = []
+        self.stats = {
+            'tokens': 0,
+            'streams': 0,
+            'requests': 0,
+            'failed_requests': 0,
+            'dropped_tokens': 0,
+            'dropped_chunks': 0,
+        }
+
+    def _chunk(self, target: _StreamTarget, stream: str) -> Optional[Dict[str, Any]]:
+        """The unsent chunk of this stream, or a new one (None once the backlog is full)"""
+        chunk = self._open_chunks.get(stream)
+        if chunk is not None:
+            return chunk
+        if len(self._pending) >= MAX_PENDING_CHUNKS:
+            return None
+        if stream not in self._sequence:
+            self.stats['streams'] += 1
+        seq = self._sequence[stream] = self._sequence.get(stream, -1) + 1
+        chunk = {
+            'streamId': stream,
+            'agentName': target.agent,
+            'phase': target.phase,
+            'roundNumber': target.round_number,
+            'seq': seq,
+            'text': '',
+            'done': False,
+        }
+        self._open_chunks[stream] = chunk
+        self._pending.append(chunk)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._send_loop, name=f"tokens-{self.debate_id}",
+                                            daemon=True)
+            self._thread.start()
+        self._wake.set()
+        return chunk
+
+    def push(self, target: _StreamTarget, stream: str, token: str):
+        with self._lock:
+            if self._closed:
+                return
+            if target.first_token is None:
+                target.first_token = time.monotonic()
+                self._first_token_latencies.append(target.first_token - target.started)
+            self.stats['tokens'] += 1
+            chunk = self._chunk(target, stream)
+            if chunk is None:
+                self.stats['dropped_tokens'] += 1
+            else:
+                chunk['text'] += token
+
+    def finish(self, target: _StreamTarget, stream: str):
+        """Mark the end of one LLM call's tokens"""
+        with self._lock:
+            if self._closed or stream not in self._sequence:
+                return
+            chunk = self._chunk(target, stream)
+            if chunk is not None:
+                chunk['done'] = True
+
+    def _send_loop(self):
+        while True:
+            self._wake.wait()
+            # Let the tokens of the next few milliseconds join this request
+            time.sleep(self.flush_interval)
+            with self._lock:
+                chunks, self._pending, self._open_chunks = self._pending, [], {}
+                self._wake.clear()
+                closed = self._closed
+            if chunks:
+                self._send(chunks)
+            if closed:
+                return
+
+    def _send(self, chunks: List[Dict[str, Any]]):
+        self.stats['requests'] += 1
+        try:
+            response = self._session.post(self.url, json={'chunks': chunks}, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except Exception as e:
+            if self.stats['failed_requests'] == 0:
+                print(f"⚠️ Token streaming to {self.url} failed ({e}); the full outputs are still saved")
+            self.stats['failed_requests'] += 1
+            self.stats['dropped_chunks'] += len(chunks)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT):
+        """Send what is pending and stop the sender thread"""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = list(self._first_token_latencies)
+            stats = dict(self.stats)
+        stats['avg_time_to_first_token'] = round(sum(latencies) / len(latencies), 3) if latencies else None
+        stats['max_time_to_first_token'] = round(max(latencies), 3) if latencies else None
+        return stats
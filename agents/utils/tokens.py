@@ -0,0 +1,71 @@
+"""
+Token counting helpers for prompt budgeting
+Uses tiktoken when it is installed (it ships with langchain-openai), otherwise a
+characters-per-token estimate
+"""
+import re
+from functools import lru_cache
+from typing import List
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+# Rough average for English prose with the GPT-4o tokenizer
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encoding files could not be loaded (e.g. offline); fall back to the estimate
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Number of tokens text is expected to use in a prompt"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """Cut text down to at most max_tokens, preferring whole sentences"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Keep whole leading sentences while they fit
+    kept: List[str] = []
+    used = estimate_tokens(marker)
+    for sentence in _SENTENCE_END.split(text.strip()):
+        cost = estimate_tokens(sentence + " ")
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return " ".join(kept) + marker
+
+    # The first sentence alone is too long: cut it by words
+    words = text.split()
+    budget_chars = max(1, (max_tokens - estimate_tokens(marker)) * CHARS_PER_TOKEN)
+    truncated = []
+    length = 0
+    for word in words:
+        if length + len(word) + 1 > budget_chars:
+            break
+        truncated.append(word)
+        length += len(word) + 1
+    return " ".join(truncated) + marker
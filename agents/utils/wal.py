@@ -0,0 +1,193 @@
+"""
+Write-ahead log for database persistence
+Every write to the debate API is appended to a JSON-lines file in the session folder
+before it is sent, and acknowledged once the API accepted it. Entries without an ack
+are replayed on retry or at the next startup, so an API outage never loses an LLM output.
+Writes the API rejected outright (a 4xx) would fail the same way on every replay; they
+are moved to a dead-letter file next to the log instead, for someone to inspect.
+
+While a process has a log open it keeps an owner marker (pid and host) next to it, so
+startup replay leaves the logs of debates still running elsewhere alone.
+"""
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+WAL_FILENAME = "db_wal.jsonl"
+
+# always:   fsync after every appended line (safest)
+# interval: fsync at most every FSYNC_INTERVAL seconds
+# never:    leave flushing to the operating system
+FSYNC_MODES = ('always', 'interval', 'never')
+DEFAULT_FSYNC = 'always'
+FSYNC_INTERVAL = 1.0
+
+OWNER_SUFFIX = ".owner"
+REJECTED_SUFFIX = ".rejected"
+# A log untouched this long is replayed even if its owner still looks alive (a hung
+# process, or a pid on another host that cannot be checked)
+STALE_WAL_SECONDS = 3600
+
+
+def make_idempotency_key(debate_id: str, phase: str, agent: str, round_number: int,
+                         content: str = "") -> str:
+    """Key of one persisted record: debate, phase, agent and round, plus a content digest
+    so the same round number in a later iteration gets its own key"""
+    digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+    return f"{debate_id}:{phase}:{agent}:{round_number}:{digest}"
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def wal_in_use(path: str, stale_after: float = STALE_WAL_SECONDS) -> bool:
+    """Whether a live process (this one included) still has the log at path open"""
+    try:
+        with open(path + OWNER_SUFFIX, 'r', encoding='utf-8') as f:
+            owner = json.load(f)
+        modified = os.path.getmtime(path)
+    except (OSError, ValueError):
+        # No marker: the owner closed the log, or never got to write one
+        return False
+    if time.time() - modified > stale_after:
+        return False
+    if owner.get('host') != socket.gethostname():
+        return True
+    return _process_alive(int(owner.get('pid', 0)))
+
+
+class WriteAheadLog:
+    """Append-only log of write entries and their acks.
+
+    A write entry is {'op': 'write', 'key', 'debate_id', 'kind', ...}; an ack is
+    {'op': 'ack', 'key'}. Acking is idempotent, and writing a key again after its ack
+    makes it pending again.
+    """
+
+    def __init__(self, path: str, fsync: str = DEFAULT_FSYNC):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"Unknown fsync mode '{fsync}', expected one of {FSYNC_MODES}")
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._load()
+        self._file = None
+        self._open()
+
+    def _open(self):
+        """Open the log for appending and mark this process as its owner (lock held)"""
+        with open(self.path + OWNER_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump({'pid': os.getpid(), 'host': socket.gethostname()}, f)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one torn line at the end
+                    continue
+                if entry.get('op') == 'write':
+                    self._pending.pop(entry['key'], None)
+                    self._pending[entry['key']] = entry
+                elif entry.get('op') == 'ack':
+                    self._pending.pop(entry['key'], None)
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        """Write lines and sync them according to the fsync mode (lock held)"""
+        if self._file is None:
+            self._open()
+        self._file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self._file.flush()
+        now = time.monotonic()
+        if self.fsync == 'always' or (self.fsync == 'interval' and now - self._last_sync >= FSYNC_INTERVAL):
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def append(self, key: str, debate_id: str, kind: str, **data: Any):
+        """Durably record a write before it is sent"""
+        entry = {'op': 'write', 'key': key, 'debate_id': debate_id, 'kind': kind,
+                 'ts': time.time(), **data}
+        with self._lock:
+            self._append([entry])
+            self._pending.pop(key, None)
+            self._pending[key] = entry
+
+    def ack(self, keys: List[str]):
+        """Mark writes as accepted by the API; keys that are not pending are ignored"""
+        with self._lock:
+            acked = [key for key in keys if key in self._pending]
+            if not acked:
+                return
+            self._append([{'op': 'ack', 'key': key} for key in acked])
+            for key in acked:
+                del self._pending[key]
+
+    def reject(self, keys: List[str], reason: str):
+        """Move writes the API refused to the dead-letter file and ack them in the log"""
+        with self._lock:
+            rejected = [self._pending[key] for key in keys if key in self._pending]
+            if not rejected:
+                return
+            with open(self.path + REJECTED_SUFFIX, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps({**entry, 'reason': reason, 'rejected_at': time.time()},
+                                           ensure_ascii=False) + "\n" for entry in rejected))
+                f.flush()
+                os.fsync(f.fileno())
+            self._append([{'op': 'ack', 'key': entry['key']} for entry in rejected])
+            for entry in rejected:
+                del self._pending[entry['key']]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Unacknowledged write entries, oldest first"""
+        with self._lock:
+            return list(self._pending.values())
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def compact(self):
+        """Rewrite the log with only the pending entries"""
+        with self._lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self._pending.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if self._file is not None:
+                self._file.close()
+            os.replace(tmp_path, self.path)
+            if self._file is not None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        """Sync and close the file and drop the owner marker"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            try:
+                os.remove(self.path + OWNER_SUFFIX)
+            except FileNotFoundError:
+                pass
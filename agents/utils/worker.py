@@ -0,0 +1,332 @@
+"""
+Long-lived debate worker service
+Keeps the interpreter, imports and a warmed-up orchestrator resident and runs debate jobs
+submitted over local HTTP, several at a time, instead of one new process per debate.
+
+Endpoints (JSON):
+    POST /jobs                {debate_id, topic, max_iterations?, api_url?, resume?, priority?}
+    GET  /jobs/<id>?since=N&events_since=M
+                              job status, output lines from offset N and progress events
+                              (utils/progress.py) from offset M
+    POST /jobs/<id>/cancel
+    GET  /status              slots, running and queued jobs
+"""
+import asyncio
+import contextvars
+import datetime
+import io
+import json
+import sys
+import time
+import traceback
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from crew.session import DebateRuntime
+
+DEFAULT_WORKER_HOST = "127.0.0.1"
+DEFAULT_WORKER_PORT = 8765
+DEFAULT_WORKER_SLOTS = 2
+MAX_JOB_OUTPUT_LINES = 5000
+MAX_JOB_EVENTS = 5000
+MAX_REQUEST_BYTES = 1024 * 1024
+# Finished jobs stay queryable this long (the server polls them to completion within
+# seconds), and at most this many are kept
+FINISHED_JOB_TTL = 600
+MAX_FINISHED_JOBS = 100
+
+JOB_STATES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+
+# Job whose output the current task or worker thread produces (copied into asyncio.to_thread)
+_current_job: contextvars.ContextVar = contextvars.ContextVar('debate_job', default=None)
+
+
+class _Backlog:
+    """Bounded log whose entries keep their offsets when old ones are dropped"""
+
+    def __init__(self, maxlen: int):
+        self.entries = deque(maxlen=maxlen)
+        self.offset = 0  # number of entries dropped from the front
+
+    def append(self, entry: Any):
+        if len(self.entries) == self.entries.maxlen:
+            self.offset += 1
+        self.entries.append(entry)
+
+    def since(self, since: int) -> tuple:
+        """Entries from offset `since` on, and the offset to ask for next"""
+        start = max(since - self.offset, 0)
+        entries = list(self.entries)[start:]
+        return entries, self.offset + start + len(entries)
+
+
+class DebateJob:
+    """One submitted debate, the output it has printed and the progress events it has emitted"""
+
+    def __init__(self, debate_id: str, topic: str, max_iterations: Optional[int] = None,
+                 api_url: Optional[str] = None, resume: Optional[str] = None,
+                 priority: str = 'interactive'):
+        self.debate_id = debate_id
+        self.topic = topic
+        self.max_iterations = max_iterations
+        self.api_url = api_url
+        self.resume = resume
+        self.priority = priority  # rate limiter lane: interactive or batch
+        self.status = 'queued'
+        self.error = None
+        self.result: Dict[str, Any] = {}
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.task: Optional[asyncio.Task] = None
+        self.session = None  # crew.session.DebateSession once the job runs
+        self.lines = _Backlog(MAX_JOB_OUTPUT_LINES)
+        self.events = _Backlog(MAX_JOB_EVENTS)
+        self._partial = ""
+
+    def write(self, text: str):
+        self._partial += text
+        *complete, self._partial = self._partial.split("\n")
+        for line in complete:
+            self.lines.append(line)
+
+    def add_event(self, event: Dict[str, Any]):
+        """Progress sink of the job's session"""
+        self.events.append(event)
+
+    def output_since(self, since: int) -> Dict[str, Any]:
+        lines, next_offset = self.lines.since(since)
+        return {'lines': lines, 'next': next_offset}
+
+    def events_since(self, since: int) -> Dict[str, Any]:
+        events, next_offset = self.events.since(since)
+        return {'events': events, 'next': next_offset}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'debate_id': self.debate_id,
+            'topic': self.topic,
+            'status': self.status,
+            'error': self.error,
+            'result': self.result,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class _JobStdout(io.TextIOBase):
+    """sys.stdout replacement that copies each job's output into its DebateJob"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text: str) -> int:
+        job = _current_job.get()
+        if job is not None:
+            job.write(text)
+        return self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class DebateWorker:
+    """Runs debate jobs on a fixed number of slots within one event loop.
+
+    Each job is its own DebateSession of the shared runtime, so jobs share LLM clients
+    and call limits but no debate state.
+    """
+
+    def __init__(self, runtime: 'DebateRuntime', slots: int = DEFAULT_WORKER_SLOTS):
+        self.runtime = runtime
+        self.slots = slots
+        self.jobs: Dict[str, DebateJob] = {}
+        self.started_at = time.time()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._spare = None
+
+    async def warm_up(self):
+        """Build (and keep) one orchestrator so the first job skips agent and client setup"""
+        start = time.perf_counter()
+        # Deliver writes that earlier runs logged but could not send (once, before any job runs)
+        self.runtime.history_manager().replay_unacked_writes()
+        orchestrator = self.runtime.create_orchestrator()
+        await orchestrator.initialize_agents()
+        self._spare = orchestrator
+        print(f"🔥 Worker warmed up in {time.perf_counter() - start:.2f}s")
+
+    def _take_orchestrator(self):
+        orchestrator, self._spare = self._spare, None
+        return orchestrator or self.runtime.create_orchestrator()
+
+    def _evict_finished(self):
+        """Forget finished jobs older than FINISHED_JOB_TTL, keeping at most MAX_FINISHED_JOBS"""
+        finished = sorted((job for job in self.jobs.values() if job.status not in ('queued', 'running')),
+                          key=lambda job: job.finished_at or job.submitted_at)
+        cutoff = time.time() - FINISHED_JOB_TTL
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for i, job in enumerate(finished):
+            if i < excess or (job.finished_at or job.submitted_at) < cutoff:
+                del self.jobs[job.debate_id]
+
+    def submit(self, job: DebateJob) -> DebateJob:
+        self._evict_finished()
+        existing = self.jobs.get(job.debate_id)
+        if existing and existing.status in ('queued', 'running'):
+            raise ValueError(f"Debate {job.debate_id} is already {existing.status}")
+        self.jobs[job.debate_id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def cancel(self, debate_id: str) -> bool:
+        job = self.jobs.get(debate_id)
+        if not job or job.status not in ('queued', 'running'):
+            return False
+        job.task.cancel()
+        return True
+
+    async def _run(self, job: DebateJob):
+        _current_job.set(job)
+        try:
+            async with self._slots:
+                job.status = 'running'
+                job.started_at = time.time()
+                print(f"🚀 Job {job.debate_id} started: {job.topic}")
+                results = await self._run_debate(job)
+            job.result = {
+                'session_folder': results.get('session_folder'),
+                'consensus_reached': results.get('consensus_reached'),
+                'iterations_completed': results.get('iterations_completed'),
+                'metrics': job.session.metrics,
+            }
+            job.status = 'completed'
+            print("✅ Debate completed successfully!")
+        except asyncio.CancelledError:
+            job.status = 'cancelled'
+            print(f"🛑 Job {job.debate_id} cancelled")
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            print(f"❌ Debate failed: {e}")
+            traceback.print_exc(file=sys.stdout)
+        finally:
+            job.finished_at = time.time()
+            self._evict_finished()
+            if self._spare is None:
+                # Have a ready orchestrator for the next job, built off the event loop
+                spare = await asyncio.to_thread(self.runtime.create_orchestrator)
+                if self._spare is None:
+                    self._spare = spare
+
+    async def _run_debate(self, job: DebateJob) -> Dict[str, Any]:
+        job.session = self.runtime.open_session(job.debate_id, job.topic, api_base_url=job.api_url,
+                                                resume=job.resume, orchestrator=self._take_orchestrator(),
+                                                priority=job.priority, progress_sink=job.add_event)
+        return await job.session.run(job.max_iterations)
+
+    def status(self) -> Dict[str, Any]:
+        by_state = {state: 0 for state in JOB_STATES}
+        for job in self.jobs.values():
+            by_state[job.status] += 1
+        return {
+            'slots': self.slots,
+            'busy_slots': by_state['running'],
+            'jobs': by_state,
+            'running': [job.debate_id for job in self.jobs.values() if job.status == 'running'],
+            'queued': [job.debate_id for job in self.jobs.values() if job.status == 'queued'],
+            'warm': self._spare is not None,
+            'call_limiter': self.runtime.get_metrics()['call_limiter'],
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+        }
+
+    # ----- HTTP -----
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > MAX_REQUEST_BYTES:
+                status, body = 413, {'error': 'Request too large'}
+            else:
+                payload = json.loads(await reader.readexactly(length)) if length else {}
+                status, body = self._route(method, target, payload)
+        except (ValueError, json.JSONDecodeError) as e:
+            status, body = 400, {'error': str(e)}
+        except Exception as e:
+            status, body = 500, {'error': str(e)}
+
+        data = json.dumps(body, default=str).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _route(self, method: str, target: str, payload: Dict[str, Any]):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+
+        if method == 'GET' and parts == ['status']:
+            return 200, self.status()
+
+        if method == 'POST' and parts == ['jobs']:
+            if not payload.get('debate_id') or not (payload.get('topic') or payload.get('resume')):
+                return 400, {'error': 'debate_id and topic (or resume) are required'}
+            job = DebateJob(payload['debate_id'], payload.get('topic'), payload.get('max_iterations'),
+                            payload.get('api_url'), payload.get('resume'),
+                            payload.get('priority', 'interactive'))
+            try:
+                self.submit(job)
+            except ValueError as e:
+                return 409, {'error': str(e)}
+            return 202, job.to_dict()
+
+        if len(parts) >= 2 and parts[0] == 'jobs':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {'error': 'Job not found'}
+            if method == 'GET' and len(parts) == 2:
+                query = parse_qs(url.query)
+                since = int(query.get('since', ['0'])[0])
+                events_since = int(query.get('events_since', ['0'])[0])
+                body = {**job.to_dict(), 'output': job.output_since(since),
+                        'events': job.events_since(events_since)}
+                if job.status == 'running' and job.session is not None:
+                    body['metrics'] = job.session.metrics
+                return 200, body
+            if method == 'POST' and parts[2:] == ['cancel']:
+                return 200, {'cancelled': self.cancel(job.debate_id)}
+
+        return 404, {'error': 'Not found'}
+
+    async def serve(self, host: str = DEFAULT_WORKER_HOST, port: int = DEFAULT_WORKER_PORT):
+        """Warm up, then serve jobs until cancelled"""
+        self._slots = asyncio.Semaphore(self.slots)
+        sys.stdout = _JobStdout(sys.stdout)
+        await self.warm_up()
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        print(f"👷 Debate worker listening on http://{host}:{port} with {self.slots} slots "
+              f"(started {datetime.datetime.now().isoformat(timespec='seconds')})")
+        async with server:
+            await server.serve_forever()
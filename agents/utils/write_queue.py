@@ -0,0 +1,174 @@
+"""
+Write-behind queue for database persistence
+Runs HTTP writes on background threads so the debate never waits on the API.
+Writes for the same debate are delivered in submission order.
+"""
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from utils.metrics import percentile
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 0.5  # seconds, doubled after every failed attempt
+EXIT_FLUSH_TIMEOUT = 30.0
+LATENCY_SAMPLES = 10000
+
+# Client errors that may succeed later; every other 4xx is the request's own fault
+RETRYABLE_STATUS = (408, 429)
+
+_STOP = object()
+
+
+def http_status(error: BaseException) -> Optional[int]:
+    """Status code of a failed HTTP request, None if no response came back"""
+    return getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+def is_rejected(error: BaseException) -> bool:
+    """Whether the API refused the request itself (a 4xx that sending again can't fix)"""
+    status = http_status(error)
+    return status is not None and 400 <= status < 500 and status not in RETRYABLE_STATUS
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Connection errors, timeouts, 5xx and the retryable 4xx are worth another attempt"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+        return True
+    status = http_status(error)
+    return status is not None and (status >= 500 or status in RETRYABLE_STATUS)
+
+
+class WriteBehindQueue:
+    """Bounded queue of write jobs served by a small pool of worker threads.
+
+    Each job carries a key (the debate id) and always goes to the same worker, so the
+    jobs of one debate run in order while different debates are written in parallel.
+    When a worker's queue is full, submit() blocks until there is room. Only failures
+    that may pass on another attempt (see is_retryable) are retried.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, workers: int = DEFAULT_WORKERS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, retry_backoff: float = DEFAULT_RETRY_BACKOFF):
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._queues = [queue.Queue(maxsize=maxsize) for _ in range(max(1, workers))]
+        self._cond = threading.Condition()
+        self._pending: Dict[Any, int] = {}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.stats = {'submitted': 0, 'delivered': 0, 'failed': 0, 'retries': 0,
+                      'max_depth': 0, 'blocked_seconds': 0.0}
+        self._threads = [
+            threading.Thread(target=self._worker, args=(q,), name=f"write-behind-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _queue_for(self, key: Any) -> queue.Queue:
+        return self._queues[hash(key) % len(self._queues)]
+
+    def submit(self, key: Any, description: str, func: Callable[[], Any]):
+        """Queue func() for delivery after every job already submitted for key"""
+        with self._cond:
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self.stats['submitted'] += 1
+
+        target = self._queue_for(key)
+        start = time.perf_counter()
+        target.put((key, description, func, time.perf_counter()))
+        blocked = time.perf_counter() - start
+
+        with self._cond:
+            self.stats['blocked_seconds'] += blocked
+            self.stats['max_depth'] = max(self.stats['max_depth'], self.depth())
+
+    def depth(self) -> int:
+        """Jobs waiting across all workers (excluding the ones in flight)"""
+        return sum(q.qsize() for q in self._queues)
+
+    def _worker(self, jobs: queue.Queue):
+        while True:
+            job = jobs.get()
+            if job is _STOP:
+                jobs.task_done()
+                return
+            key, description, func, submitted_at = job
+            delivered = self._deliver(description, func)
+            with self._cond:
+                self.stats['delivered' if delivered else 'failed'] += 1
+                self._latencies.append(time.perf_counter() - submitted_at)
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+                self._cond.notify_all()
+            jobs.task_done()
+
+    def _deliver(self, description: str, func: Callable[[], Any]) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                func()
+                return True
+            except Exception as e:
+                if not is_retryable(e):
+                    print(f"❌ Failed to {description}: {e}")
+                    return False
+                if attempt == self.max_attempts:
+                    print(f"❌ Failed to {description} after {attempt} attempts: {e}")
+                    return False
+                with self._cond:
+                    self.stats['retries'] += 1
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+        return False
+
+    def flush(self, key: Any = None, timeout: Optional[float] = None) -> bool:
+        """Wait until the jobs for key (or all jobs) are delivered; False on timeout"""
+        def drained():
+            return not self._pending if key is None else key not in self._pending
+
+        with self._cond:
+            return self._cond.wait_for(drained, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = EXIT_FLUSH_TIMEOUT) -> bool:
+        """Flush outstanding writes and stop the workers"""
+        drained = self.flush(timeout=timeout)
+        for jobs in self._queues:
+            jobs.put(_STOP)
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, delivery counters and submit-to-delivery latency"""
+        with self._cond:
+            latencies = list(self._latencies)
+            pending = sum(self._pending.values())
+            stats = dict(self.stats)
+        return {
+            **stats,
+            'blocked_seconds': round(stats['blocked_seconds'], 4),
+            'depth': self.depth(),
+            'pending': pending,
+            'latency_p50': round(percentile(latencies, 50), 4),
+            'latency_p95': round(percentile(latencies, 95), 4),
+            'latency_max': round(max(latencies, default=0.0), 4),
+        }
+
+
+_shared_queue: Optional[WriteBehindQueue] = None
+_shared_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteBehindQueue:
+    """Process-wide write-behind queue, flushed when the interpreter exits"""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = WriteBehindQueue()
+            atexit.register(_shared_queue.close)
+        return _shared_queue
@@ -28,8 +28,13 @@ export const useDebate = () => {
       };
 
       setMessages((prev) => {
+        // A saved output replaces the agent's oldest live message; a status update only
+        // replaces a placeholder, never the text of a call that is streaming
         const existing = prev.find(
-          (m) => m.agent === agent && m.status !== 'complete'
+          (m) =>
+            m.agent === agent &&
+            m.status !== 'complete' &&
+            (status === 'complete' || !m.streamId)
         );
         if (existing) {
           return prev.map((m) => (m.id === existing.id ? message : m));
@@ -40,6 +45,42 @@ export const useDebate = () => {
     []
   );
 
+  // Show streamed tokens as a live message per LLM call (an agent may be in several at
+  // once) until the agent's saved output replaces it
+  const appendToken = useCallback(
+    (agent: string, streamId: string, text: string) => {
+      setMessages((prev) => {
+        const streaming = prev.find(
+          (m) => m.streamId === streamId && m.status !== 'complete'
+        );
+        if (streaming) {
+          return prev.map((m) =>
+            m.id === streaming.id
+              ? { ...m, content: (m.content || '') + text }
+              : m
+          );
+        }
+        // A new call takes over the agent's status placeholder, if it shows one
+        const placeholder = prev.find(
+          (m) => m.agent === agent && m.status !== 'complete' && !m.streamId
+        );
+        const message: AgentMessage = {
+          id: streamId,
+          agent,
+          status: 'speaking',
+          content: text,
+          timestamp: placeholder ? placeholder.timestamp : new Date(),
+          streamId,
+        };
+        if (placeholder) {
+          return prev.map((m) => (m.id === placeholder.id ? message : m));
+        }
+        return [...prev, message];
+      });
+    },
+    []
+  );
+
   const startDebate = useCallback(
     async (topic: string, maxIterations: number = 3) => {
       setIsLoading(true);
@@ -71,7 +112,10 @@ export const useDebate = () => {
                 if (data.agent) {
                   addMessage(
                     data.agent,
-                    data.data.status === 'researching' ? 'thinking' : 'speaking'
+                    data.data.status === 'researching' ||
+                      data.data.status === 'thinking'
+                      ? 'thinking'
+                      : 'speaking'
                   );
                 }
                 break;
@@ -82,6 +126,12 @@ export const useDebate = () => {
                 }
                 break;
 
+              case 'agent_token':
+                if (data.agent && data.data.text) {
+                  appendToken(data.agent, data.data.streamId, data.data.text);
+                }
+                break;
+
               case 'session_update':
                 setCurrentSession((prev) =>
                   prev ? { ...prev, ...data.data } : null
@@ -109,7 +159,7 @@ export const useDebate = () => {
         setIsLoading(false);
       }
     },
-    [addMessage]
+    [addMessage, appendToken]
   );
 
   const stopDebate = useCallback(() => {
@@ -13,6 +13,8 @@ export interface AgentMessage {
   timestamp: Date;
   attachmentPath?: string;
   wordCount?: number;
+  // Set while the message shows tokens of one LLM call (see useDebate appendToken)
+  streamId?: string;
 }
 
 export interface DebateSession {
@@ -27,7 +29,14 @@ export interface DebateSession {
 }
 
 export interface StreamingData {
-  type: 'agent_status' | 'agent_output' | 'session_update' | 'error';
+  type:
+    | 'agent_status'
+    | 'agent_output'
+    | 'agent_token'
+    | 'debate_exchange'
+    | 'session_update'
+    | 'progress'
+    | 'error';
   agent?: string;
   data: any;
   timestamp: string;
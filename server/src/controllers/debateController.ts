@@ -1,25 +1,52 @@
 import { Request, Response } from 'express';
 import { spawn, ChildProcess } from 'child_process';
 import path from 'path';
+import readline from 'readline';
+import { Readable } from 'stream';
 import { EventEmitter } from 'events';
 import {
   DebateSession,
   AgentOutput,
   DebateExchange,
   DebateRepository,
+  IAgentOutput,
 } from '../models/debateModel';
 import { AgentType, DebatePhase } from '../types/types';
 import { Types } from 'mongoose';
 
+// How often output of debates running on the agent worker service is polled
+const WORKER_POLL_INTERVAL_MS = 1000;
+const WORKER_TERMINAL_STATES = ['completed', 'failed', 'cancelled'];
+// Spawned debates stream agent tokens to POST /debates/:id/tokens unless turned off
+const STREAM_AGENT_TOKENS = process.env.STREAM_AGENT_TOKENS !== 'false';
+// Spawned debates write their progress events (agents/utils/progress.py) to this fd
+const PROGRESS_FD = 3;
+// Progress event format this server understands
+const PROGRESS_EVENT_VERSION = 1;
+
+// Outcome of submitting a debate to the agent worker service
+type WorkerSubmission =
+  | { outcome: 'started' }
+  // No worker configured, unreachable or failing (5xx): spawn a process instead
+  | { outcome: 'unavailable' }
+  // The worker refused this debate (4xx, e.g. 409 already running): tell the client
+  | { outcome: 'rejected'; status: number; error: string };
+
 export class DebateController {
   // Track running debate processes to prevent multiple spawns
   private static runningProcesses = new Map<string, ChildProcess>();
 
+  // Debates running on the agent worker service (AGENT_WORKER_URL), with their poll timer
+  private static runningWorkerJobs = new Map<string, NodeJS.Timeout>();
+
   // Event emitter for real-time streaming
   private static debateEventEmitter = new EventEmitter();
 
   // Track SSE connections
   private static sseConnections = new Map<string, Response[]>();
+
+  // Agent output ids already written to each SSE connection
+  private static sentOutputIds = new WeakMap<Response, Set<string>>();
   // Start a new debate session
   static async startDebate(req: Request, res: Response) {
     try {
@@ -42,7 +69,7 @@ export class DebateController {
       const debateId = String(session._id);
 
       // Check if a process is already running for this debate
-      if (DebateController.runningProcesses.has(debateId)) {
+      if (DebateController.isRunning(debateId)) {
         console.log(`⚠️ Debate process already running for ID: ${debateId}`);
         return res.status(409).json({
           error: 'Debate process already running for this session',
@@ -63,15 +90,32 @@ export class DebateController {
 
       console.log(`🚀 Starting new debate process for ID: ${debateId}`);
 
-      // Start Python debate process
-      const pythonProcess = DebateController.startPythonDebate(
+      // Prefer the long-lived agent worker; spawn a Python process if it is unavailable
+      const submission = await DebateController.startWorkerDebate(
         debateId,
         topic,
         maxIterations
       );
 
-      // Track the running process
-      DebateController.runningProcesses.set(debateId, pythonProcess);
+      if (submission.outcome === 'rejected') {
+        return res.status(submission.status).json({
+          error: submission.error,
+          session,
+          ...(submission.status === 409 ? { status: 'running' } : {}),
+        });
+      }
+
+      if (submission.outcome === 'unavailable') {
+        // Start Python debate process
+        const pythonProcess = DebateController.startPythonDebate(
+          debateId,
+          topic,
+          maxIterations
+        );
+
+        // Track the running process
+        DebateController.runningProcesses.set(debateId, pythonProcess);
+      }
 
       res.status(201).json({
         message: 'Debate session started',
@@ -179,10 +223,13 @@ export class DebateController {
         maxIterations.toString(),
         '--api-url',
         process.env.API_URL || 'http://localhost:3001/api',
+        ...(STREAM_AGENT_TOKENS ? ['--stream-tokens'] : []),
+        '--progress-fd',
+        PROGRESS_FD.toString(),
       ],
       {
         cwd: agentsPath,
-        stdio: ['pipe', 'pipe', 'pipe'],
+        stdio: ['pipe', 'pipe', 'pipe', 'pipe'],
         env: {
           ...process.env,
           DEBATE_API_URL: process.env.API_URL || 'http://localhost:3001/api',
@@ -190,55 +237,32 @@ export class DebateController {
       }
     );
 
+    // stdout and stderr are human-readable logs only; progress comes from PROGRESS_FD
     pythonProcess.stdout.on('data', (data) => {
-      const output = data.toString().trim();
-      console.log(`[Python ${debateId}] ${output}`);
-
-      // Parse Python output for agent status updates
-      DebateController.parseAndEmitAgentUpdate(debateId, output);
+      console.log(`[Python ${debateId}] ${data.toString().trim()}`);
     });
 
     pythonProcess.stderr.on('data', (data) => {
-      const output = data.toString().trim();
-      console.error(`[Python ${debateId} Error] ${output}`);
-
-      // Also check stderr for agent updates (some logging goes to stderr)
-      DebateController.parseAndEmitAgentUpdate(debateId, output);
+      console.error(`[Python ${debateId} Error] ${data.toString().trim()}`);
     });
 
+    readline
+      .createInterface({ input: pythonProcess.stdio[PROGRESS_FD] as Readable })
+      .on('line', (line) => {
+        try {
+          DebateController.emitProgressEvents(debateId, [JSON.parse(line)]);
+        } catch (error) {
+          console.error(`[Python ${debateId}] Invalid progress event:`, line);
+        }
+      });
+
     pythonProcess.on('close', async (code) => {
       console.log(`[Python ${debateId}] Process exited with code ${code}`);
 
       // Remove from running processes
       DebateController.runningProcesses.delete(debateId);
 
-      // Emit completion event
-      DebateController.emitToSSE(debateId, {
-        type: 'session_update',
-        data: {
-          status: code === 0 ? 'completed' : 'failed',
-          completed: true,
-        },
-        timestamp: new Date().toISOString(),
-      });
-
-      // Update debate session status
-      try {
-        await DebateSession.findByIdAndUpdate(debateId, {
-          status: code === 0 ? 'completed' : 'failed',
-          endTime: new Date(),
-        });
-        console.log(
-          `✅ Updated debate ${debateId} status to ${
-            code === 0 ? 'completed' : 'failed'
-          }`
-        );
-      } catch (error) {
-        console.error(
-          `❌ Failed to update debate session ${debateId} status:`,
-          error
-        );
-      }
+      await DebateController.finishDebate(debateId, code === 0);
     });
 
     pythonProcess.on('error', (error) => {
@@ -259,64 +283,218 @@ export class DebateController {
     return pythonProcess;
   }
 
-  // Parse Python output and emit agent updates
-  private static parseAndEmitAgentUpdate(debateId: string, output: string) {
+  // Submit a debate to the agent worker service. Only a missing, unreachable or failing
+  // (5xx) worker falls back to a spawned process; a 4xx such as 409 "already running"
+  // means the worker has (or refused) this debate, so spawning would run it twice
+  private static async startWorkerDebate(
+    debateId: string,
+    topic: string,
+    maxIterations: number
+  ): Promise<WorkerSubmission> {
+    const workerUrl = process.env.AGENT_WORKER_URL;
+    if (!workerUrl) {
+      return { outcome: 'unavailable' };
+    }
+
     try {
-      // Look for agent status indicators in the output
-      if (
-        output.includes('researching...') ||
-        output.includes('⏱️  Starting research for')
-      ) {
-        const agentMatch = output.match(/→ (.+?) researching\.\.\./);
-        if (agentMatch) {
-          const agentName = agentMatch[1].trim();
-          DebateController.emitToSSE(debateId, {
-            type: 'agent_status',
-            agent: agentName,
-            data: {
-              status: 'researching',
-            },
-            timestamp: new Date().toISOString(),
-          });
+      const response = await fetch(`${workerUrl}/jobs`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          debate_id: debateId,
+          topic,
+          max_iterations: maxIterations,
+          api_url: process.env.API_URL || 'http://localhost:3001/api',
+        }),
+      });
+      if (response.status >= 500) {
+        console.error(
+          `⚠️ Agent worker failed on debate ${debateId} (${response.status}), spawning a process instead: ${await response.text()}`
+        );
+        return { outcome: 'unavailable' };
+      }
+      if (!response.ok) {
+        const body = await response.text();
+        console.error(
+          `⚠️ Agent worker rejected debate ${debateId} (${response.status}): ${body}`
+        );
+        let error = body;
+        try {
+          error = JSON.parse(body).error ?? body;
+        } catch {
+          // Not JSON: pass the text on as it is
         }
+        return { outcome: 'rejected', status: response.status, error };
       }
+    } catch (error) {
+      console.error(
+        `⚠️ Agent worker unreachable at ${workerUrl}, spawning a process instead:`,
+        error
+      );
+      return { outcome: 'unavailable' };
+    }
 
-      // Look for task completion
-      if (
-        output.includes('Task completed') ||
-        output.includes('Agent completed')
-      ) {
-        // This would need more specific parsing based on your Python output format
-        // For now, we'll rely on database polling for completed outputs
-      }
+    console.log(`👷 Debate ${debateId} submitted to agent worker`);
+    DebateController.scheduleWorkerPoll(debateId, 0, 0);
+    return { outcome: 'started' };
+  }
 
-      // Look for phase changes
-      if (output.includes('Phase')) {
-        const phaseMatch = output.match(/Phase (\d+): (.+)/);
-        if (phaseMatch) {
-          DebateController.emitToSSE(debateId, {
-            type: 'session_update',
-            data: {
-              currentPhase: phaseMatch[2],
-              currentIteration: parseInt(phaseMatch[1]),
-            },
-            timestamp: new Date().toISOString(),
-          });
+  // Relay a worker job's new output lines and progress events and finish the debate once the job ends
+  private static scheduleWorkerPoll(
+    debateId: string,
+    since: number,
+    eventsSince: number
+  ) {
+    const timer = setTimeout(async () => {
+      let next = since;
+      let nextEvent = eventsSince;
+      let status: string | undefined;
+      try {
+        const response = await fetch(
+          `${process.env.AGENT_WORKER_URL}/jobs/${debateId}?since=${since}&events_since=${eventsSince}`
+        );
+        if (response.status === 404) {
+          // The worker restarted and lost the job
+          status = 'failed';
+        } else {
+          const job = await response.json();
+          for (const line of job.output.lines as string[]) {
+            console.log(`[Worker ${debateId}] ${line}`);
+          }
+          DebateController.emitProgressEvents(debateId, job.events.events);
+          next = job.output.next;
+          nextEvent = job.events.next;
+          status = job.status;
         }
+      } catch (error) {
+        console.error(`[Worker ${debateId}] Failed to poll job:`, error);
+      }
+
+      // Stopped while this poll was in flight
+      if (DebateController.runningWorkerJobs.get(debateId) !== timer) {
+        return;
+      }
+
+      if (status && WORKER_TERMINAL_STATES.includes(status)) {
+        DebateController.runningWorkerJobs.delete(debateId);
+        await DebateController.finishDebate(debateId, status === 'completed');
+      } else {
+        DebateController.scheduleWorkerPoll(debateId, next, nextEvent);
       }
+    }, WORKER_POLL_INTERVAL_MS);
+
+    DebateController.runningWorkerJobs.set(debateId, timer);
+  }
+
+  // Emit completion and record the final status of a debate that stopped running
+  private static async finishDebate(debateId: string, succeeded: boolean) {
+    const status = succeeded ? 'completed' : 'failed';
+
+    // Emit completion event
+    DebateController.emitToSSE(debateId, {
+      type: 'session_update',
+      data: {
+        status,
+        completed: true,
+      },
+      timestamp: new Date().toISOString(),
+    });
+
+    // Update debate session status
+    try {
+      await DebateSession.findByIdAndUpdate(debateId, {
+        status,
+        endTime: new Date(),
+      });
+      console.log(`✅ Updated debate ${debateId} status to ${status}`);
     } catch (error) {
-      console.error('Error parsing Python output:', error);
+      console.error(
+        `❌ Failed to update debate session ${debateId} status:`,
+        error
+      );
+    }
+  }
+
+  private static isRunning(debateId: string) {
+    return (
+      DebateController.runningProcesses.has(debateId) ||
+      DebateController.runningWorkerJobs.has(debateId)
+    );
+  }
+
+  // Turn the agents' progress events into SSE updates, and relay each event as is
+  private static emitProgressEvents(debateId: string, events: any[]) {
+    const updates: any[] = [];
+    for (const event of events) {
+      if (event.v !== PROGRESS_EVENT_VERSION) {
+        console.error(
+          `[Python ${debateId}] Ignoring progress event of version ${event.v}`
+        );
+        continue;
+      }
+      const timestamp = new Date(event.ts * 1000).toISOString();
+
+      if (event.type === 'phase_start') {
+        updates.push({
+          type: 'session_update',
+          data: {
+            currentPhase: event.phase,
+            currentIteration: event.iteration,
+          },
+          timestamp,
+        });
+      } else if (event.type === 'agent_start' && event.agent) {
+        updates.push({
+          type: 'agent_status',
+          agent: event.agent,
+          data: {
+            status: event.phase === 'research' ? 'researching' : 'thinking',
+            phase: event.phase,
+          },
+          timestamp,
+        });
+      }
+      updates.push({ type: 'progress', data: event, timestamp });
+    }
+
+    if (updates.length > 0) {
+      DebateController.emitBatchToSSE(debateId, updates);
     }
   }
 
   // Emit event to all SSE connections for a debate
   private static emitToSSE(debateId: string, eventData: any) {
+    DebateController.emitBatchToSSE(debateId, [eventData]);
+  }
+
+  // Emit several events to all SSE connections for a debate, one write per connection
+  static emitBatchToSSE(debateId: string, events: any[]) {
     const connections = DebateController.sseConnections.get(debateId) || [];
-    const dataString = `data: ${JSON.stringify(eventData)}\n\n`;
+    const dataString = events
+      .map((eventData) => `data: ${JSON.stringify(eventData)}\n\n`)
+      .join('');
 
+    DebateController.writeToConnections(debateId, connections, (res) =>
+      res.write(dataString)
+    );
+  }
+
+  // Push newly saved agent outputs to all SSE connections for a debate
+  static emitAgentOutputs(debateId: string, outputs: IAgentOutput[]) {
+    const connections = DebateController.sseConnections.get(debateId) || [];
+    DebateController.writeToConnections(debateId, connections, (res) =>
+      DebateController.writeAgentOutputs(res, outputs)
+    );
+  }
+
+  private static writeToConnections(
+    debateId: string,
+    connections: Response[],
+    write: (res: Response) => void
+  ) {
     connections.forEach((res, index) => {
       try {
-        res.write(dataString);
+        write(res);
       } catch (error) {
         console.error(`Error writing to SSE connection ${index}:`, error);
         // Remove failed connection
@@ -332,6 +510,36 @@ export class DebateController {
     }
   }
 
+  // Write the agent outputs this connection has not been sent yet (pushes and polling overlap)
+  private static writeAgentOutputs(res: Response, outputs: IAgentOutput[]) {
+    let sent = DebateController.sentOutputIds.get(res);
+    if (!sent) {
+      sent = new Set<string>();
+      DebateController.sentOutputIds.set(res, sent);
+    }
+
+    const dataString = outputs
+      .filter((output) => !sent!.has(String(output._id)))
+      .map((output) => {
+        sent!.add(String(output._id));
+        return `data: ${JSON.stringify({
+          type: 'agent_output',
+          agent: output.agentName,
+          data: {
+            content: output.content,
+            phase: output.phase,
+            roundNumber: output.roundNumber,
+          },
+          timestamp: output.timestamp,
+        })}\n\n`;
+      })
+      .join('');
+
+    if (dataString) {
+      res.write(dataString);
+    }
+  }
+
   // Stop a running debate
   static async stopDebate(req: Request, res: Response) {
     try {
@@ -345,6 +553,22 @@ export class DebateController {
         DebateController.runningProcesses.delete(debateId);
       }
 
+      // Or cancel it on the agent worker
+      const workerPoll = DebateController.runningWorkerJobs.get(debateId);
+      if (workerPoll) {
+        console.log(`🛑 Cancelling worker job for debate ${debateId}`);
+        clearTimeout(workerPoll);
+        DebateController.runningWorkerJobs.delete(debateId);
+        try {
+          await fetch(
+            `${process.env.AGENT_WORKER_URL}/jobs/${debateId}/cancel`,
+            { method: 'POST' }
+          );
+        } catch (error) {
+          console.error(`❌ Failed to cancel worker job ${debateId}:`, error);
+        }
+      }
+
       // Update session to stopped status
       const session = await DebateSession.findByIdAndUpdate(
         debateId,
@@ -424,20 +648,7 @@ export class DebateController {
           timestamp: 1,
         });
 
-        for (const output of existingOutputs) {
-          res.write(
-            `data: ${JSON.stringify({
-              type: 'agent_output',
-              agent: output.agentName,
-              data: {
-                content: output.content,
-                phase: output.phase,
-                roundNumber: output.roundNumber,
-              },
-              timestamp: output.timestamp,
-            })}\n\n`
-          );
-        }
+        DebateController.writeAgentOutputs(res, existingOutputs);
       }
     } catch (error) {
       console.error('Error sending initial state:', error);
@@ -450,22 +661,9 @@ export class DebateController {
         const recentOutputs = await AgentOutput.find({
           debateId,
           timestamp: { $gte: new Date(Date.now() - 2000) }, // Last 2 seconds
-        }).sort({ timestamp: -1 });
+        }).sort({ timestamp: 1 });
 
-        for (const output of recentOutputs) {
-          res.write(
-            `data: ${JSON.stringify({
-              type: 'agent_output',
-              agent: output.agentName,
-              data: {
-                content: output.content,
-                phase: output.phase,
-                roundNumber: output.roundNumber,
-              },
-              timestamp: output.timestamp,
-            })}\n\n`
-          );
-        }
+        DebateController.writeAgentOutputs(res, recentOutputs);
 
         // Check session status
         const session = await DebateSession.findById(debateId);
@@ -613,7 +811,10 @@ export class DebateController {
 
   // Get running process status (for debugging)
   static getRunningProcesses() {
-    return Array.from(DebateController.runningProcesses.keys());
+    return [
+      ...DebateController.runningProcesses.keys(),
+      ...DebateController.runningWorkerJobs.keys(),
+    ];
   }
 
   // Clean up orphaned processes on server startup
@@ -628,7 +829,7 @@ export class DebateController {
         const debateId = String(session._id);
 
         // If no process is tracked for this session, mark it as failed
-        if (!DebateController.runningProcesses.has(debateId)) {
+        if (!DebateController.isRunning(debateId)) {
           console.log(`🔄 Marking orphaned session ${debateId} as failed`);
           await DebateSession.findByIdAndUpdate(debateId, {
             status: 'failed',
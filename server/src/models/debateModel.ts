@@ -1,4 +1,4 @@
-import mongoose, { Schema, Document, Types } from 'mongoose';
+import mongoose, { Schema, Document, Model, Types } from 'mongoose';
 import {
   DebatePhase,
   AgentType,
@@ -15,6 +15,7 @@ export interface IAgentOutput extends Document {
   content: string;
   wordCount: number;
   timestamp: Date;
+  idempotencyKey?: string;
   metadata?: {
     questionTo?: string;
     responseFrom?: string;
@@ -32,6 +33,7 @@ export interface IDebateExchange extends Document {
   question: string;
   response: string;
   timestamp: Date;
+  idempotencyKey?: string;
   wordCounts: {
     question: number;
     response: number;
@@ -111,6 +113,7 @@ const AgentOutputSchema = new Schema<IAgentOutput>(
     content: { type: String, required: true },
     wordCount: { type: Number, required: true },
     timestamp: { type: Date, default: Date.now },
+    idempotencyKey: { type: String },
     metadata: { type: Schema.Types.Mixed },
   },
   {
@@ -137,6 +140,7 @@ const DebateExchangeSchema = new Schema<IDebateExchange>(
     question: { type: String, required: true },
     response: { type: String, required: true },
     timestamp: { type: Date, default: Date.now },
+    idempotencyKey: { type: String },
     wordCounts: {
       question: { type: Number, required: true },
       response: { type: Number, required: true },
@@ -192,6 +196,7 @@ const DebateSessionSchema = new Schema<IDebateSession>(
       {
         voterAgent: { type: String, enum: Object.values(AgentType) },
         votedForAgent: { type: String, enum: Object.values(AgentType) },
+        ranking: [{ type: String, enum: Object.values(AgentType) }],
         reasoning: { type: String },
         timestamp: { type: Date, default: Date.now },
       },
@@ -220,6 +225,9 @@ const DebateSessionSchema = new Schema<IDebateSession>(
 AgentOutputSchema.index({ debateId: 1, phase: 1, agentName: 1 });
 AgentOutputSchema.index({ debateId: 1, roundNumber: 1 });
 DebateExchangeSchema.index({ debateId: 1, roundNumber: 1 });
+// Replayed writes from the Python write-ahead log carry the same key and are skipped
+AgentOutputSchema.index({ idempotencyKey: 1 }, { unique: true, sparse: true });
+DebateExchangeSchema.index({ idempotencyKey: 1 }, { unique: true, sparse: true });
 DebateSessionSchema.index({ topic: 'text' });
 DebateSessionSchema.index({ status: 1, createdAt: -1 });
 DebateSessionSchema.index({ consensusReached: 1, winningStrategy: 1 });
@@ -238,6 +246,36 @@ export const DebateSession = mongoose.model<IDebateSession>(
   DebateSessionSchema
 );
 
+// MongoDB's duplicate key error code
+const DUPLICATE_KEY = 11000;
+
+// Insert documents unordered, so one failure doesn't stop the rest. A duplicate
+// idempotency key means an earlier (retried or replayed) request already stored that
+// document; it is skipped rather than failing the batch. Returns the documents this call
+// inserted, and the error to rethrow if anything else failed.
+async function insertNew<T>(
+  model: Model<T>,
+  docs: object[]
+): Promise<{ inserted: T[]; error?: any }> {
+  try {
+    return {
+      inserted: (await model.insertMany(docs, {
+        ordered: false,
+      })) as unknown as T[],
+    };
+  } catch (error: any) {
+    const writeErrors: any[] = error?.writeErrors ?? [];
+    if (writeErrors.length === 0) throw error;
+    const inserted = (error.insertedDocs ?? []) as T[];
+    // Mongoose re-indexes write errors as plain objects, keeping the driver error as err
+    const duplicatesOnly = writeErrors.every(
+      (writeError) =>
+        (writeError.code ?? writeError.err?.code) === DUPLICATE_KEY
+    );
+    return { inserted, error: duplicatesOnly ? undefined : error };
+  }
+}
+
 // Helper functions for the debate system
 export class DebateRepository {
   // Create a new debate session
@@ -282,6 +320,9 @@ export class DebateRepository {
       metadata,
     });
 
+    // Count the output only once it is stored, so a retried request can't count it twice
+    const saved = await agentOutput.save();
+
     // Update debate session summary
     await DebateSession.findByIdAndUpdate(debateId, {
       $inc: {
@@ -293,7 +334,7 @@ export class DebateRepository {
       },
     });
 
-    return await agentOutput.save();
+    return saved;
   }
 
   // Save debate exchange
@@ -321,6 +362,9 @@ export class DebateRepository {
       },
     });
 
+    // Count the exchange only once it is stored, so a retried request can't count it twice
+    const saved = await exchange.save();
+
     // Update debate session summary
     await DebateSession.findByIdAndUpdate(debateId, {
       $inc: {
@@ -329,7 +373,99 @@ export class DebateRepository {
       },
     });
 
-    return await exchange.save();
+    return saved;
+  }
+
+  // Save a batch of agent outputs with one insertMany and one summary update
+  static async saveAgentOutputs(
+    debateId: Types.ObjectId,
+    outputs: Array<{
+      agentName: AgentType;
+      phase: DebatePhase;
+      roundNumber: number;
+      content: string;
+      metadata?: any;
+      idempotencyKey?: string;
+    }>
+  ): Promise<IAgentOutput[]> {
+    const docs = outputs.map((output) => ({
+      debateId,
+      agentName: output.agentName,
+      phase: output.phase,
+      roundNumber: output.roundNumber,
+      content: output.content,
+      wordCount: output.content.split(/\s+/).length,
+      metadata: output.metadata,
+      idempotencyKey: output.idempotencyKey,
+    }));
+
+    const { inserted, error } = await insertNew(AgentOutput, docs);
+    if (inserted.length > 0) {
+      const completedAt = new Date();
+      const phaseCompletionTimes: Record<string, Date> = {};
+      for (const doc of inserted) {
+        phaseCompletionTimes[`summary.phaseCompletionTimes.${doc.phase}`] =
+          completedAt;
+      }
+
+      // Update debate session summary with what this request really stored
+      await DebateSession.findByIdAndUpdate(debateId, {
+        $inc: {
+          'summary.totalAgentOutputs': inserted.length,
+          'summary.totalWordCount': inserted.reduce(
+            (total, doc) => total + doc.wordCount,
+            0
+          ),
+        },
+        $set: phaseCompletionTimes,
+      });
+    }
+    if (error) throw error;
+    return inserted;
+  }
+
+  // Save a batch of debate exchanges with one insertMany and one summary update
+  static async saveDebateExchanges(
+    debateId: Types.ObjectId,
+    exchanges: Array<{
+      roundNumber: number;
+      questioner: AgentType;
+      responder: AgentType;
+      question: string;
+      response: string;
+      idempotencyKey?: string;
+    }>
+  ): Promise<IDebateExchange[]> {
+    const docs = exchanges.map((exchange) => ({
+      debateId,
+      roundNumber: exchange.roundNumber,
+      questioner: exchange.questioner,
+      responder: exchange.responder,
+      question: exchange.question,
+      response: exchange.response,
+      idempotencyKey: exchange.idempotencyKey,
+      wordCounts: {
+        question: exchange.question.split(/\s+/).length,
+        response: exchange.response.split(/\s+/).length,
+      },
+    }));
+
+    const { inserted, error } = await insertNew(DebateExchange, docs);
+    if (inserted.length > 0) {
+      // Update debate session summary with what this request really stored
+      await DebateSession.findByIdAndUpdate(debateId, {
+        $inc: {
+          'summary.totalDebateExchanges': inserted.length,
+          'summary.totalWordCount': inserted.reduce(
+            (total, doc) =>
+              total + doc.wordCounts.question + doc.wordCounts.response,
+            0
+          ),
+        },
+      });
+    }
+    if (error) throw error;
+    return inserted;
   }
 
   // Complete debate session
@@ -188,4 +188,151 @@ router.post('/debate-exchanges', async (req, res) => {
   }
 });
 
+// Save a batch of agent outputs (one insert, one SSE push)
+router.post('/agent-outputs/batch', async (req, res) => {
+  try {
+    const { debateId, outputs } = req.body;
+
+    if (!debateId || !Array.isArray(outputs)) {
+      return res
+        .status(400)
+        .json({ error: 'debateId and an outputs array are required' });
+    }
+
+    const invalid = outputs.findIndex(
+      (output: any) =>
+        !output ||
+        !output.agentName ||
+        !output.phase ||
+        output.roundNumber === undefined ||
+        !output.content
+    );
+    if (invalid !== -1) {
+      return res
+        .status(400)
+        .json({ error: `Missing required fields in output ${invalid}` });
+    }
+
+    const agentOutputs = await DebateRepository.saveAgentOutputs(
+      new Types.ObjectId(debateId),
+      outputs.map((output: any) => ({
+        agentName: output.agentName as AgentType,
+        phase: output.phase as DebatePhase,
+        roundNumber: output.roundNumber,
+        content: output.content,
+        metadata: output.metadata,
+        idempotencyKey: output.idempotencyKey,
+      }))
+    );
+
+    DebateController.emitAgentOutputs(debateId, agentOutputs);
+    res.status(201).json({ inserted: agentOutputs.length });
+  } catch (error) {
+    console.error('Error saving agent output batch:', error);
+    res.status(500).json({ error: 'Failed to save agent output batch' });
+  }
+});
+
+// Save a batch of debate exchanges (one insert, one SSE push)
+router.post('/debate-exchanges/batch', async (req, res) => {
+  try {
+    const { debateId, exchanges } = req.body;
+
+    if (!debateId || !Array.isArray(exchanges)) {
+      return res
+        .status(400)
+        .json({ error: 'debateId and an exchanges array are required' });
+    }
+
+    const invalid = exchanges.findIndex(
+      (exchange: any) =>
+        !exchange ||
+        exchange.roundNumber === undefined ||
+        !exchange.questioner ||
+        !exchange.responder ||
+        !exchange.question ||
+        !exchange.response
+    );
+    if (invalid !== -1) {
+      return res
+        .status(400)
+        .json({ error: `Missing required fields in exchange ${invalid}` });
+    }
+
+    const debateExchanges = await DebateRepository.saveDebateExchanges(
+      new Types.ObjectId(debateId),
+      exchanges.map((exchange: any) => ({
+        roundNumber: exchange.roundNumber,
+        questioner: exchange.questioner as AgentType,
+        responder: exchange.responder as AgentType,
+        question: exchange.question,
+        response: exchange.response,
+        idempotencyKey: exchange.idempotencyKey,
+      }))
+    );
+
+    DebateController.emitBatchToSSE(
+      debateId,
+      debateExchanges.map((exchange) => ({
+        type: 'debate_exchange',
+        agent: exchange.questioner,
+        data: {
+          roundNumber: exchange.roundNumber,
+          questioner: exchange.questioner,
+          responder: exchange.responder,
+          question: exchange.question,
+          response: exchange.response,
+        },
+        timestamp: exchange.timestamp,
+      }))
+    );
+    res.status(201).json({ inserted: debateExchanges.length });
+  } catch (error) {
+    console.error('Error saving debate exchange batch:', error);
+    res.status(500).json({ error: 'Failed to save debate exchange batch' });
+  }
+});
+
+// Relay streamed agent tokens to the SSE clients (never stored; the full output is saved separately)
+router.post('/debates/:id/tokens', (req, res) => {
+  const { chunks } = req.body;
+
+  if (!Array.isArray(chunks)) {
+    return res.status(400).json({ error: 'A chunks array is required' });
+  }
+
+  const invalid = chunks.findIndex(
+    (chunk: any) =>
+      !chunk ||
+      !chunk.streamId ||
+      !chunk.agentName ||
+      !chunk.phase ||
+      typeof chunk.text !== 'string'
+  );
+  if (invalid !== -1) {
+    return res
+      .status(400)
+      .json({ error: `Missing required fields in chunk ${invalid}` });
+  }
+
+  const timestamp = new Date().toISOString();
+  DebateController.emitBatchToSSE(
+    req.params.id,
+    chunks.map((chunk: any) => ({
+      type: 'agent_token',
+      agent: chunk.agentName,
+      data: {
+        streamId: chunk.streamId,
+        phase: chunk.phase,
+        roundNumber: chunk.roundNumber,
+        seq: chunk.seq,
+        text: chunk.text,
+        done: Boolean(chunk.done),
+      },
+      timestamp,
+    }))
+  );
+  res.status(202).json({ relayed: chunks.length });
+});
+
 export default router;
@@ -28,7 +28,8 @@ export enum AgentType {
 // Interface for voting results
 export interface IVotingResult {
   voterAgent: AgentType;
-  votedForAgent: AgentType;
+  votedForAgent?: AgentType;
+  ranking?: AgentType[];
   reasoning: string;
   timestamp: Date;
 }